@@ -0,0 +1,318 @@
+#!/usr/bin/env python3
+"""
+Headless batch analysis of recorded videos.
+Feeds a video file through PostureDetector (and ExerciseDetector when an
+exercise is given) without Kivy or a display, and streams one record per
+frame to CSV or JSON Lines: shoulder tilt, joint angles, rep events and
+form feedback. Frames are processed as fast as the CPU allows; rep
+counting and landmark smoothing run on the video's own timestamps, so the
+results do not depend on processing speed.
+
+Usage:
+    python analyze_video.py VIDEO [--exercise ID] [--format csv|jsonl] [--output PATH]
+    python analyze_video.py --list-exercises
+"""
+
+import argparse
+import csv
+import itertools
+import json
+import math
+import os
+import queue
+import sys
+import threading
+import time
+
+import cv2
+
+from database import DEFAULT_TILT_THRESHOLD, DEFAULT_LANDMARK_SMOOTHING
+from exercise_database import EXERCISES
+from exercise_detector import ExerciseDetector
+from form_rules import MESSAGE_SEPARATOR
+from inference_input import InferenceInput, INFERENCE_RESOLUTIONS, DEFAULT_INFERENCE_RESOLUTION
+from joint_angles import joint_angles, JOINT_NAMES
+from landmark_filter import create_landmark_filter, SMOOTHING_MODES
+from roi_tracker import RoiTracker
+
+
+FORMATS = ('csv', 'jsonl')
+# Decoded frames buffered ahead of inference
+READ_AHEAD = 8
+# Field order of a frame record; angles become one column each in CSV
+POSTURE_FIELDS = ('frame', 'time', 'pose', 'tilt', 'bad_posture')
+EXERCISE_FIELDS = ('reps', 'rep_event', 'feedback')
+TIMING_FIELDS = ('process_ms',)
+NO_POSE_FEEDBACK = 'No pose detected'
+
+
+class VideoReader:
+    """Decodes a video on a background thread, ahead of the consumer."""
+    
+    def __init__(self, path, read_ahead=READ_AHEAD, capture_factory=None):
+        """
+        Open a video file.
+        
+        Args:
+            path: Video file path
+            read_ahead: Decoded frames buffered ahead of the consumer
+            capture_factory: Callable(path) -> capture (default: cv2.VideoCapture)
+        
+        Raises:
+            IOError: If the video cannot be opened
+        """
+        self.capture = (capture_factory or cv2.VideoCapture)(path)
+        if not self.capture.isOpened():
+            raise IOError(f"Cannot open video: {path}")
+        fps = self.capture.get(cv2.CAP_PROP_FPS)
+        self.fps = fps if fps and math.isfinite(fps) and fps > 0 else None
+        self._queue = queue.Queue(maxsize=read_ahead)
+        self._stopped = False
+    
+    def _read(self):
+        """Decode frames into the queue; None marks the end."""
+        index = 0
+        try:
+            while not self._stopped:
+                ret, frame = self.capture.read()
+                if not ret:
+                    break
+                if self.fps:
+                    timestamp = index / self.fps
+                else:
+                    timestamp = self.capture.get(cv2.CAP_PROP_POS_MSEC) / 1000.0
+                self._queue.put((index, timestamp, frame))
+                index += 1
+        finally:
+            self._queue.put(None)
+    
+    def __iter__(self):
+        """Yield (index, timestamp in seconds, frame) for every frame."""
+        thread = threading.Thread(target=self._read, name='video-reader', daemon=True)
+        thread.start()
+        try:
+            while True:
+                item = self._queue.get()
+                if item is None:
+                    return
+                yield item
+        finally:
+            # Unblock the reader if the consumer stops early
+            self._stopped = True
+            while thread.is_alive():
+                try:
+                    self._queue.get(timeout=0.1)
+                except queue.Empty:
+                    pass
+            self.capture.release()
+
+
+def analyze_frames(frames, engine, exercise_id=None, threshold=DEFAULT_TILT_THRESHOLD,
+                   smoothing=DEFAULT_LANDMARK_SMOOTHING, resolution=DEFAULT_INFERENCE_RESOLUTION):
+    """
+    Analyze a sequence of frames.
+    
+    Args:
+        frames: Iterable of (index, timestamp in seconds, BGR frame)
+        engine: PostureDetector
+        exercise_id: Exercise to count reps and check form for (None = posture only)
+        threshold: Tilt in degrees above which posture counts as bad
+        smoothing: Landmark smoothing mode (see landmark_filter.SMOOTHING_MODES)
+        resolution: Inference frame height (see inference_input.INFERENCE_RESOLUTIONS)
+    
+    Yields:
+        One record dictionary per frame: frame, time, pose, tilt,
+        bad_posture, angles (joint name -> degrees, None without a pose),
+        process_ms and, with an exercise, reps, rep_event and feedback
+    """
+    landmark_filter = create_landmark_filter(smoothing)
+    roi_tracker = RoiTracker()
+    inference_input = InferenceInput(resolution)
+    exercise_detector = None
+    if exercise_id is not None:
+        exercise_detector = ExerciseDetector(engine)
+        exercise_detector.set_exercise(exercise_id)
+    reps = previous_reps = 0
+    
+    for index, timestamp, frame in frames:
+        started = time.perf_counter()
+        result = engine.detect(frame, roi_tracker, inference_input)
+        result = engine.smooth(result, landmark_filter, timestamp)
+        record = {
+            'frame': index,
+            'time': round(timestamp, 4),
+            'pose': result.has_pose,
+            'tilt': round(float(result.tilt_angle), 2),
+            'bad_posture': result.has_pose and result.tilt_angle > threshold,
+            'angles': dict.fromkeys(JOINT_NAMES),
+        }
+        angles = None
+        if result.has_pose:
+            angles = joint_angles(result.pixels)
+            record['angles'] = {name: round(float(angle), 1) for name, angle in zip(JOINT_NAMES, angles)}
+        if exercise_detector:
+            # The form check and rep counting of ExerciseDetector.evaluate, without drawing
+            feedback = NO_POSE_FEEDBACK
+            if angles is not None:
+                reps = exercise_detector.count_reps(exercise_id, angles, timestamp)
+                feedback = exercise_detector.check_form(exercise_id, result.pixels, angles)['feedback']
+            record['reps'] = reps
+            record['rep_event'] = reps > previous_reps
+            record['feedback'] = feedback.replace(MESSAGE_SEPARATOR, '; ')
+            previous_reps = reps
+        record['process_ms'] = round((time.perf_counter() - started) * 1000, 2)
+        yield record
+
+
+class RecordWriter:
+    """Writes frame records as CSV rows or JSON Lines."""
+    
+    def __init__(self, stream, fmt, exercise=False):
+        """
+        Initialize the writer.
+        
+        Args:
+            stream: Text stream to write to
+            fmt: 'csv' or 'jsonl'
+            exercise: Whether records carry the exercise fields
+        """
+        if fmt not in FORMATS:
+            raise ValueError(f"Output format must be one of {FORMATS}")
+        self.stream = stream
+        self.fmt = fmt
+        self.fields = POSTURE_FIELDS + (EXERCISE_FIELDS if exercise else ()) + TIMING_FIELDS
+        self._csv = None
+        if fmt == 'csv':
+            columns = list(POSTURE_FIELDS) + [f'angle_{name}' for name in JOINT_NAMES]
+            columns += list(EXERCISE_FIELDS if exercise else ()) + list(TIMING_FIELDS)
+            self._csv = csv.DictWriter(stream, fieldnames=columns)
+            self._csv.writeheader()
+    
+    def write(self, record):
+        """Write one frame record."""
+        if self._csv is not None:
+            row = {field: record.get(field) for field in self.fields}
+            for name, angle in record['angles'].items():
+                row[f'angle_{name}'] = angle
+            for field in ('pose', 'bad_posture', 'rep_event'):
+                if field in row:
+                    row[field] = int(row[field])
+            self._csv.writerow(row)
+        else:
+            self.stream.write(json.dumps(record) + '\n')
+
+
+class RunSummary:
+    """Running totals of an analysis run; per-frame records are not kept."""
+    
+    def __init__(self):
+        """Initialize empty totals."""
+        self.frames = 0
+        self.poses = 0
+        self.bad_posture = 0
+        self.reps = None
+    
+    def add(self, record):
+        """Count one frame record."""
+        self.frames += 1
+        self.poses += record['pose']
+        self.bad_posture += record['bad_posture']
+        self.reps = record.get('reps')
+    
+    def summarize(self, seconds):
+        """
+        Summarize the run.
+        
+        Args:
+            seconds: Wall-clock duration of the run
+        
+        Returns:
+            Dictionary with frames, processing fps, pose rate, bad-posture rate
+            and final rep count
+        """
+        return {
+            'frames': self.frames,
+            'fps': self.frames / seconds if seconds else 0.0,
+            'pose_rate': self.poses / self.frames if self.frames else 0.0,
+            'bad_posture_rate': self.bad_posture / self.poses if self.poses else 0.0,
+            'reps': self.reps,
+        }
+
+
+def main(argv=None):
+    """Analyze a video from the command line."""
+    exercise_ids = [exercise.id for exercise in EXERCISES]
+    parser = argparse.ArgumentParser(description='Analyze a recorded video without the UI')
+    parser.add_argument('video', nargs='?', help='Video file')
+    parser.add_argument('--exercise', choices=exercise_ids, metavar='ID',
+                        help='Exercise to count reps and check form for (see --list-exercises)')
+    parser.add_argument('--format', choices=FORMATS, help='Output format (default: from --output, else csv)')
+    parser.add_argument('--output', default='-', help='Output file (default: stdout)')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_TILT_THRESHOLD,
+                        help=f'Bad posture tilt in degrees (default: {DEFAULT_TILT_THRESHOLD})')
+    parser.add_argument('--smoothing', choices=SMOOTHING_MODES, default=DEFAULT_LANDMARK_SMOOTHING,
+                        help=f'Landmark smoothing (default: {DEFAULT_LANDMARK_SMOOTHING})')
+    parser.add_argument('--resolution', type=int, choices=INFERENCE_RESOLUTIONS,
+                        default=DEFAULT_INFERENCE_RESOLUTION,
+                        help=f'Inference frame height, 0 = native (default: {DEFAULT_INFERENCE_RESOLUTION})')
+    parser.add_argument('--complexity', type=int, choices=(0, 1, 2), default=1,
+                        help='Pose model complexity (default: 1)')
+    parser.add_argument('--max-frames', type=int, help='Stop after this many frames')
+    parser.add_argument('--list-exercises', action='store_true', help='List exercise IDs and exit')
+    args = parser.parse_args(argv)
+    
+    if args.list_exercises:
+        for exercise in EXERCISES:
+            print(f"{exercise.id:<24} {exercise.name}")
+        return 0
+    if not args.video:
+        parser.error('a video file is required')
+    fmt = args.format or ('jsonl' if args.output.endswith(('.jsonl', '.json')) else 'csv')
+    
+    from posture_detector import PostureDetector
+    try:
+        reader = VideoReader(args.video)
+    except IOError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    engine = PostureDetector(model_complexity=args.complexity)
+    
+    frames = iter(reader)
+    if args.max_frames is not None:
+        frames = itertools.islice(frames, args.max_frames)
+    
+    # Line buffered, so records can be followed while the analysis runs
+    if args.output == '-':
+        output = sys.stdout
+        output.reconfigure(line_buffering=True)
+    else:
+        output = open(args.output, 'w', newline='', buffering=1)
+    totals = RunSummary()
+    started = time.perf_counter()
+    try:
+        writer = RecordWriter(output, fmt, exercise=args.exercise is not None)
+        for record in analyze_frames(frames, engine, args.exercise, args.threshold, args.smoothing,
+                                     args.resolution):
+            writer.write(record)
+            totals.add(record)
+    except KeyboardInterrupt:
+        pass
+    except BrokenPipeError:
+        # Output closed early (e.g. piped into head): stop quietly
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+    finally:
+        engine.release()
+        if output is not sys.stdout:
+            output.close()
+    
+    summary = totals.summarize(time.perf_counter() - started)
+    message = (f"{summary['frames']} frames at {summary['fps']:.1f} fps, pose in {summary['pose_rate']:.0%}, "
+               f"bad posture in {summary['bad_posture_rate']:.0%} of posed frames")
+    if args.exercise:
+        message += f", {summary['reps']} reps"
+    print(message, file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
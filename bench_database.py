@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark for SettingsDatabase operations.
+Reports operations per second for the hot write/read paths against a
+temporary on-disk database.
+
+Usage:
+    python bench_database.py [--seconds N]
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+from database import SettingsDatabase
+
+
+def measure(operation, seconds):
+    """
+    Run an operation repeatedly for a fixed duration.
+    
+    Returns:
+        Operations per second
+    """
+    count = 0
+    start = time.perf_counter()
+    deadline = start + seconds
+    while time.perf_counter() < deadline:
+        operation(count)
+        count += 1
+    return count / (time.perf_counter() - start)
+
+
+def run_benchmarks(seconds=1.0):
+    """
+    Benchmark database operations on a fresh temporary database.
+    
+    Returns:
+        Dictionary mapping operation name to ops/sec
+    """
+    fd, path = tempfile.mkstemp(suffix='.db')
+    os.close(fd)
+    try:
+        db = SettingsDatabase(path)
+        results = {
+            'set_setting': measure(
+                lambda i: db.set_setting('bench_key', str(i)), seconds),
+            'add_exercise_to_workout': measure(
+                lambda i: db.add_exercise_to_workout('pushup', sets=3, reps=i % 20), seconds),
+        }
+        for i in range(200):
+            db.save_workout_to_history('squat', 3, 10, f'session {i}')
+        results['get_workout_history'] = measure(
+            lambda i: db.get_workout_history(limit=50), seconds)
+        if hasattr(db, 'close'):
+            db.close()
+        return results
+    finally:
+        for suffix in ('', '-wal', '-shm'):
+            if os.path.exists(path + suffix):
+                os.remove(path + suffix)
+
+
+def main():
+    """Run the benchmark and print a table of results."""
+    parser = argparse.ArgumentParser(description='SettingsDatabase micro-benchmark')
+    parser.add_argument('--seconds', type=float, default=1.0,
+                        help='Duration of each measurement (default: 1.0)')
+    args = parser.parse_args()
+    
+    print("=" * 60)
+    print("SettingsDatabase Benchmark")
+    print("=" * 60)
+    for name, ops in run_benchmarks(args.seconds).items():
+        print(f"  {name:<28} {ops:>12,.0f} ops/sec")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,352 @@
+#!/usr/bin/env python3
+"""
+Throughput benchmark for PostureDetector and ExerciseDetector.
+Runs process_frame headlessly over fixture videos and generated frames at
+several resolutions and model complexities, and reports frames per second,
+the per-frame latency distribution and peak RSS as JSON. Each case runs in
+a fresh interpreter so its peak RSS and model state are its own.
+
+Results can be compared against a stored baseline to flag regressions
+(exit code 1). Baselines are machine specific: record one with
+--update-baseline on the machine that runs the comparison.
+
+Usage:
+    python bench_detectors.py [--resolutions 480 720 1080] [--complexities 1]
+                              [--video PATH ...] [--frames N] [--output PATH]
+                              [--baseline PATH] [--update-baseline]
+"""
+
+import argparse
+import glob
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import time
+
+import cv2
+import numpy as np
+
+from frame_timing import percentile
+
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+
+DETECTORS = ('posture', 'exercise')
+DEFAULT_RESOLUTIONS = (480, 720, 1080)
+# Only the full model ships with MediaPipe; lite and heavy download on first use
+DEFAULT_COMPLEXITIES = (1,)
+DEFAULT_FRAMES = 100
+WARM_UP_FRAMES = 5
+DEFAULT_EXERCISE = 'squat'
+# Recorded fixtures picked up automatically (any format OpenCV can read)
+FIXTURE_GLOB = os.path.join(APP_DIR, 'bench_fixtures', '*')
+SYNTHETIC_SOURCE = 'synthetic'
+# Distinct synthetic frames generated per case (cycled)
+SYNTHETIC_FRAMES = 30
+
+DEFAULT_BASELINE = os.path.join(APP_DIR, 'bench_baseline.json')
+# Relative change allowed before a case counts as a regression
+DEFAULT_TOLERANCE = 0.15
+
+
+def synthetic_frames(height, count=SYNTHETIC_FRAMES, seed=0):
+    """
+    Generate deterministic 16:9 BGR frames with a moving figure.
+    
+    The figure is drawn from simple shapes and MediaPipe only finds a pose
+    in some frames (see pose_rate in the results); recorded fixtures of a
+    real person exercise the tracking path.
+    
+    Args:
+        height: Frame height in pixels
+        count: Number of frames
+        seed: Random seed for the background texture
+    
+    Returns:
+        List of uint8 frames of shape (height, width, 3)
+    """
+    width = height * 16 // 9
+    rng = np.random.default_rng(seed)
+    gradient = np.linspace(40, 160, width, dtype=np.float32)[np.newaxis, :, np.newaxis]
+    background = np.clip(gradient + rng.normal(0, 12, (height, width, 3)), 0, 255).astype(np.uint8)
+    frames = []
+    for i in range(count):
+        frame = background.copy()
+        cx = int(width * (0.35 + 0.3 * i / max(count - 1, 1)))
+        unit = height // 12
+        cv2.circle(frame, (cx, 3 * unit), unit, (150, 180, 220), -1)
+        cv2.rectangle(frame, (cx - 2 * unit, 4 * unit), (cx + 2 * unit, 8 * unit), (60, 90, 160), -1)
+        for side in (-1, 1):
+            cv2.line(frame, (cx + side * unit, 8 * unit), (cx + side * 2 * unit, 11 * unit), (50, 50, 70), unit // 2)
+            cv2.line(frame, (cx + side * 2 * unit, 4 * unit), (cx + side * 3 * unit, 7 * unit), (150, 180, 220), unit // 3)
+        frames.append(frame)
+    return frames
+
+
+def video_frames(path, height, limit):
+    """
+    Read frames from a video, scaled to a frame height.
+    
+    Returns:
+        List of up to limit uint8 BGR frames (empty if unreadable)
+    """
+    capture = cv2.VideoCapture(path)
+    frames = []
+    try:
+        while len(frames) < limit:
+            ret, frame = capture.read()
+            if not ret:
+                break
+            h, w = frame.shape[:2]
+            if h != height:
+                frame = cv2.resize(frame, (max(1, round(w * height / h)), height), interpolation=cv2.INTER_AREA)
+            frames.append(frame)
+    finally:
+        capture.release()
+    return frames
+
+
+def latency_stats(latencies_ns):
+    """
+    Summarize per-frame latencies.
+    
+    Returns:
+        Dictionary with mean, p50, p95, p99 and max in milliseconds
+    """
+    values = [ns / 1e6 for ns in latencies_ns]
+    if not values:
+        return {'mean': 0.0, 'p50': 0.0, 'p95': 0.0, 'p99': 0.0, 'max': 0.0}
+    return {
+        'mean': sum(values) / len(values),
+        'p50': percentile(values, 50),
+        'p95': percentile(values, 95),
+        'p99': percentile(values, 99),
+        'max': max(values),
+    }
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process in MiB."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def run_case(detector, source, resolution, complexity, frames=DEFAULT_FRAMES,
+             exercise=DEFAULT_EXERCISE, detector_factory=None):
+    """
+    Benchmark one detector on one frame source in this process.
+    
+    Args:
+        detector: 'posture' or 'exercise'
+        source: SYNTHETIC_SOURCE or a video path
+        resolution: Frame height in pixels
+        complexity: MediaPipe model complexity
+        frames: Frames measured (after WARM_UP_FRAMES unmeasured ones)
+        exercise: Exercise ID for the exercise detector
+        detector_factory: Callable(model_complexity) -> PostureDetector
+                          (default: PostureDetector)
+    
+    Returns:
+        Result dictionary (see case_key for its identifying fields)
+    """
+    from posture_detector import PostureDetector
+    from exercise_detector import ExerciseDetector
+    
+    result = {'detector': detector, 'source': os.path.basename(source), 'resolution': resolution,
+              'complexity': complexity}
+    if source == SYNTHETIC_SOURCE:
+        clip = synthetic_frames(resolution)
+    else:
+        clip = video_frames(source, resolution, frames + WARM_UP_FRAMES)
+    if not clip:
+        result['error'] = 'no frames'
+        return result
+    
+    started = time.perf_counter()
+    engine = (detector_factory or PostureDetector)(model_complexity=complexity)
+    result['load_seconds'] = time.perf_counter() - started
+    try:
+        if detector == 'exercise':
+            exercise_detector = ExerciseDetector(engine)
+            exercise_detector.set_exercise(exercise)
+            process = lambda frame: exercise_detector.process_frame(frame, exercise)
+        else:
+            process = engine.process_frame
+        
+        latencies = []
+        poses = 0
+        for i in range(frames + WARM_UP_FRAMES):
+            # Frames are drawn on in place: give every call its own copy
+            frame = clip[i % len(clip)].copy()
+            begin = time.perf_counter_ns()
+            output = process(frame)
+            elapsed = time.perf_counter_ns() - begin
+            if i >= WARM_UP_FRAMES:
+                latencies.append(elapsed)
+                if detector == 'posture':
+                    poses += output[2] is not None
+                else:
+                    poses += output[1]['feedback'] != 'No pose detected'
+    finally:
+        engine.release()
+    
+    total = sum(latencies) / 1e9
+    result.update({
+        'frames': len(latencies),
+        'fps': len(latencies) / total if total else 0.0,
+        'latency_ms': latency_stats(latencies),
+        'pose_rate': poses / len(latencies),
+        'peak_rss_mb': peak_rss_mb(),
+    })
+    return result
+
+
+def run_isolated(case, frames, exercise):
+    """Run a case in a fresh interpreter and return its result."""
+    command = [sys.executable, os.path.abspath(__file__), '--run-case', json.dumps(case),
+               '--frames', str(frames), '--exercise', exercise]
+    output = subprocess.run(command, capture_output=True, text=True, cwd=APP_DIR)
+    lines = output.stdout.strip().splitlines()
+    if output.returncode != 0 or not lines:
+        error = (output.stderr.strip().splitlines() or ['no output'])[-1]
+        return dict(case, source=os.path.basename(case['source']), error=error)
+    return json.loads(lines[-1])
+
+
+def case_key(result):
+    """Identifying fields of a result, used to match it against a baseline."""
+    return (result['detector'], result['source'], result['resolution'], result['complexity'])
+
+
+def compare_results(results, baseline, tolerance=DEFAULT_TOLERANCE):
+    """
+    Compare results against a baseline run.
+    
+    A case regresses when its FPS drops, or its p95 latency or peak RSS
+    grows, by more than the tolerance. A case that succeeded in the
+    baseline regresses as well when it now fails or was not run.
+    
+    Args:
+        results: List of result dicts
+        baseline: Baseline report (dict with 'results') or list of results
+        tolerance: Allowed relative change (0.15 = 15%)
+    
+    Returns:
+        List of regression messages (empty if none)
+    """
+    previous = baseline.get('results', []) if isinstance(baseline, dict) else baseline
+    previous = {case_key(result): result for result in previous if 'error' not in result}
+    current = {case_key(result) for result in results}
+    regressions = []
+    for result in results:
+        before = previous.get(case_key(result))
+        if before is None:
+            continue
+        name = '/'.join(str(part) for part in case_key(result))
+        if 'error' in result:
+            regressions.append(f"{name}: failed ({result['error']})")
+            continue
+        checks = (
+            ('fps', before['fps'], result['fps'], result['fps'] < before['fps'] * (1 - tolerance)),
+            ('p95 ms', before['latency_ms']['p95'], result['latency_ms']['p95'],
+             result['latency_ms']['p95'] > before['latency_ms']['p95'] * (1 + tolerance)),
+            ('peak RSS MiB', before['peak_rss_mb'], result['peak_rss_mb'],
+             result['peak_rss_mb'] > before['peak_rss_mb'] * (1 + tolerance)),
+        )
+        for label, old, new, regressed in checks:
+            if regressed:
+                regressions.append(f"{name}: {label} {old:.1f} -> {new:.1f}")
+    for key in previous:
+        if key not in current:
+            regressions.append(f"{'/'.join(str(part) for part in key)}: missing from this run")
+    return regressions
+
+
+def main():
+    """Run the benchmark suite and print a table of results."""
+    parser = argparse.ArgumentParser(description='Pose detector throughput benchmark')
+    parser.add_argument('--detectors', nargs='+', choices=DETECTORS, default=list(DETECTORS))
+    parser.add_argument('--resolutions', nargs='+', type=int, default=list(DEFAULT_RESOLUTIONS),
+                        help='Frame heights (default: 480 720 1080)')
+    parser.add_argument('--complexities', nargs='+', type=int, choices=(0, 1, 2),
+                        default=list(DEFAULT_COMPLEXITIES), help='Model complexities (default: 1)')
+    parser.add_argument('--video', action='append', default=[],
+                        help=f'Fixture video (repeatable; default: {os.path.relpath(FIXTURE_GLOB, APP_DIR)})')
+    parser.add_argument('--no-synthetic', action='store_true', help='Skip the generated frames')
+    parser.add_argument('--frames', type=int, default=DEFAULT_FRAMES,
+                        help=f'Frames measured per case (default: {DEFAULT_FRAMES})')
+    parser.add_argument('--exercise', default=DEFAULT_EXERCISE,
+                        help=f'Exercise for the exercise detector (default: {DEFAULT_EXERCISE})')
+    parser.add_argument('--output', metavar='PATH', help='Write the JSON report here')
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE,
+                        help='Baseline report to compare against (default: bench_baseline.json)')
+    parser.add_argument('--update-baseline', action='store_true',
+                        help='Store this run as the baseline instead of comparing')
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE,
+                        help=f'Allowed relative change before flagging (default: {DEFAULT_TOLERANCE})')
+    parser.add_argument('--run-case', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    
+    if args.run_case:
+        case = json.loads(args.run_case)
+        print(json.dumps(run_case(frames=args.frames, exercise=args.exercise, **case)))
+        return 0
+    
+    sources = ([] if args.no_synthetic else [SYNTHETIC_SOURCE]) + (args.video or sorted(glob.glob(FIXTURE_GLOB)))
+    cases = [{'detector': detector, 'source': source, 'resolution': resolution, 'complexity': complexity}
+             for source in sources for complexity in args.complexities
+             for resolution in args.resolutions for detector in args.detectors]
+    
+    print("=" * 60)
+    print("Detector Benchmark")
+    print("=" * 60)
+    results = []
+    for case in cases:
+        result = run_isolated(case, args.frames, args.exercise)
+        results.append(result)
+        name = '/'.join(str(part) for part in case_key(result))
+        if 'error' in result:
+            print(f"  {name:<36} failed: {result['error']}")
+        else:
+            latency = result['latency_ms']
+            print(f"  {name:<36} {result['fps']:>7.1f} fps  p50 {latency['p50']:>6.1f}  "
+                  f"p95 {latency['p95']:>6.1f}  p99 {latency['p99']:>6.1f} ms  "
+                  f"{result['peak_rss_mb']:>6.0f} MiB  pose {result['pose_rate']:.0%}")
+    
+    report = {
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'machine': {'platform': platform.platform(), 'processor': platform.processor(),
+                    'python': platform.python_version(), 'cpus': os.cpu_count()},
+        'frames': args.frames,
+        'results': results,
+    }
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+    
+    if args.update_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"\n  Baseline written to {args.baseline}")
+        return 0
+    if not os.path.exists(args.baseline):
+        print(f"\n  No baseline at {args.baseline} (record one with --update-baseline)")
+        return 0
+    
+    with open(args.baseline) as f:
+        regressions = compare_results(results, json.load(f), args.tolerance)
+    if regressions:
+        print(f"\n✗ {len(regressions)} regression(s) against {args.baseline}:")
+        for message in regressions:
+            print(f"  {message}")
+        return 1
+    print(f"\n✓ No regressions against {args.baseline}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+Cold-start benchmark for the Kivy app.
+Launches main.py in N fresh interpreters with the startup tracer enabled
+(see startup_trace.py), stops each run once the target phase is reached and
+reports per-phase percentiles across runs.
+
+Each launch needs a window, so run it on a desktop or under xvfb-run (used
+automatically when DISPLAY is unset and xvfb-run is installed).
+
+Usage:
+    python bench_startup.py [--runs N] [--until PHASE] [--fresh-db] [--json PATH]
+"""
+
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+import startup_trace
+from frame_timing import percentile
+
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+
+DEFAULT_RUNS = 10
+# model_ready needs no camera; first_frame needs one (with --autostart)
+DEFAULT_UNTIL = 'model_ready'
+DEFAULT_TIMEOUT = 120.0
+
+
+def summarize(timelines):
+    """
+    Aggregate phases across runs.
+    
+    Args:
+        timelines: List of timeline dicts written by startup_trace
+    
+    Returns:
+        List of per-phase dicts (name, runs, and p50/p95/max of the phase's
+        end time and duration in seconds), ordered by median end time
+    """
+    ends, durations = {}, {}
+    for timeline in timelines:
+        for phase in timeline['phases']:
+            ends.setdefault(phase['name'], []).append(phase['end'])
+            durations.setdefault(phase['name'], []).append(phase['duration'])
+    
+    summary = []
+    for name, values in ends.items():
+        summary.append({
+            'name': name,
+            'runs': len(values),
+            'end': {'p50': percentile(values, 50), 'p95': percentile(values, 95), 'max': max(values)},
+            'duration': {'p50': percentile(durations[name], 50), 'p95': percentile(durations[name], 95),
+                         'max': max(durations[name])},
+        })
+    summary.sort(key=lambda phase: phase['end']['p50'])
+    return summary
+
+
+def launch_command():
+    """Command line for one app launch (wrapped in xvfb-run when headless)."""
+    command = [sys.executable, os.path.join(APP_DIR, 'main.py')]
+    if not os.environ.get('DISPLAY') and sys.platform.startswith('linux') and shutil.which('xvfb-run'):
+        command = ['xvfb-run', '-a'] + command
+    return command
+
+
+def run_once(workdir, until, autostart=False, timeout=DEFAULT_TIMEOUT):
+    """
+    Launch the app once and collect its startup timeline.
+    
+    Args:
+        workdir: Working directory (holds the app's database)
+        until: Phase after which the app quits
+        autostart: Start tracking when the model is ready (for first_frame)
+        timeout: Seconds before the run is killed
+    
+    Returns:
+        Tuple of (timeline dict or None, wall-clock seconds, error message)
+    """
+    timeline_path = os.path.join(workdir, 'startup_timeline.json')
+    if os.path.exists(timeline_path):
+        os.remove(timeline_path)
+    env = dict(os.environ, KIVY_NO_ARGS='1', KIVY_NO_CONSOLELOG='1')
+    env[startup_trace.TRACE_ENV] = timeline_path
+    env[startup_trace.EXIT_ENV] = until
+    env[startup_trace.AUTOSTART_ENV] = '1' if autostart else '0'
+    
+    start = time.perf_counter()
+    try:
+        result = subprocess.run(launch_command(), cwd=workdir, env=env, capture_output=True,
+                                text=True, timeout=timeout)
+    except subprocess.TimeoutExpired:
+        return None, time.perf_counter() - start, f'timed out after {timeout:g} s'
+    elapsed = time.perf_counter() - start
+    
+    if not os.path.exists(timeline_path):
+        lines = (result.stderr or result.stdout).strip().splitlines()
+        return None, elapsed, f'exit code {result.returncode}: {lines[-1] if lines else "no output"}'
+    with open(timeline_path) as f:
+        timeline = json.load(f)
+    if not any(phase['name'] == until for phase in timeline['phases']):
+        return timeline, elapsed, f'{until} not reached (exit code {result.returncode})'
+    return timeline, elapsed, None
+
+
+def run_benchmark(runs=DEFAULT_RUNS, until=DEFAULT_UNTIL, fresh_db=False, autostart=False,
+                  timeout=DEFAULT_TIMEOUT):
+    """
+    Launch the app repeatedly.
+    
+    Args:
+        runs: Number of launches
+        until: Phase after which each launch quits
+        fresh_db: Give every launch an empty database (otherwise launches
+                  share one, so later runs start with cached settings and cameras)
+        autostart: Start tracking when the model is ready
+        timeout: Seconds before a launch is killed
+    
+    Returns:
+        Tuple of (timelines of successful runs, list of error messages)
+    """
+    timelines, errors = [], []
+    shared = tempfile.mkdtemp(prefix='posture-startup-')
+    try:
+        for run in range(runs):
+            workdir = tempfile.mkdtemp(prefix='posture-startup-') if fresh_db else shared
+            try:
+                timeline, elapsed, error = run_once(workdir, until, autostart, timeout)
+            finally:
+                if fresh_db:
+                    shutil.rmtree(workdir, ignore_errors=True)
+            if error:
+                errors.append(f'run {run + 1}: {error}')
+                print(f"  run {run + 1:>3}: failed ({error})")
+            else:
+                timelines.append(timeline)
+                print(f"  run {run + 1:>3}: {until} at {_phase_end(timeline, until):.3f} s "
+                      f"(process {elapsed:.3f} s)")
+    finally:
+        shutil.rmtree(shared, ignore_errors=True)
+    return timelines, errors
+
+
+def _phase_end(timeline, name):
+    """End time of a phase in one timeline."""
+    return next(phase['end'] for phase in timeline['phases'] if phase['name'] == name)
+
+
+def main():
+    """Run the benchmark and print per-phase percentiles."""
+    parser = argparse.ArgumentParser(description='Posture Tracker cold-start benchmark')
+    parser.add_argument('--runs', type=int, default=DEFAULT_RUNS,
+                        help=f'Number of app launches (default: {DEFAULT_RUNS})')
+    parser.add_argument('--until', default=DEFAULT_UNTIL,
+                        help=f'Phase after which each launch quits (default: {DEFAULT_UNTIL})')
+    parser.add_argument('--fresh-db', action='store_true',
+                        help='Start every launch with an empty database')
+    parser.add_argument('--autostart', action='store_true',
+                        help='Start tracking once the model is ready (needed for --until first_frame)')
+    parser.add_argument('--timeout', type=float, default=DEFAULT_TIMEOUT,
+                        help=f'Seconds before a launch is killed (default: {DEFAULT_TIMEOUT:g})')
+    parser.add_argument('--json', metavar='PATH', help='Also write the summary and raw timelines as JSON')
+    args = parser.parse_args()
+    
+    print("=" * 60)
+    print("Startup Benchmark")
+    print("=" * 60)
+    timelines, errors = run_benchmark(args.runs, args.until, args.fresh_db, args.autostart, args.timeout)
+    if not timelines:
+        print("✗ No launch completed")
+        return 1
+    
+    summary = summarize(timelines)
+    print(f"\n  {'phase':<22} {'runs':>4} {'end p50':>9} {'end p95':>9} {'dur p50':>9} {'dur p95':>9}")
+    for phase in summary:
+        print(f"  {phase['name']:<22} {phase['runs']:>4} {phase['end']['p50']:>9.3f} "
+              f"{phase['end']['p95']:>9.3f} {phase['duration']['p50']:>9.3f} {phase['duration']['p95']:>9.3f}")
+    print(f"\n  {len(timelines)}/{args.runs} launches reached {args.until} (seconds from process start)")
+    
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({'until': args.until, 'fresh_db': args.fresh_db, 'summary': summary,
+                       'errors': errors, 'timelines': timelines}, f, indent=2)
+    return 0 if not errors else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
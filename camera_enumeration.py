@@ -0,0 +1,245 @@
+"""
+Camera enumeration.
+Lists capture devices from /sys/class/video4linux where available and only
+opens the devices the cache cannot vouch for, probing them in parallel with
+a per-device timeout. Results are cached in the database keyed by device
+path and identity, so a normal startup opens no cameras at all.
+"""
+
+import logging
+import os
+import threading
+import time
+import cv2
+
+
+logger = logging.getLogger(__name__)
+
+SYSFS_VIDEO4LINUX = '/sys/class/video4linux'
+
+# Indices probed when the platform has no video4linux listing
+DEFAULT_MAX_CAMERAS = 10
+# Seconds a single device may take to open and deliver a frame
+DEFAULT_PROBE_TIMEOUT = 3.0
+DEFAULT_MAX_WORKERS = 4
+
+# USB attributes identifying a physical camera
+USB_IDENTITY_FILES = ('idVendor', 'idProduct', 'serial')
+
+
+def _read(path):
+    """Read a small sysfs attribute ('' if missing)."""
+    try:
+        with open(path) as f:
+            return f.read().strip()
+    except OSError:
+        return ''
+
+
+def _usb_identity(device_path):
+    """Find vendor:product:serial of the USB device above a sysfs device node."""
+    path = device_path
+    while path and path != os.path.dirname(path):
+        if os.path.exists(os.path.join(path, 'idVendor')):
+            return ':'.join(_read(os.path.join(path, name)) for name in USB_IDENTITY_FILES)
+        path = os.path.dirname(path)
+    return ''
+
+
+def list_video_devices(sysfs_root=SYSFS_VIDEO4LINUX):
+    """
+    List capture devices from video4linux sysfs without opening them.
+    
+    Metadata nodes (a UVC camera registers a second node with sysfs index 1)
+    are skipped.
+    
+    Returns:
+        List of candidate dicts with index, path, label and identity, sorted
+        by index; None if the platform has no video4linux listing
+    """
+    if not os.path.isdir(sysfs_root):
+        return None
+    candidates = []
+    for entry in os.listdir(sysfs_root):
+        if not entry.startswith('video') or not entry[5:].isdigit():
+            continue
+        node = os.path.join(sysfs_root, entry)
+        if _read(os.path.join(node, 'index')) not in ('', '0'):
+            continue
+        label = _read(os.path.join(node, 'name'))
+        device = os.path.realpath(os.path.join(node, 'device'))
+        candidates.append({
+            'index': int(entry[5:]),
+            'path': f'/dev/{entry}',
+            'label': label,
+            'identity': '|'.join((label, device, _usb_identity(device))),
+        })
+    candidates.sort(key=lambda c: c['index'])
+    return candidates
+
+
+def probe_camera(candidate):
+    """
+    Open a camera and read one frame.
+    
+    Args:
+        candidate: Candidate dict (a known device path selects V4L2 directly,
+                   skipping the other backends' timeouts)
+    
+    Returns:
+        Tuple of (available, info)
+    """
+    index = candidate['index']
+    if candidate.get('path', '').startswith('/dev/'):
+        cap = cv2.VideoCapture(index, cv2.CAP_V4L2)
+    else:
+        cap = cv2.VideoCapture(index)
+    try:
+        if not cap.isOpened():
+            return False, 'Could not be opened'
+        width = cap.get(cv2.CAP_PROP_FRAME_WIDTH)
+        height = cap.get(cv2.CAP_PROP_FRAME_HEIGHT)
+        ret, _ = cap.read()
+        return bool(ret), f'{int(width)}x{int(height)}' if ret else 'Failed to read frame'
+    finally:
+        cap.release()
+
+
+class CameraEnumerator:
+    """Finds cameras, probing only devices the cache does not cover."""
+    
+    def __init__(self, db=None, sysfs_root=SYSFS_VIDEO4LINUX, probe=probe_camera,
+                 timeout=DEFAULT_PROBE_TIMEOUT, max_workers=DEFAULT_MAX_WORKERS):
+        """
+        Initialize the enumerator.
+        
+        Args:
+            db: SettingsDatabase used as the cache (None = no caching)
+            sysfs_root: video4linux sysfs directory
+            probe: Callable(candidate) -> (available, info)
+            timeout: Seconds each device may take to probe
+            max_workers: Devices probed concurrently
+        """
+        self.db = db
+        self.sysfs_root = sysfs_root
+        self.probe = probe
+        self.timeout = timeout
+        self.max_workers = max_workers
+        self.probes = 0
+        self._lock = threading.Lock()
+    
+    def enumerate(self, refresh=False, max_cameras=DEFAULT_MAX_CAMERAS):
+        """
+        Find cameras.
+        
+        Args:
+            refresh: Probe every device instead of trusting the cache
+            max_cameras: Indices probed when there is no video4linux listing
+        
+        Returns:
+            List of camera dicts (index, name, label, path, identity,
+            available, info) sorted by index; devices that could not be
+            opened are included with available=False
+        """
+        with self._lock:
+            candidates = list_video_devices(self.sysfs_root)
+            listed = candidates is not None
+            if not listed:
+                candidates = [{'index': i, 'path': f'index:{i}', 'label': '', 'identity': ''}
+                              for i in range(max_cameras)]
+            
+            cached = {} if refresh else self._load_cache()
+            if not listed and cached:
+                # No listing to validate against: check the last scan's devices only
+                candidates = [{key: c[key] for key in ('index', 'path', 'label', 'identity')}
+                              for c in cached.values()]
+            
+            cameras, pending = [], []
+            for candidate in candidates:
+                entry = cached.get(candidate['path'])
+                # Only cameras that opened last time are trusted; busy or unplugged ones are probed again
+                if (entry and entry['available'] and entry['identity'] == candidate['identity']
+                        and entry['index'] == candidate['index']):
+                    cameras.append(entry)
+                else:
+                    pending.append(candidate)
+            
+            probed = self._probe_all(pending)
+            if not listed:
+                # Unlisted indices are mostly empty slots; keep only real cameras
+                probed = [c for c in probed if c['available'] or c['info'] != 'Could not be opened']
+            self._store_cache([c for c in probed if not c.get('timed_out')], replace=refresh)
+            cameras.extend(probed)
+            return sorted(cameras, key=lambda c: c['index'])
+    
+    def _probe_all(self, candidates):
+        """Probe candidates in parallel; slow devices are reported as timed out."""
+        if not candidates:
+            return []
+        outcomes = {}
+        finished = threading.Condition()
+        
+        def run(candidate):
+            try:
+                outcome = self.probe(candidate)
+            except Exception as e:
+                outcome = (False, f'Probe failed: {e}')
+            with finished:
+                outcomes[candidate['index']] = outcome
+                finished.notify_all()
+        
+        # Each device gets its own timeout from the moment its probe starts; a
+        # device that times out gives its worker slot to the next one in line
+        queued = list(candidates)
+        started = {}
+        timed_out = set()
+        with finished:
+            while True:
+                now = time.monotonic()
+                running = [index for index in started if index not in outcomes and index not in timed_out]
+                for index in running:
+                    if now - started[index] >= self.timeout:
+                        timed_out.add(index)
+                running = [index for index in running if index not in timed_out]
+                while queued and len(running) < self.max_workers:
+                    candidate = queued.pop(0)
+                    started[candidate['index']] = now
+                    running.append(candidate['index'])
+                    # Daemon threads: a driver stuck in open() must not hold up exit
+                    threading.Thread(target=run, args=(candidate,), name=f"camera-probe-{candidate['index']}",
+                                     daemon=True).start()
+                if not running:
+                    break
+                finished.wait(min(started[index] for index in running) + self.timeout - now)
+            outcomes = {index: outcome for index, outcome in outcomes.items() if index not in timed_out}
+        
+        results = []
+        for candidate in candidates:
+            camera = dict(candidate, name=f"Camera {candidate['index']}")
+            if candidate['index'] in outcomes:
+                camera['available'], camera['info'] = outcomes[candidate['index']]
+            else:
+                logger.warning(f"Camera {candidate['index']} did not respond within {self.timeout:g} s")
+                camera['available'], camera['info'], camera['timed_out'] = False, 'Timed out', True
+            results.append(camera)
+        self.probes += len(candidates)
+        return results
+    
+    def _load_cache(self):
+        """Cached cameras keyed by device path."""
+        if not self.db:
+            return {}
+        try:
+            return {c['path']: dict(c, name=f"Camera {c['index']}") for c in self.db.get_camera_devices()}
+        except Exception as e:
+            logger.warning(f"Camera cache unavailable: {e}")
+            return {}
+    
+    def _store_cache(self, cameras, replace):
+        """Write probe results to the cache."""
+        if not self.db:
+            return
+        try:
+            self.db.save_camera_devices(cameras, replace=replace)
+        except Exception as e:
+            logger.warning(f"Failed to cache camera list: {e}")
@@ -0,0 +1,228 @@
+"""
+Per-camera capture profiles.
+Opens a camera with a requested resolution, frame rate, pixel format and
+driver buffer size on a chosen backend (including V4L2 or a GStreamer
+pipeline ending in a dropping appsink), then reads back what the driver
+actually negotiated.
+"""
+
+import logging
+import cv2
+
+
+logger = logging.getLogger(__name__)
+
+# Capture backends selectable per camera
+BACKENDS = {
+    'auto': cv2.CAP_ANY,
+    'v4l2': cv2.CAP_V4L2,
+    'gstreamer': cv2.CAP_GSTREAMER,
+    'dshow': cv2.CAP_DSHOW,
+    'msmf': cv2.CAP_MSMF,
+    'avfoundation': cv2.CAP_AVFOUNDATION,
+}
+DEFAULT_BACKEND = 'auto'
+
+# Pixel formats: MJPG gets full frame rates over USB 2, YUYV avoids decoding
+FOURCCS = ('MJPG', 'YUYV')
+
+# One buffered frame keeps capture latency to a single frame
+DEFAULT_BUFFER_SIZE = 1
+
+# GStreamer caps per pixel format; {index} etc. are filled from the profile
+GSTREAMER_SOURCE = 'v4l2src device=/dev/video{index}'
+GSTREAMER_CAPS = {
+    'MJPG': 'image/jpeg{caps} ! jpegdec',
+    'YUYV': 'video/x-raw,format=YUY2{caps}',
+    None: 'video/x-raw{caps}',
+}
+GSTREAMER_SINK = 'videoconvert ! video/x-raw,format=BGR ! appsink drop=true max-buffers={buffers} sync=false'
+
+
+class CameraProfile:
+    """Requested capture format for one camera."""
+    
+    def __init__(self, width=None, height=None, fps=None, fourcc=None,
+                 buffer_size=DEFAULT_BUFFER_SIZE, backend=DEFAULT_BACKEND, pipeline=None):
+        """
+        Initialize a capture profile (None leaves a value at the driver default).
+        
+        Args:
+            width, height: Requested frame size in pixels
+            fps: Requested frame rate
+            fourcc: Pixel format ('MJPG' or 'YUYV')
+            buffer_size: Frames buffered by the driver (CAP_PROP_BUFFERSIZE)
+            backend: Key of BACKENDS
+            pipeline: Custom GStreamer pipeline ({index} is replaced by the
+                      camera index); must end in an appsink
+        """
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown capture backend '{backend}'; expected one of {tuple(BACKENDS)}")
+        if fourcc is not None and fourcc not in FOURCCS:
+            raise ValueError(f"Unsupported FOURCC '{fourcc}'; expected one of {FOURCCS}")
+        if pipeline and backend != 'gstreamer':
+            raise ValueError("A pipeline string requires the 'gstreamer' backend")
+        if (width is None) != (height is None):
+            raise ValueError("Width and height must be given together")
+        self.width = int(width) if width else None
+        self.height = int(height) if height else None
+        self.fps = float(fps) if fps else None
+        self.fourcc = fourcc
+        self.buffer_size = int(buffer_size) if buffer_size else None
+        self.backend = backend
+        self.pipeline = pipeline or None
+    
+    @classmethod
+    def from_dict(cls, values):
+        """Build a profile from a database row (see SettingsDatabase.get_camera_profile)."""
+        if not values:
+            return cls()
+        return cls(width=values.get('width'), height=values.get('height'), fps=values.get('fps'),
+                   fourcc=values.get('fourcc'), buffer_size=values.get('buffer_size'),
+                   backend=values.get('backend') or DEFAULT_BACKEND, pipeline=values.get('pipeline'))
+    
+    def to_dict(self):
+        """Profile values as stored in the database."""
+        return {
+            'width': self.width,
+            'height': self.height,
+            'fps': self.fps,
+            'fourcc': self.fourcc,
+            'buffer_size': self.buffer_size,
+            'backend': self.backend,
+            'pipeline': self.pipeline,
+        }
+    
+    def gstreamer_pipeline(self, camera_index):
+        """
+        GStreamer pipeline for a camera.
+        
+        The default pipeline requests the profile's format from v4l2src and
+        ends in an appsink that drops stale frames instead of queueing them.
+        """
+        if self.pipeline:
+            return self.pipeline.replace('{index}', str(camera_index))
+        caps = ''
+        if self.width:
+            caps += f',width={self.width},height={self.height}'
+        if self.fps:
+            caps += f',framerate={int(round(self.fps))}/1'
+        return ' ! '.join((
+            GSTREAMER_SOURCE.format(index=camera_index),
+            GSTREAMER_CAPS[self.fourcc].format(caps=caps),
+            GSTREAMER_SINK.format(buffers=self.buffer_size or DEFAULT_BUFFER_SIZE),
+        ))
+
+
+def fourcc_to_str(code):
+    """Decode a CAP_PROP_FOURCC value ('' if unknown)."""
+    code = int(code)
+    if code <= 0:
+        return ''
+    text = ''.join(chr((code >> (8 * i)) & 0xFF) for i in range(4))
+    return text if text.isprintable() else ''
+
+
+def open_capture(camera_index, profile=None, capture_factory=None):
+    """
+    Open a camera and apply a capture profile.
+    
+    The pixel format is requested before the frame size (V4L2 picks the
+    sizes offered for the current format), then the frame rate and driver
+    buffer size. If the profile's backend cannot open the camera, the
+    default backend is tried.
+    
+    Args:
+        camera_index: Camera device index
+        profile: CameraProfile (None = driver defaults)
+        capture_factory: cv2.VideoCapture (default) or a compatible callable
+    
+    Returns:
+        Opened (or failed) capture; check isOpened()
+    """
+    profile = profile or CameraProfile()
+    capture_factory = capture_factory or cv2.VideoCapture
+    
+    if profile.backend == 'gstreamer':
+        capture = capture_factory(profile.gstreamer_pipeline(camera_index), cv2.CAP_GSTREAMER)
+        if capture.isOpened():
+            return capture
+        logger.warning(f"GStreamer pipeline for camera {camera_index} failed; using the default backend")
+        capture.release()
+        capture = capture_factory(camera_index)
+    elif profile.backend != DEFAULT_BACKEND:
+        capture = capture_factory(camera_index, BACKENDS[profile.backend])
+        if not capture.isOpened():
+            logger.warning(f"Backend {profile.backend} cannot open camera {camera_index}; using the default backend")
+            capture.release()
+            capture = capture_factory(camera_index)
+    else:
+        capture = capture_factory(camera_index)
+    
+    if not capture.isOpened():
+        return capture
+    
+    if profile.fourcc:
+        capture.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*profile.fourcc))
+    if profile.width:
+        capture.set(cv2.CAP_PROP_FRAME_WIDTH, profile.width)
+        capture.set(cv2.CAP_PROP_FRAME_HEIGHT, profile.height)
+    if profile.fps:
+        capture.set(cv2.CAP_PROP_FPS, profile.fps)
+    if profile.buffer_size:
+        capture.set(cv2.CAP_PROP_BUFFERSIZE, profile.buffer_size)
+    return capture
+
+
+def negotiated_format(capture):
+    """
+    Read back the format a capture actually runs at.
+    
+    Returns:
+        Dictionary with backend, width, height, fps, fourcc and buffer_size
+        (0 or '' where the backend does not report a value)
+    """
+    try:
+        backend = capture.getBackendName()
+    except Exception:
+        backend = ''
+    return {
+        'backend': backend,
+        'width': int(capture.get(cv2.CAP_PROP_FRAME_WIDTH)),
+        'height': int(capture.get(cv2.CAP_PROP_FRAME_HEIGHT)),
+        'fps': round(float(capture.get(cv2.CAP_PROP_FPS)), 2),
+        'fourcc': fourcc_to_str(capture.get(cv2.CAP_PROP_FOURCC)),
+        'buffer_size': int(capture.get(cv2.CAP_PROP_BUFFERSIZE)),
+    }
+
+
+def describe_format(negotiated):
+    """Short human-readable form of negotiated_format(), e.g. '1280x720 @ 30 fps MJPG (V4L2)'."""
+    text = f"{negotiated['width']}x{negotiated['height']}"
+    if negotiated['fps'] > 0:
+        text += f" @ {negotiated['fps']:g} fps"
+    if negotiated['fourcc']:
+        text += f" {negotiated['fourcc']}"
+    if negotiated['backend']:
+        text += f" ({negotiated['backend']})"
+    return text
+
+
+def profile_mismatches(profile, negotiated):
+    """
+    List requested values the driver did not grant.
+    
+    Returns:
+        List of 'name: requested -> negotiated' strings (empty if all granted)
+    """
+    mismatches = []
+    if profile.width and (negotiated['width'], negotiated['height']) != (profile.width, profile.height):
+        mismatches.append(f"size: {profile.width}x{profile.height} -> "
+                          f"{negotiated['width']}x{negotiated['height']}")
+    if profile.fps and negotiated['fps'] > 0 and abs(negotiated['fps'] - profile.fps) > 0.5:
+        mismatches.append(f"fps: {profile.fps:g} -> {negotiated['fps']:g}")
+    if profile.fourcc and negotiated['fourcc'] and negotiated['fourcc'] != profile.fourcc:
+        mismatches.append(f"fourcc: {profile.fourcc} -> {negotiated['fourcc']}")
+    if profile.buffer_size and negotiated['buffer_size'] > 0 and negotiated['buffer_size'] != profile.buffer_size:
+        mismatches.append(f"buffer: {profile.buffer_size} -> {negotiated['buffer_size']}")
+    return mismatches
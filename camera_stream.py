@@ -0,0 +1,129 @@
+"""
+Background camera capture with a latest-frame slot.
+Keeps reading from the camera on a worker thread so UI callbacks never block
+on the device and always pick up the newest frame.
+"""
+
+import threading
+import time
+
+from frame_timing import timed, STAGE_CAPTURE
+
+
+class CameraStream:
+    """Reads frames on a background thread into a single latest-frame slot."""
+    
+    # Consecutive failed reads before the stream is considered lost
+    MAX_READ_FAILURES = 30
+    # Back-off between failed reads (seconds)
+    READ_FAILURE_DELAY = 0.01
+    
+    def __init__(self, capture, name='camera', timings=None):
+        """
+        Initialize the stream around an opened capture device.
+        
+        Args:
+            capture: cv2.VideoCapture (or any object with read/isOpened/release)
+            name: Name used for the worker thread
+            timings: Optional FrameTimings recording each capture read
+        """
+        self.capture = capture
+        self.name = name
+        self.timings = timings
+        self.frames_captured = 0
+        self.frames_dropped = 0
+        self.failed = False
+        self._frame = None
+        self._lock = threading.Lock()
+        self._new_frame = threading.Condition(self._lock)
+        self._running = False
+        self._thread = None
+        # Whether the worker has left its loop, and whether it must release
+        # the capture itself because release() stopped waiting for it
+        self._worker_done = True
+        self._release_on_exit = False
+    
+    def isOpened(self):
+        """Check whether the underlying capture device is open."""
+        return self.capture is not None and self.capture.isOpened()
+    
+    def start(self):
+        """Start the capture worker thread."""
+        if self._running:
+            return self
+        self._running = True
+        self.failed = False
+        self._worker_done = False
+        self._thread = threading.Thread(target=self._run, name=f'{self.name}-capture', daemon=True)
+        self._thread.start()
+        return self
+    
+    def _run(self):
+        """Worker loop: read frames and publish the newest one."""
+        capture = self.capture
+        failures = 0
+        try:
+            while self._running:
+                with timed(self.timings, STAGE_CAPTURE):
+                    ret, frame = capture.read()
+                if not self._running:
+                    break
+                if not ret:
+                    failures += 1
+                    if failures >= self.MAX_READ_FAILURES:
+                        self.failed = True
+                        break
+                    time.sleep(self.READ_FAILURE_DELAY)
+                    continue
+                failures = 0
+                
+                with self._lock:
+                    # Drop-oldest: an unconsumed frame is replaced by the new one
+                    if self._frame is not None:
+                        self.frames_dropped += 1
+                    self._frame = frame
+                    self.frames_captured += 1
+                    self._new_frame.notify_all()
+        finally:
+            with self._lock:
+                self._worker_done = True
+                release_capture = self._release_on_exit
+            if release_capture:
+                capture.release()
+    
+    def read(self, timeout=None):
+        """
+        Take the newest frame from the slot.
+        
+        Args:
+            timeout: Seconds to wait for a frame (None returns immediately)
+        
+        Returns:
+            Tuple of (ret, frame); (False, None) if no new frame is available
+        """
+        with self._lock:
+            if self._frame is None and timeout:
+                self._new_frame.wait(timeout)
+            frame = self._frame
+            self._frame = None
+        return frame is not None, frame
+    
+    def release(self):
+        """
+        Stop the worker thread and release the capture device.
+        
+        A worker still blocked in read() after the join timeout keeps the
+        device until that read returns and releases it itself; releasing a
+        capture mid-read is not safe with most backends.
+        """
+        self._running = False
+        capture, self.capture = self.capture, None
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+        with self._lock:
+            self._frame = None
+            self._release_on_exit = not self._worker_done
+            release_capture = not self._release_on_exit
+        if capture is not None and release_capture:
+            capture.release()
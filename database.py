@@ -1,11 +1,35 @@
 import sqlite3
 import os
+import math
+import threading
+import time
 
 
 # Default settings constants
 DEFAULT_TILT_THRESHOLD = 15.0  # degrees
 DEFAULT_CAMERA_INDEX = 0  # default camera
 DEFAULT_THEME = 'dark'  # default theme: 'dark' or 'light'
+DEFAULT_LANDMARK_SMOOTHING = 'one_euro'  # 'off', 'ema' or 'one_euro'
+LANDMARK_SMOOTHING_MODES = ('off', 'ema', 'one_euro')
+DEFAULT_INFERENCE_DECIMATION = 0  # 0 = automatic, N = infer every Nth frame
+MAX_INFERENCE_DECIMATION = 8
+DEFAULT_INFERENCE_RESOLUTION = 480  # inference frame height; 0 = native
+DEFAULT_ADAPTIVE_QUALITY = True  # adjust quality to the frame latency budget
+DEFAULT_PERF_OVERLAY = False  # draw per-stage frame timings on the camera display
+INFERENCE_RESOLUTIONS = (0, 240, 360, 480, 720)
+# Columns of a camera capture profile (see camera_profile.CameraProfile)
+CAMERA_PROFILE_FIELDS = ('width', 'height', 'fps', 'fourcc', 'buffer_size', 'backend', 'pipeline')
+
+# Connection tuning
+DB_TIMEOUT = 5.0  # seconds to wait for a lock held by another connection
+STATEMENT_CACHE_SIZE = 128  # prepared statements cached per connection
+
+# Posture rollup bucket sizes in seconds (coarsest first); buckets are
+# aligned to the Unix epoch, so days are UTC days
+ROLLUP_DAY = 86400
+ROLLUP_HOUR = 3600
+ROLLUP_MINUTE = 60
+ROLLUP_BUCKET_SIZES = (ROLLUP_DAY, ROLLUP_HOUR, ROLLUP_MINUTE)
 
 
 class SettingsDatabase:
@@ -14,13 +38,49 @@ class SettingsDatabase:
     def __init__(self, db_path='posture_settings.db'):
         """Initialize database connection and create tables if needed."""
         self.db_path = db_path
+        # Write-through snapshot of the settings table (reads never touch SQLite)
+        self._settings = {}
+        self._settings_lock = threading.RLock()
+        self._listeners = []
+        # One long-lived connection per thread, opened on first use
+        self._local = threading.local()
+        self._connections = []
+        self._connections_lock = threading.Lock()
         self.init_db()
     
+    def _connection(self):
+        """Get this thread's long-lived connection, opening it on first use."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            # check_same_thread=False only so close() can close every thread's
+            # connection; each connection is still used by its own thread only
+            conn = sqlite3.connect(self.db_path, timeout=DB_TIMEOUT,
+                                   cached_statements=STATEMENT_CACHE_SIZE,
+                                   check_same_thread=False)
+            # WAL makes each commit a sequential append; NORMAL skips the
+            # per-commit fsync while staying corruption-safe in WAL mode
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+            with self._connections_lock:
+                self._connections.append(conn)
+        return conn
+    
+    def close(self):
+        """Close all connections opened by this database handler."""
+        with self._connections_lock:
+            connections, self._connections = self._connections, []
+        for conn in connections:
+            conn.close()
+        self._local = threading.local()
+    
     def init_db(self):
         """Create settings and training tables if they don't exist."""
-        conn = sqlite3.connect(self.db_path)
+        conn = sqlite3.connect(self.db_path, timeout=DB_TIMEOUT)
         cursor = conn.cursor()
         
+        # Write-ahead logging is persistent; readers no longer block writers
+        cursor.execute('PRAGMA journal_mode=WAL')
+        
         # Settings table
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS settings (
@@ -52,28 +112,139 @@ class SettingsDatabase:
             )
         ''')
         
+        # History is always read newest-first
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_workout_history_date
+            ON workout_history (date)
+        ''')
+        
+        # Posture time series (one row per analyzed frame, Unix timestamps;
+        # duration is the time the sample accounts for, in seconds)
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS posture_samples (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                timestamp REAL NOT NULL,
+                tilt_angle REAL NOT NULL,
+                is_bad_posture INTEGER NOT NULL,
+                duration REAL NOT NULL DEFAULT 0
+            )
+        ''')
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_posture_samples_timestamp
+            ON posture_samples (timestamp)
+        ''')
+        # Samples logged before durations were recorded lack the column
+        columns = {row[1] for row in cursor.execute('PRAGMA table_info(posture_samples)')}
+        migrated = 'duration' not in columns
+        if migrated:
+            cursor.execute('ALTER TABLE posture_samples ADD COLUMN duration REAL NOT NULL DEFAULT 0')
+        
+        # Per-minute/hour/day posture aggregates, maintained as samples arrive
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS posture_rollups (
+                bucket_size INTEGER NOT NULL,
+                bucket_start INTEGER NOT NULL,
+                sample_count INTEGER NOT NULL,
+                tilt_sum REAL NOT NULL,
+                tilt_min REAL NOT NULL,
+                tilt_max REAL NOT NULL,
+                tracked_seconds REAL NOT NULL,
+                bad_seconds REAL NOT NULL,
+                PRIMARY KEY (bucket_size, bucket_start)
+            )
+        ''')
+        
+        # Per-camera capture profiles (NULL = driver default)
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS camera_profiles (
+                camera_index INTEGER PRIMARY KEY,
+                width INTEGER,
+                height INTEGER,
+                fps REAL,
+                fourcc TEXT,
+                buffer_size INTEGER,
+                backend TEXT NOT NULL DEFAULT 'auto',
+                pipeline TEXT
+            )
+        ''')
+        
+        # Camera enumeration cache, keyed by device path; identity changes
+        # (another camera on the same node) invalidate an entry
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS camera_devices (
+                path TEXT PRIMARY KEY,
+                identity TEXT NOT NULL,
+                camera_index INTEGER NOT NULL,
+                label TEXT,
+                available INTEGER NOT NULL,
+                info TEXT,
+                probed_at REAL NOT NULL
+            )
+        ''')
+        
         conn.commit()
+        
+        # Load the settings snapshot with the setup connection
+        self._load_settings(conn)
         conn.close()
+        
+        # Existing samples predate the rollups: bucket them once
+        if migrated:
+            self.rebuild_posture_rollups()
+    
+    def _load_settings(self, conn):
+        """Replace the in-memory settings snapshot with the table contents."""
+        cursor = conn.execute('SELECT key, value FROM settings')
+        results = cursor.fetchall()
+        
+        with self._settings_lock:
+            self._settings = dict(results)
+    
+    def reload_settings(self):
+        """Reload the in-memory settings snapshot from the database."""
+        self._load_settings(self._connection())
     
     def get_setting(self, key, default=None):
-        """Retrieve a setting value by key."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        cursor.execute('SELECT value FROM settings WHERE key = ?', (key,))
-        result = cursor.fetchone()
-        conn.close()
-        return result[0] if result else default
+        """Retrieve a setting value by key (served from the in-memory snapshot)."""
+        return self._settings.get(key, default)
     
     def set_setting(self, key, value):
-        """Store or update a setting value."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        cursor.execute('''
-            INSERT OR REPLACE INTO settings (key, value)
-            VALUES (?, ?)
-        ''', (key, value))
-        conn.commit()
-        conn.close()
+        """Store or update a setting value and notify subscribers."""
+        with self._settings_lock:
+            conn = self._connection()
+            with conn:
+                conn.execute('''
+                    INSERT OR REPLACE INTO settings (key, value)
+                    VALUES (?, ?)
+                ''', (key, value))
+            
+            # Update the snapshot only after the write succeeded
+            value = value if isinstance(value, str) else str(value)
+            changed = self._settings.get(key) != value
+            self._settings[key] = value
+            listeners = list(self._listeners)
+        
+        if changed:
+            for callback in listeners:
+                callback(key, value)
+    
+    def subscribe(self, callback):
+        """
+        Register a callback for setting changes.
+        
+        Args:
+            callback: Callable(key, value) invoked on the writing thread
+                      after a setting value changes
+        """
+        with self._settings_lock:
+            if callback not in self._listeners:
+                self._listeners.append(callback)
+    
+    def unsubscribe(self, callback):
+        """Remove a callback registered with subscribe()."""
+        with self._settings_lock:
+            if callback in self._listeners:
+                self._listeners.remove(callback)
     
     def get_tilt_threshold(self):
         """Get the tilt threshold setting (default: 15 degrees)."""
@@ -101,34 +272,177 @@ class SettingsDatabase:
             raise ValueError("Theme must be 'dark' or 'light'")
         self.set_setting('theme', value)
     
+    def get_landmark_smoothing(self):
+        """Get the landmark smoothing mode (default: 'one_euro')."""
+        value = self.get_setting('landmark_smoothing', DEFAULT_LANDMARK_SMOOTHING)
+        return value if value in LANDMARK_SMOOTHING_MODES else DEFAULT_LANDMARK_SMOOTHING
+    
+    def set_landmark_smoothing(self, value):
+        """Set the landmark smoothing mode ('off', 'ema' or 'one_euro')."""
+        if value not in LANDMARK_SMOOTHING_MODES:
+            raise ValueError("Landmark smoothing must be 'off', 'ema' or 'one_euro'")
+        self.set_setting('landmark_smoothing', value)
+    
+    def get_inference_resolution(self):
+        """Get the inference frame height in pixels (default: 480; 0 = native)."""
+        try:
+            value = int(self.get_setting('inference_resolution', str(DEFAULT_INFERENCE_RESOLUTION)))
+        except ValueError:
+            return DEFAULT_INFERENCE_RESOLUTION
+        return value if value in INFERENCE_RESOLUTIONS else DEFAULT_INFERENCE_RESOLUTION
+    
+    def set_inference_resolution(self, value):
+        """Set the inference frame height (one of 0, 240, 360, 480, 720)."""
+        value = int(value)
+        if value not in INFERENCE_RESOLUTIONS:
+            raise ValueError(f"Inference resolution must be one of {INFERENCE_RESOLUTIONS}")
+        self.set_setting('inference_resolution', str(value))
+    
+    def get_adaptive_quality(self):
+        """Get whether adaptive quality control is enabled (default: True)."""
+        return self.get_setting('adaptive_quality', '1' if DEFAULT_ADAPTIVE_QUALITY else '0') == '1'
+    
+    def set_adaptive_quality(self, enabled):
+        """Enable or disable adaptive quality control."""
+        self.set_setting('adaptive_quality', '1' if enabled else '0')
+    
+    def get_perf_overlay(self):
+        """Get whether the frame timing overlay is shown (default: False)."""
+        return self.get_setting('perf_overlay', '1' if DEFAULT_PERF_OVERLAY else '0') == '1'
+    
+    def set_perf_overlay(self, enabled):
+        """Show or hide the frame timing overlay."""
+        self.set_setting('perf_overlay', '1' if enabled else '0')
+    
+    def get_inference_decimation(self, stream):
+        """
+        Get the inference decimation of a stream (default: 0, automatic).
+        
+        Args:
+            stream: Stream name ('tracking' or 'training')
+        """
+        try:
+            value = int(self.get_setting(f'{stream}_inference_decimation',
+                                         str(DEFAULT_INFERENCE_DECIMATION)))
+        except ValueError:
+            return DEFAULT_INFERENCE_DECIMATION
+        return value if 0 <= value <= MAX_INFERENCE_DECIMATION else DEFAULT_INFERENCE_DECIMATION
+    
+    def set_inference_decimation(self, stream, value):
+        """Pin the inference decimation of a stream (0 = automatic, 1 = every frame)."""
+        value = int(value)
+        if not 0 <= value <= MAX_INFERENCE_DECIMATION:
+            raise ValueError(f"Inference decimation must be between 0 and {MAX_INFERENCE_DECIMATION}")
+        self.set_setting(f'{stream}_inference_decimation', str(value))
+    
+    # ===== Camera Profile Methods =====
+    
+    def get_camera_profile(self, camera_index):
+        """
+        Get the capture profile of a camera.
+        
+        Returns:
+            Dictionary of profile fields (see CAMERA_PROFILE_FIELDS), or None
+            if the camera has no stored profile
+        """
+        conn = self._connection()
+        row = conn.execute(f'''
+            SELECT {', '.join(CAMERA_PROFILE_FIELDS)}
+            FROM camera_profiles WHERE camera_index = ?
+        ''', (int(camera_index),)).fetchone()
+        if row is None:
+            return None
+        return dict(zip(CAMERA_PROFILE_FIELDS, row))
+    
+    def set_camera_profile(self, camera_index, profile):
+        """
+        Store the capture profile of a camera.
+        
+        Args:
+            camera_index: Camera device index
+            profile: Dictionary of profile fields (missing fields are stored
+                     as driver defaults), e.g. CameraProfile.to_dict()
+        """
+        unknown = set(profile) - set(CAMERA_PROFILE_FIELDS)
+        if unknown:
+            raise ValueError(f"Unknown camera profile fields: {sorted(unknown)}")
+        values = [profile.get(field) for field in CAMERA_PROFILE_FIELDS]
+        values[CAMERA_PROFILE_FIELDS.index('backend')] = profile.get('backend') or 'auto'
+        conn = self._connection()
+        with conn:
+            conn.execute(f'''
+                INSERT OR REPLACE INTO camera_profiles
+                    (camera_index, {', '.join(CAMERA_PROFILE_FIELDS)})
+                VALUES (?, {', '.join('?' * len(CAMERA_PROFILE_FIELDS))})
+            ''', [int(camera_index)] + values)
+    
+    def delete_camera_profile(self, camera_index):
+        """Remove a camera's capture profile (back to driver defaults)."""
+        conn = self._connection()
+        with conn:
+            conn.execute('DELETE FROM camera_profiles WHERE camera_index = ?', (int(camera_index),))
+    
+    def get_camera_devices(self):
+        """
+        Get the cached camera enumeration.
+        
+        Returns:
+            List of dicts with index, path, identity, label, available and info
+        """
+        conn = self._connection()
+        cursor = conn.execute('''
+            SELECT camera_index, path, identity, label, available, info
+            FROM camera_devices ORDER BY camera_index
+        ''')
+        return [
+            {'index': row[0], 'path': row[1], 'identity': row[2], 'label': row[3] or '',
+             'available': bool(row[4]), 'info': row[5] or ''}
+            for row in cursor.fetchall()
+        ]
+    
+    def save_camera_devices(self, cameras, replace=False):
+        """
+        Cache camera enumeration results.
+        
+        Args:
+            cameras: Dicts with index, path, identity, label, available and info
+            replace: Drop cached devices not in cameras (after a full scan)
+        """
+        now = time.time()
+        rows = [(c['path'], c.get('identity') or '', int(c['index']), c.get('label') or '',
+                 1 if c['available'] else 0, c.get('info') or '', now) for c in cameras]
+        conn = self._connection()
+        with conn:
+            if replace:
+                conn.execute('DELETE FROM camera_devices')
+            conn.executemany('''
+                INSERT OR REPLACE INTO camera_devices
+                    (path, identity, camera_index, label, available, info, probed_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            ''', rows)
+    
     # ===== Training/Workout Methods =====
     
     def add_exercise_to_workout(self, exercise_id, sets=3, reps=10):
         """Add an exercise to current workout."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        cursor.execute('''
-            INSERT INTO current_workout (exercise_id, sets, reps)
-            VALUES (?, ?, ?)
-        ''', (exercise_id, sets, reps))
-        conn.commit()
-        conn.close()
+        conn = self._connection()
+        with conn:
+            conn.execute('''
+                INSERT INTO current_workout (exercise_id, sets, reps)
+                VALUES (?, ?, ?)
+            ''', (exercise_id, sets, reps))
     
     def remove_exercise_from_workout(self, workout_id):
         """Remove an exercise from current workout."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        cursor.execute('DELETE FROM current_workout WHERE id = ?', (workout_id,))
-        conn.commit()
-        conn.close()
+        conn = self._connection()
+        with conn:
+            conn.execute('DELETE FROM current_workout WHERE id = ?', (workout_id,))
     
     def get_current_workout(self):
         """Get all exercises in current workout."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        cursor.execute('SELECT id, exercise_id, sets, reps, added_date FROM current_workout ORDER BY added_date')
+        cursor = self._connection().execute(
+            'SELECT id, exercise_id, sets, reps, added_date FROM current_workout ORDER BY added_date')
         results = cursor.fetchall()
-        conn.close()
         
         workout = []
         for row in results:
@@ -143,48 +457,37 @@ class SettingsDatabase:
     
     def clear_current_workout(self):
         """Clear all exercises from current workout."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        cursor.execute('DELETE FROM current_workout')
-        conn.commit()
-        conn.close()
+        conn = self._connection()
+        with conn:
+            conn.execute('DELETE FROM current_workout')
     
     def update_workout_exercise(self, workout_id, sets=None, reps=None):
         """Update sets/reps for an exercise in current workout."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        if sets is not None:
-            cursor.execute('UPDATE current_workout SET sets = ? WHERE id = ?', (sets, workout_id))
-        if reps is not None:
-            cursor.execute('UPDATE current_workout SET reps = ? WHERE id = ?', (reps, workout_id))
-        
-        conn.commit()
-        conn.close()
+        conn = self._connection()
+        with conn:
+            if sets is not None:
+                conn.execute('UPDATE current_workout SET sets = ? WHERE id = ?', (sets, workout_id))
+            if reps is not None:
+                conn.execute('UPDATE current_workout SET reps = ? WHERE id = ?', (reps, workout_id))
     
     def save_workout_to_history(self, exercise_id, sets_completed, reps_completed, notes=''):
         """Save completed workout to history."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        cursor.execute('''
-            INSERT INTO workout_history (exercise_id, sets_completed, reps_completed, notes)
-            VALUES (?, ?, ?, ?)
-        ''', (exercise_id, sets_completed, reps_completed, notes))
-        conn.commit()
-        conn.close()
+        conn = self._connection()
+        with conn:
+            conn.execute('''
+                INSERT INTO workout_history (exercise_id, sets_completed, reps_completed, notes)
+                VALUES (?, ?, ?, ?)
+            ''', (exercise_id, sets_completed, reps_completed, notes))
     
     def get_workout_history(self, limit=50):
         """Get workout history."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        cursor.execute('''
+        cursor = self._connection().execute('''
             SELECT id, exercise_id, sets_completed, reps_completed, date, notes
             FROM workout_history
             ORDER BY date DESC
             LIMIT ?
         ''', (limit,))
         results = cursor.fetchall()
-        conn.close()
         
         history = []
         for row in results:
@@ -197,3 +500,164 @@ class SettingsDatabase:
                 'notes': row[5]
             })
         return history
+    
+    # ===== Posture Logging Methods =====
+    
+    def add_posture_samples(self, samples):
+        """
+        Insert a batch of posture samples and update the rollups in one transaction.
+        
+        Args:
+            samples: Sequence of (timestamp, tilt_angle, is_bad_posture, duration) tuples
+        """
+        conn = self._connection()
+        with conn:
+            conn.executemany('''
+                INSERT INTO posture_samples (timestamp, tilt_angle, is_bad_posture, duration)
+                VALUES (?, ?, ?, ?)
+            ''', samples)
+            self._update_posture_rollups(conn, samples)
+    
+    def _update_posture_rollups(self, conn, samples):
+        """Fold a batch of samples into the rollup buckets (caller commits)."""
+        buckets = {}
+        for timestamp, tilt_angle, is_bad_posture, duration in samples:
+            for size in ROLLUP_BUCKET_SIZES:
+                key = (size, int(timestamp // size) * size)
+                bucket = buckets.get(key)
+                if bucket is None:
+                    buckets[key] = [1, tilt_angle, tilt_angle, tilt_angle,
+                                    duration, duration if is_bad_posture else 0.0]
+                else:
+                    bucket[0] += 1
+                    bucket[1] += tilt_angle
+                    bucket[2] = min(bucket[2], tilt_angle)
+                    bucket[3] = max(bucket[3], tilt_angle)
+                    bucket[4] += duration
+                    if is_bad_posture:
+                        bucket[5] += duration
+        
+        conn.executemany('''
+            INSERT INTO posture_rollups (bucket_size, bucket_start, sample_count, tilt_sum,
+                                         tilt_min, tilt_max, tracked_seconds, bad_seconds)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT (bucket_size, bucket_start) DO UPDATE SET
+                sample_count = sample_count + excluded.sample_count,
+                tilt_sum = tilt_sum + excluded.tilt_sum,
+                tilt_min = MIN(tilt_min, excluded.tilt_min),
+                tilt_max = MAX(tilt_max, excluded.tilt_max),
+                tracked_seconds = tracked_seconds + excluded.tracked_seconds,
+                bad_seconds = bad_seconds + excluded.bad_seconds
+        ''', [key + tuple(bucket) for key, bucket in buckets.items()])
+    
+    def rebuild_posture_rollups(self):
+        """Recompute all rollup buckets from the raw posture samples."""
+        conn = self._connection()
+        with conn:
+            conn.execute('DELETE FROM posture_rollups')
+            cursor = conn.execute('''
+                SELECT timestamp, tilt_angle, is_bad_posture, duration
+                FROM posture_samples
+            ''')
+            while True:
+                rows = cursor.fetchmany(10000)
+                if not rows:
+                    break
+                self._update_posture_rollups(conn, rows)
+    
+    def get_posture_stats(self, start, end):
+        """
+        Get posture statistics for a time range.
+        
+        The range is answered from the coarsest rollup buckets that fit inside
+        it, finer buckets at its edges and raw samples only for the partial
+        minutes at either end.
+        
+        Args:
+            start, end: Unix timestamps (inclusive start, exclusive end)
+        
+        Returns:
+            Dictionary with sample_count, average_tilt, min_tilt, max_tilt,
+            tracked_seconds, bad_seconds and bad_posture_percent
+        """
+        conn = self._connection()
+        totals = [0, 0.0, None, None, 0.0, 0.0]
+        
+        def merge(row):
+            if not row or not row[0]:
+                return
+            totals[0] += row[0]
+            totals[1] += row[1]
+            totals[2] = row[2] if totals[2] is None else min(totals[2], row[2])
+            totals[3] = row[3] if totals[3] is None else max(totals[3], row[3])
+            totals[4] += row[4]
+            totals[5] += row[5]
+        
+        def cover(lo, hi, sizes):
+            if lo >= hi:
+                return
+            if not sizes:
+                merge(conn.execute('''
+                    SELECT COUNT(*), SUM(tilt_angle), MIN(tilt_angle), MAX(tilt_angle),
+                           SUM(duration), SUM(CASE WHEN is_bad_posture THEN duration ELSE 0 END)
+                    FROM posture_samples
+                    WHERE timestamp >= ? AND timestamp < ?
+                ''', (lo, hi)).fetchone())
+                return
+            size = sizes[0]
+            first = math.ceil(lo / size) * size
+            last = math.floor(hi / size) * size
+            if first >= last:
+                cover(lo, hi, sizes[1:])
+                return
+            merge(conn.execute('''
+                SELECT SUM(sample_count), SUM(tilt_sum), MIN(tilt_min), MAX(tilt_max),
+                       SUM(tracked_seconds), SUM(bad_seconds)
+                FROM posture_rollups
+                WHERE bucket_size = ? AND bucket_start >= ? AND bucket_start < ?
+            ''', (size, first, last)).fetchone())
+            cover(lo, first, sizes[1:])
+            cover(last, hi, sizes[1:])
+        
+        cover(start, end, ROLLUP_BUCKET_SIZES)
+        
+        count, tilt_sum, tilt_min, tilt_max, tracked, bad = totals
+        return {
+            'sample_count': count,
+            'average_tilt': tilt_sum / count if count else 0.0,
+            'min_tilt': tilt_min if tilt_min is not None else 0.0,
+            'max_tilt': tilt_max if tilt_max is not None else 0.0,
+            'tracked_seconds': tracked,
+            'bad_seconds': bad,
+            'bad_posture_percent': 100.0 * bad / tracked if tracked else 0.0
+        }
+    
+    def get_posture_samples(self, start=None, end=None, limit=None):
+        """
+        Get posture samples in a time range, oldest first.
+        
+        Args:
+            start, end: Unix timestamps bounding the range (inclusive start,
+                        exclusive end); None leaves that side open
+            limit: Maximum number of samples to return
+        """
+        cursor = self._connection().execute('''
+            SELECT timestamp, tilt_angle, is_bad_posture, duration
+            FROM posture_samples
+            WHERE timestamp >= ? AND timestamp < ?
+            ORDER BY timestamp
+            LIMIT ?
+        ''', (start if start is not None else float('-inf'),
+              end if end is not None else float('inf'),
+              limit if limit is not None else -1))
+        results = cursor.fetchall()
+        
+        samples = []
+        for row in results:
+            samples.append({
+                'timestamp': row[0],
+                'tilt_angle': row[1],
+                'is_bad_posture': bool(row[2]),
+                'duration': row[3]
+            })
+        return samples
@@ -30,7 +30,11 @@ class Exercise:
             description: Brief description of the exercise
             target_muscles: List of target muscle groups
             instructions: Step-by-step instructions
-            form_checks: Dictionary of form checking criteria for camera validation
+            form_checks: Dictionary of form checking criteria for camera validation;
+                         'rep_counting' holds the rep counter spec
+                         (see rep_counter.compile_rep_program) and
+                         'feedback' the form feedback rules
+                         (see form_rules.compile_form_rules)
         """
         self.id = exercise_id
         self.name = name
@@ -76,7 +80,16 @@ EXERCISES = [
             'elbow_angle_min': 70,
             'elbow_angle_max': 110,
             'body_alignment': 'straight',
-            'shoulder_width': 'standard'
+            'shoulder_width': 'standard',
+            'rep_counting': {'joints': ('left_elbow',), 'rest': 160, 'peak': 100},
+            'feedback': {
+                'rules': [
+                    ('left_hip', '<', 160, 'Keep body straight'),
+                    ('left_elbow', '<', 70, 'Good depth!'),
+                    ('left_elbow', 'between', (70, 100), 'Lower a bit more'),
+                ],
+                'default': 'Good form!'
+            }
         }
     ),
     Exercise(
@@ -97,7 +110,8 @@ EXERCISES = [
             'elbow_angle_min': 30,
             'elbow_angle_max': 180,
             'shoulder_elevation': 'full',
-            'body_swing': 'minimal'
+            'body_swing': 'minimal',
+            'rep_counting': {'joints': ('left_elbow', 'right_elbow'), 'rest': 150, 'peak': 70}
         }
     ),
     Exercise(
@@ -118,7 +132,16 @@ EXERCISES = [
             'knee_angle_min': 80,
             'knee_angle_max': 100,
             'back_angle': 'neutral',
-            'knee_alignment': 'over_toes'
+            'knee_alignment': 'over_toes',
+            'rep_counting': {'joints': ('left_knee',), 'rest': 160, 'peak': 100},
+            'feedback': {
+                'rules': [
+                    ('left_knee', '<', 90, 'Great depth!'),
+                    ('left_knee', 'between', (90, 110), 'Good squat'),
+                    ('torso_ratio', '<', 1.5, 'Keep chest up'),
+                ],
+                'default': 'Good form!'
+            }
         }
     ),
     Exercise(
@@ -139,7 +162,8 @@ EXERCISES = [
             'front_knee_angle': 90,
             'back_knee_angle': 90,
             'torso_upright': True,
-            'knee_over_ankle': True
+            'knee_over_ankle': True,
+            'rep_counting': {'joints': ('left_knee', 'right_knee'), 'rest': 160, 'peak': 110}
         }
     ),
     Exercise(
@@ -159,7 +183,15 @@ EXERCISES = [
         form_checks={
             'body_alignment': 'straight',
             'hip_position': 'neutral',
-            'shoulder_stability': True
+            'shoulder_stability': True,
+            'rep_counting': {'joints': ('left_hip', 'right_hip'), 'rest': 140, 'peak': 160, 'hold': 10},
+            'feedback': {
+                'rules': [
+                    ('hip_drop', '>', 50, 'Hips too low - engage core'),
+                    ('hip_drop', '<', -50, 'Hips too high - lower them'),
+                ],
+                'default': 'Perfect alignment!'
+            }
         }
     ),
     Exercise(
@@ -180,7 +212,8 @@ EXERCISES = [
         form_checks={
             'full_extension': True,
             'push_up_depth': 'chest_to_floor',
-            'jump_height': 'minimal'
+            'jump_height': 'minimal',
+            'rep_counting': {'joints': ('left_hip', 'right_hip'), 'rest': 160, 'peak': 90}
         }
     ),
     Exercise(
@@ -200,7 +233,8 @@ EXERCISES = [
         form_checks={
             'hip_level': True,
             'pace': 'steady',
-            'knee_drive': 'full'
+            'knee_drive': 'full',
+            'rep_counting': {'joints': ('left_hip', 'right_hip'), 'combine': 'min', 'rest': 150, 'peak': 100}
         }
     ),
     Exercise(
@@ -221,7 +255,15 @@ EXERCISES = [
             'elbow_angle_min': 80,
             'elbow_angle_max': 100,
             'torso_lean': 'slight_forward',
-            'shoulder_position': 'down'
+            'shoulder_position': 'down',
+            'rep_counting': {'joints': ('left_elbow', 'right_elbow'), 'rest': 160, 'peak': 100},
+            'feedback': {
+                'rules': [
+                    ('left_elbow', '<', 80, 'Too deep - protect your shoulders'),
+                    ('left_elbow', 'between', (80, 100), 'Good depth!'),
+                ],
+                'default': 'Good form!'
+            }
         }
     ),
     
@@ -244,7 +286,8 @@ EXERCISES = [
             'elbow_angle_bottom': 90,
             'arm_extension_top': True,
             'back_arch': 'minimal',
-            'dumbbell_path': 'vertical'
+            'dumbbell_path': 'vertical',
+            'rep_counting': {'joints': ('left_elbow', 'right_elbow'), 'rest': 100, 'peak': 160}
         }
     ),
     Exercise(
@@ -265,7 +308,8 @@ EXERCISES = [
             'elbow_position': 'fixed',
             'curl_angle_top': 45,
             'body_swing': 'none',
-            'controlled_descent': True
+            'controlled_descent': True,
+            'rep_counting': {'joints': ('left_elbow', 'right_elbow'), 'combine': 'min', 'rest': 150, 'peak': 60}
         }
     ),
     Exercise(
@@ -286,7 +330,8 @@ EXERCISES = [
             'back_angle': 'flat',
             'elbow_path': 'close_to_body',
             'shoulder_retraction': True,
-            'torso_stable': True
+            'torso_stable': True,
+            'rep_counting': {'joints': ('left_elbow', 'right_elbow'), 'combine': 'min', 'rest': 150, 'peak': 90}
         }
     ),
     Exercise(
@@ -307,7 +352,16 @@ EXERCISES = [
             'dumbbell_position': 'chest',
             'squat_depth': 'parallel',
             'chest_up': True,
-            'knee_alignment': True
+            'knee_alignment': True,
+            'rep_counting': {'joints': ('left_knee', 'right_knee'), 'rest': 160, 'peak': 100},
+            'feedback': {
+                'rules': [
+                    ('left_knee', '<', 90, 'Great depth!'),
+                    ('left_knee', 'between', (90, 110), 'Good squat'),
+                    ('torso_ratio', '<', 1.5, 'Keep chest up'),
+                ],
+                'default': 'Good form!'
+            }
         }
     ),
     Exercise(
@@ -328,7 +382,8 @@ EXERCISES = [
             'front_knee_angle': 90,
             'back_knee_angle': 90,
             'torso_upright': True,
-            'balance_stable': True
+            'balance_stable': True,
+            'rep_counting': {'joints': ('left_knee', 'right_knee'), 'rest': 160, 'peak': 110}
         }
     ),
     Exercise(
@@ -349,7 +404,8 @@ EXERCISES = [
             'back_flat': True,
             'hip_hinge': True,
             'knee_slight_bend': True,
-            'weight_path': 'close_to_legs'
+            'weight_path': 'close_to_legs',
+            'rep_counting': {'joints': ('left_hip', 'right_hip'), 'rest': 165, 'peak': 110}
         }
     ),
     Exercise(
@@ -370,7 +426,8 @@ EXERCISES = [
             'press_path': 'vertical',
             'elbow_angle_bottom': 90,
             'arm_extension_top': True,
-            'scapula_retracted': True
+            'scapula_retracted': True,
+            'rep_counting': {'joints': ('left_elbow', 'right_elbow'), 'rest': 160, 'peak': 100}
         }
     ),
     Exercise(
@@ -391,7 +448,14 @@ EXERCISES = [
             'arm_height': 'shoulder_level',
             'elbow_bend': 'slight',
             'torso_stable': True,
-            'controlled_motion': True
+            'controlled_motion': True,
+            'rep_counting': {'joints': ('left_shoulder', 'right_shoulder'), 'rest': 30, 'peak': 75},
+            'feedback': {
+                'rules': [
+                    ('left_shoulder', '>', 100, 'Stop at shoulder height'),
+                ],
+                'default': 'Good form!'
+            }
         }
     ),
     Exercise(
@@ -412,7 +476,8 @@ EXERCISES = [
             'upper_arm_vertical': True,
             'elbow_position': 'fixed',
             'full_extension': True,
-            'core_stable': True
+            'core_stable': True,
+            'rep_counting': {'joints': ('left_elbow', 'right_elbow'), 'rest': 150, 'peak': 80}
         }
     ),
     Exercise(
@@ -433,7 +498,8 @@ EXERCISES = [
             'rotation_smooth': True,
             'press_path': 'curved',
             'full_extension': True,
-            'control': True
+            'control': True,
+            'rep_counting': {'joints': ('left_elbow', 'right_elbow'), 'rest': 100, 'peak': 160}
         }
     ),
     
@@ -455,7 +521,8 @@ EXERCISES = [
         form_checks={
             'back_straight': True,
             'legs_extended': True,
-            'reach_depth': 'comfortable'
+            'reach_depth': 'comfortable',
+            'rep_counting': {'joints': ('left_hip', 'right_hip'), 'rest': 150, 'peak': 110, 'hold': 15}
         }
     ),
     Exercise(
@@ -475,7 +542,8 @@ EXERCISES = [
         form_checks={
             'balance_stable': True,
             'knee_alignment': True,
-            'upright_posture': True
+            'upright_posture': True,
+            'rep_counting': {'joints': ('left_knee', 'right_knee'), 'combine': 'min', 'rest': 120, 'peak': 60, 'hold': 15}
         }
     ),
     Exercise(
@@ -495,7 +563,8 @@ EXERCISES = [
         form_checks={
             'arm_position': '90_degrees',
             'lean_depth': 'moderate',
-            'shoulder_safe': True
+            'shoulder_safe': True,
+            'rep_counting': {'joints': ('left_shoulder', 'right_shoulder'), 'combine': 'max', 'rest': 40, 'peak': 80, 'hold': 15}
         }
     ),
     Exercise(
@@ -515,7 +584,8 @@ EXERCISES = [
         form_checks={
             'arm_straight': True,
             'shoulders_down': True,
-            'gentle_pull': True
+            'gentle_pull': True,
+            'rep_counting': {'joints': ('left_shoulder', 'right_shoulder'), 'combine': 'max', 'rest': 40, 'peak': 80, 'hold': 15}
         }
     ),
     Exercise(
@@ -535,7 +605,8 @@ EXERCISES = [
         form_checks={
             'full_range': True,
             'smooth_movement': True,
-            'neck_alignment': True
+            'neck_alignment': True,
+            'rep_counting': {'joints': ('left_hip', 'right_hip'), 'rest': 100, 'peak': 80, 'dwell': 0.5}
         }
     ),
     Exercise(
@@ -555,7 +626,8 @@ EXERCISES = [
         form_checks={
             'upright_torso': True,
             'hip_forward': True,
-            'back_knee_down': True
+            'back_knee_down': True,
+            'rep_counting': {'joints': ('left_knee', 'right_knee'), 'combine': 'min', 'rest': 150, 'peak': 100, 'hold': 15}
         }
     ),
 ]
@@ -4,234 +4,174 @@ Provides real-time feedback on exercise technique.
 """
 
 import cv2
-import numpy as np
 import math
+import time
 from posture_detector import PostureDetector
+from joint_angles import joint_angles
+from exercise_database import EXERCISES
+from rep_counter import RepCounter, compile_rep_programs
+from form_rules import compile_all_form_rules, compute_features, DEFAULT_MESSAGE, MESSAGE_SEPARATOR
+from frame_timing import timed, STAGE_DRAW, STAGE_FORM, STAGE_TEXT
+
+
+# Rep counting and feedback rules compiled once from every exercise's form_checks
+REP_PROGRAMS = compile_rep_programs(EXERCISES)
+FORM_RULES = compile_all_form_rules(EXERCISES)
 
 
 class ExerciseDetector:
     """Detects and validates exercise form using pose landmarks."""
     
-    def __init__(self):
-        """Initialize exercise detector with pose detection."""
-        self.posture_detector = PostureDetector()
-        self.mp_pose = self.posture_detector.mp_pose
-        self.current_exercise = None
-        self.rep_count = 0
-        self.last_state = None
-        
-    def calculate_angle(self, point1, point2, point3):
+    def __init__(self, posture_detector=None):
         """
-        Calculate angle between three points.
+        Initialize exercise detector with pose detection.
         
         Args:
-            point1, point2, point3: Tuples of (x, y) coordinates
-            
-        Returns:
-            Angle in degrees
+            posture_detector: Shared PostureDetector to run inference with.
+                              If omitted, a private detector is created.
         """
-        if None in [point1, point2, point3]:
-            return 0
-            
-        # Calculate vectors
-        vector1 = np.array([point1[0] - point2[0], point1[1] - point2[1]])
-        vector2 = np.array([point3[0] - point2[0], point3[1] - point2[1]])
-        
-        # Calculate angle
-        cosine = np.dot(vector1, vector2) / (np.linalg.norm(vector1) * np.linalg.norm(vector2))
-        cosine = np.clip(cosine, -1.0, 1.0)
-        angle = math.degrees(math.acos(cosine))
-        
-        return angle
+        self._owns_detector = posture_detector is None
+        self.posture_detector = posture_detector if posture_detector is not None else PostureDetector()
+        self.mp_pose = self.posture_detector.mp_pose
+        self.current_exercise = None
+        # One counter per exercise so switching exercises keeps their state apart
+        self.rep_counters = {}
     
-    def get_landmark_coords(self, landmarks, landmark_id, width, height):
+    @property
+    def rep_count(self):
+        """Rep count of the current exercise."""
+        counter = self.rep_counters.get(self.current_exercise)
+        return counter.reps if counter else 0
+    
+    def get_rep_counter(self, exercise_id):
         """
-        Get pixel coordinates for a landmark.
+        Get the rep counter of an exercise, creating it on first use.
         
-        Args:
-            landmarks: MediaPipe landmarks
-            landmark_id: Landmark ID to retrieve
-            width, height: Image dimensions
-            
         Returns:
-            Tuple of (x, y) pixel coordinates
+            RepCounter, or None if the exercise has no rep counting rules
         """
-        if landmarks is None:
-            return None
-        landmark = landmarks.landmark[landmark_id]
-        return (int(landmark.x * width), int(landmark.y * height))
+        counter = self.rep_counters.get(exercise_id)
+        if counter is None:
+            program = REP_PROGRAMS.get(exercise_id)
+            if program is None:
+                return None
+            counter = RepCounter(program)
+            self.rep_counters[exercise_id] = counter
+        return counter
     
-    def check_pushup_form(self, landmarks, width, height):
+    def calculate_angle(self, point1, point2, point3):
         """
-        Check push-up form.
+        Calculate angle between three points.
         
+        Args:
+            point1, point2, point3: (x, y) coordinates (tuples or array rows)
+            
         Returns:
-            Dictionary with form feedback and rep counting
+            Angle in degrees at point2
         """
-        # Get key landmarks
-        left_shoulder = self.get_landmark_coords(landmarks, 
-            self.mp_pose.PoseLandmark.LEFT_SHOULDER.value, width, height)
-        left_elbow = self.get_landmark_coords(landmarks,
-            self.mp_pose.PoseLandmark.LEFT_ELBOW.value, width, height)
-        left_wrist = self.get_landmark_coords(landmarks,
-            self.mp_pose.PoseLandmark.LEFT_WRIST.value, width, height)
-        left_hip = self.get_landmark_coords(landmarks,
-            self.mp_pose.PoseLandmark.LEFT_HIP.value, width, height)
-        left_knee = self.get_landmark_coords(landmarks,
-            self.mp_pose.PoseLandmark.LEFT_KNEE.value, width, height)
-        
-        if None in [left_shoulder, left_elbow, left_wrist, left_hip, left_knee]:
-            return {'feedback': 'Position yourself so camera can see your full body', 'reps': self.rep_count}
-        
-        # Calculate elbow angle
-        elbow_angle = self.calculate_angle(left_shoulder, left_elbow, left_wrist)
-        
-        # Calculate body alignment (hip angle)
-        body_angle = self.calculate_angle(left_shoulder, left_hip, left_knee)
-        
-        # Rep counting logic
-        feedback_items = []
-        if elbow_angle > 160:
-            current_state = 'up'
-        elif elbow_angle < 100:
-            current_state = 'down'
-        else:
-            current_state = 'mid'
-        
-        if self.last_state == 'down' and current_state == 'up':
-            self.rep_count += 1
-        self.last_state = current_state
-        
-        # Form checking
-        if body_angle < 160 or body_angle > 200:
-            feedback_items.append('Keep body straight')
+        if point1 is None or point2 is None or point3 is None:
+            return 0
         
-        if elbow_angle < 70:
-            feedback_items.append('Good depth!')
-        elif elbow_angle < 100 and elbow_angle >= 70:
-            feedback_items.append('Lower a bit more')
+        # Calculate vectors (plain floats: numpy call overhead dominates for 2-D)
+        v1x = float(point1[0] - point2[0])
+        v1y = float(point1[1] - point2[1])
+        v2x = float(point3[0] - point2[0])
+        v2y = float(point3[1] - point2[1])
         
-        feedback = ' • '.join(feedback_items) if feedback_items else 'Good form!'
+        norm = math.hypot(v1x, v1y) * math.hypot(v2x, v2y)
+        if norm == 0:
+            return 0
         
-        return {
-            'feedback': feedback,
-            'reps': self.rep_count,
-            'elbow_angle': elbow_angle,
-            'body_angle': body_angle
-        }
+        # Calculate angle
+        cosine = max(-1.0, min(1.0, (v1x * v2x + v1y * v2y) / norm))
+        return math.degrees(math.acos(cosine))
     
-    def check_squat_form(self, landmarks, width, height):
+    def check_form(self, exercise_id, pixels, angles):
         """
-        Check squat form.
+        Evaluate the exercise's compiled form rules on one frame.
         
+        Args:
+            exercise_id: ID of the exercise
+            pixels: (33, 2) landmark pixel coordinates indexed by landmark ID
+            angles: joint_angles() result for the frame
+            
         Returns:
-            Dictionary with form feedback and rep counting
+            Dictionary with form feedback and the bitmask of firing rules
         """
-        # Get key landmarks
-        left_hip = self.get_landmark_coords(landmarks,
-            self.mp_pose.PoseLandmark.LEFT_HIP.value, width, height)
-        left_knee = self.get_landmark_coords(landmarks,
-            self.mp_pose.PoseLandmark.LEFT_KNEE.value, width, height)
-        left_ankle = self.get_landmark_coords(landmarks,
-            self.mp_pose.PoseLandmark.LEFT_ANKLE.value, width, height)
-        left_shoulder = self.get_landmark_coords(landmarks,
-            self.mp_pose.PoseLandmark.LEFT_SHOULDER.value, width, height)
-        
-        if None in [left_hip, left_knee, left_ankle, left_shoulder]:
-            return {'feedback': 'Position yourself in side view', 'reps': self.rep_count}
-        
-        # Calculate knee angle
-        knee_angle = self.calculate_angle(left_hip, left_knee, left_ankle)
-        
-        # Calculate back angle (torso alignment)
-        back_angle = abs(left_shoulder[1] - left_hip[1]) / max(abs(left_shoulder[0] - left_hip[0]), 1)
-        
-        # Rep counting
-        feedback_items = []
-        if knee_angle > 160:
-            current_state = 'up'
-        elif knee_angle < 100:
-            current_state = 'down'
-        else:
-            current_state = 'mid'
-        
-        if self.last_state == 'down' and current_state == 'up':
-            self.rep_count += 1
-        self.last_state = current_state
-        
-        # Form checking
-        if knee_angle < 90:
-            feedback_items.append('Great depth!')
-        elif knee_angle < 110 and knee_angle >= 90:
-            feedback_items.append('Good squat')
-        elif current_state == 'down':
-            feedback_items.append('Go deeper')
-        
-        if back_angle < 1.5:
-            feedback_items.append('Keep chest up')
-        
-        feedback = ' • '.join(feedback_items) if feedback_items else 'Good form!'
-        
-        return {
-            'feedback': feedback,
-            'reps': self.rep_count,
-            'knee_angle': knee_angle
-        }
+        rules = FORM_RULES.get(exercise_id)
+        if rules is None:
+            return {'feedback': DEFAULT_MESSAGE, 'rules': 0}
+        mask = rules.evaluate(compute_features(pixels, angles))
+        return {'feedback': rules.feedback(mask), 'rules': mask}
     
-    def check_plank_form(self, landmarks, width, height):
+    def count_reps(self, exercise_id, angles, timestamp=None):
         """
-        Check plank form.
+        Advance the rep counter of an exercise by one frame.
         
+        Args:
+            exercise_id: ID of the exercise
+            angles: joint_angles() result for the frame
+            timestamp: Frame time in seconds (default: now, monotonic)
+            
         Returns:
-            Dictionary with form feedback
+            Rep count of the exercise
         """
-        # Get key landmarks
-        left_shoulder = self.get_landmark_coords(landmarks,
-            self.mp_pose.PoseLandmark.LEFT_SHOULDER.value, width, height)
-        left_hip = self.get_landmark_coords(landmarks,
-            self.mp_pose.PoseLandmark.LEFT_HIP.value, width, height)
-        left_ankle = self.get_landmark_coords(landmarks,
-            self.mp_pose.PoseLandmark.LEFT_ANKLE.value, width, height)
-        
-        if None in [left_shoulder, left_hip, left_ankle]:
-            return {'feedback': 'Position in side view', 'reps': 0}
-        
-        # Check body alignment
-        shoulder_y = left_shoulder[1]
-        hip_y = left_hip[1]
-        ankle_y = left_ankle[1]
-        
-        feedback_items = []
-        
-        # Check if hips are sagging
-        if hip_y > shoulder_y + 50:
-            feedback_items.append('Hips too low - engage core')
-        elif hip_y < shoulder_y - 50:
-            feedback_items.append('Hips too high - lower them')
-        else:
-            feedback_items.append('Perfect alignment!')
-        
-        feedback = ' • '.join(feedback_items) if feedback_items else 'Hold steady!'
-        
-        return {
-            'feedback': feedback,
-            'reps': 0
-        }
+        counter = self.get_rep_counter(exercise_id)
+        if counter is None:
+            return 0
+        if timestamp is None:
+            timestamp = time.monotonic()
+        return counter.update(angles, timestamp)
     
-    def check_general_form(self, landmarks, width, height):
+    def evaluate(self, frame, result, exercise_id, timestamp=None, overlay=True, timings=None):
         """
-        General form checking for exercises without specific checks.
+        Check exercise form from a pose result and draw feedback on the frame.
         
+        Args:
+            frame: Video frame to draw on
+            result: PoseResult from PostureDetector.detect
+            exercise_id: ID of current exercise
+            timestamp: Frame time in seconds (default: now, monotonic)
+            overlay: Whether to draw the pose landmarks
+            timings: Optional FrameTimings recording the drawing, form check
+                     and text stages
+            
         Returns:
-            Dictionary with basic feedback
+            Tuple of (processed_frame, feedback_dict)
         """
-        if landmarks is None:
-            return {'feedback': 'Position yourself in camera view', 'reps': self.rep_count}
+        if overlay:
+            with timed(timings, STAGE_DRAW):
+                self.posture_detector.draw_overlay(frame, result)
+        processed_frame = frame
+        
+        with timed(timings, STAGE_FORM):
+            counter = self.get_rep_counter(exercise_id)
+            feedback = {'feedback': 'No pose detected'}
+            
+            if result.has_pose:
+                pixels = result.pixels
+                angles = joint_angles(pixels)
+                self.count_reps(exercise_id, angles, timestamp)
+                
+                # Exercise-specific form rules
+                feedback = self.check_form(exercise_id, pixels, angles)
+            
+            feedback['reps'] = counter.reps if counter else 0
+        
+        with timed(timings, STAGE_TEXT):
+            # Draw feedback on frame
+            cv2.putText(processed_frame, f'Reps: {feedback["reps"]}', (10, 30),
+                        cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 255, 0), 2)
+            
+            # Draw feedback text (multiline support)
+            feedback_text = feedback['feedback']
+            y_offset = 70
+            for line in feedback_text.split(MESSAGE_SEPARATOR):
+                cv2.putText(processed_frame, line, (10, y_offset),
+                           cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 2)
+                y_offset += 30
         
-        return {
-            'feedback': 'Maintain proper form',
-            'reps': self.rep_count
-        }
+        return processed_frame, feedback
     
     def process_frame(self, frame, exercise_id):
         """
@@ -244,48 +184,15 @@ class ExerciseDetector:
         Returns:
             Tuple of (processed_frame, feedback_dict)
         """
-        # Process frame with pose detection
-        processed_frame, tilt_angle, left_shoulder, right_shoulder = \
-            self.posture_detector.process_frame(frame)
-        
-        # Get pose landmarks
-        rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        results = self.posture_detector.pose.process(rgb_frame)
-        
-        feedback = {'feedback': 'No pose detected', 'reps': self.rep_count}
-        
-        if results.pose_landmarks:
-            landmarks = results.pose_landmarks
-            h, w, c = frame.shape
-            
-            # Exercise-specific form checking
-            if exercise_id == 'pushup':
-                feedback = self.check_pushup_form(landmarks, w, h)
-            elif exercise_id == 'squat':
-                feedback = self.check_squat_form(landmarks, w, h)
-            elif exercise_id == 'plank':
-                feedback = self.check_plank_form(landmarks, w, h)
-            else:
-                feedback = self.check_general_form(landmarks, w, h)
-        
-        # Draw feedback on frame
-        cv2.putText(processed_frame, f'Reps: {feedback["reps"]}', (10, 30),
-                    cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 255, 0), 2)
-        
-        # Draw feedback text (multiline support)
-        feedback_text = feedback['feedback']
-        y_offset = 70
-        for line in feedback_text.split(' • '):
-            cv2.putText(processed_frame, line, (10, y_offset),
-                       cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 2)
-            y_offset += 30
-        
-        return processed_frame, feedback
+        # Run pose detection once; the result is shared with the form checks
+        result = self.posture_detector.detect(frame)
+        return self.evaluate(frame, result, exercise_id)
     
     def reset_counter(self):
-        """Reset rep counter."""
-        self.rep_count = 0
-        self.last_state = None
+        """Reset the rep counter of the current exercise."""
+        counter = self.rep_counters.get(self.current_exercise)
+        if counter:
+            counter.reset()
     
     def set_exercise(self, exercise_id):
         """Set current exercise and reset counter."""
@@ -293,6 +200,6 @@ class ExerciseDetector:
         self.reset_counter()
     
     def release(self):
-        """Release detector resources."""
-        if self.posture_detector:
+        """Release detector resources (a shared detector is left open)."""
+        if self.posture_detector and self._owns_detector:
             self.posture_detector.release()
@@ -0,0 +1,184 @@
+"""
+Declarative form feedback rules.
+Each exercise's form_checks['feedback'] spec is compiled once into parallel
+arrays (feature, bounds, message); a frame is evaluated to a bitmask of
+firing rules in one numpy pass and the feedback text is only built once per
+distinct bitmask.
+"""
+
+import numpy as np
+from joint_angles import JOINT_NAMES
+from posture_detector import LEFT_SHOULDER, LEFT_HIP
+
+
+# Per-frame features: every joint angle followed by derived measurements
+FEATURE_NAMES = JOINT_NAMES + (
+    'hip_drop',  # pixels the left hip sits below the left shoulder
+    'torso_ratio',  # vertical / horizontal shoulder-hip distance (upright > 1)
+)
+FEATURE_HIP_DROP = len(JOINT_NAMES)
+FEATURE_TORSO_RATIO = len(JOINT_NAMES) + 1
+
+# Rule comparisons as (lower, upper) bounds and inclusiveness
+COMPARISONS = ('<', '<=', '>', '>=', 'between')
+
+# Separator used when several messages fire
+MESSAGE_SEPARATOR = ' • '
+
+# Feedback when an exercise has no rules or none fire
+DEFAULT_MESSAGE = 'Maintain proper form'
+
+# Rule count limit (bitmask is an int64)
+MAX_RULES = 63
+
+
+def compute_features(pixels, angles):
+    """
+    Build the feature vector for one frame.
+    
+    Args:
+        pixels: (33, 2) landmark pixel coordinates
+        angles: joint_angles() result for the frame
+    
+    Returns:
+        float32 array indexed like FEATURE_NAMES
+    """
+    features = np.empty(len(FEATURE_NAMES), dtype=np.float32)
+    features[:len(JOINT_NAMES)] = angles
+    dx, dy = pixels[LEFT_HIP] - pixels[LEFT_SHOULDER]
+    features[FEATURE_HIP_DROP] = dy
+    features[FEATURE_TORSO_RATIO] = abs(dy) / max(abs(dx), 1)
+    return features
+
+
+class FormRules:
+    """Compiled feedback rules for one exercise."""
+    
+    def __init__(self, features, lower, upper, lower_inclusive, upper_inclusive,
+                 message_ids, messages, default):
+        """
+        Initialize compiled rules (use compile_form_rules).
+        
+        Args:
+            features: (R,) feature index of each rule
+            lower, upper: (R,) bounds the feature must lie between for the rule to fire
+            lower_inclusive, upper_inclusive: (R,) whether each bound is inclusive
+            message_ids: (R,) index into messages for each rule
+            messages: Distinct message strings
+            default: Feedback when no rule fires
+        """
+        self.features = features
+        self.lower = lower
+        self.upper = upper
+        self.lower_inclusive = lower_inclusive
+        self.upper_inclusive = upper_inclusive
+        self.message_ids = message_ids
+        self.messages = messages
+        self.default = default
+        self._weights = np.left_shift(np.int64(1), np.arange(len(features), dtype=np.int64))
+        self._feedback_cache = {}
+    
+    def __len__(self):
+        """Number of rules."""
+        return len(self.features)
+    
+    def evaluate(self, features):
+        """
+        Evaluate all rules on a frame's feature vector.
+        
+        Returns:
+            Bitmask (int) with bit i set when rule i fires
+        """
+        if not len(self.features):
+            return 0
+        values = features[self.features]
+        above = np.where(self.lower_inclusive, values >= self.lower, values > self.lower)
+        below = np.where(self.upper_inclusive, values <= self.upper, values < self.upper)
+        return int(self._weights[above & below].sum())
+    
+    def feedback(self, mask):
+        """
+        Get the feedback text for a bitmask (built once per distinct mask).
+        
+        Returns:
+            Messages of the firing rules in rule order, or the default message
+        """
+        text = self._feedback_cache.get(mask)
+        if text is None:
+            ids = []
+            for rule, message_id in enumerate(self.message_ids):
+                if mask >> rule & 1 and message_id not in ids:
+                    ids.append(message_id)
+            text = MESSAGE_SEPARATOR.join(self.messages[i] for i in ids) if ids else self.default
+            self._feedback_cache[mask] = text
+        return text
+
+
+def compile_form_rules(spec):
+    """
+    Compile a feedback spec into FormRules.
+    
+    Args:
+        spec: Dictionary with
+              'rules': list of (feature, comparison, threshold, message) with
+                       feature from FEATURE_NAMES and comparison one of
+                       '<', '<=', '>', '>=' or 'between' (threshold is then a
+                       (low, high) pair meaning low <= value < high)
+              'default': message when no rule fires
+    
+    Returns:
+        FormRules
+    """
+    rules = spec.get('rules', ())
+    if len(rules) > MAX_RULES:
+        raise ValueError(f"At most {MAX_RULES} rules are supported")
+    
+    features, lower, upper, lower_inclusive, upper_inclusive, message_ids = [], [], [], [], [], []
+    messages = []
+    for feature, comparison, threshold, message in rules:
+        if feature not in FEATURE_NAMES:
+            raise ValueError(f"Unknown form feature: {feature}")
+        if comparison == '<':
+            bounds = (-np.inf, threshold, False, False)
+        elif comparison == '<=':
+            bounds = (-np.inf, threshold, False, True)
+        elif comparison == '>':
+            bounds = (threshold, np.inf, False, False)
+        elif comparison == '>=':
+            bounds = (threshold, np.inf, True, False)
+        elif comparison == 'between':
+            bounds = (threshold[0], threshold[1], True, False)
+        else:
+            raise ValueError(f"Unknown comparison: {comparison}")
+        
+        if message not in messages:
+            messages.append(message)
+        features.append(FEATURE_NAMES.index(feature))
+        lower.append(bounds[0])
+        upper.append(bounds[1])
+        lower_inclusive.append(bounds[2])
+        upper_inclusive.append(bounds[3])
+        message_ids.append(messages.index(message))
+    
+    return FormRules(
+        np.array(features, dtype=np.intp),
+        np.array(lower, dtype=np.float32),
+        np.array(upper, dtype=np.float32),
+        np.array(lower_inclusive, dtype=bool),
+        np.array(upper_inclusive, dtype=bool),
+        tuple(message_ids),
+        tuple(messages),
+        spec.get('default', DEFAULT_MESSAGE),
+    )
+
+
+def compile_all_form_rules(exercises):
+    """
+    Compile the feedback specs of a list of exercises.
+    
+    Returns:
+        Dictionary of exercise ID to FormRules (exercises without a spec get
+        an empty rule set with the default message)
+    """
+    return {exercise.id: compile_form_rules(exercise.form_checks.get('feedback', {}))
+            for exercise in exercises}
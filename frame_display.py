@@ -0,0 +1,59 @@
+"""
+Display helper for showing OpenCV frames in Kivy Image widgets.
+Reuses one texture per display size, flips it vertically through texture
+coordinates and uploads straight from the frame's numpy buffer.
+"""
+
+import numpy as np
+from kivy.graphics.texture import Texture
+
+
+class FrameDisplay:
+    """Uploads BGR frames into a persistent, reused Kivy texture."""
+    
+    def __init__(self):
+        """Initialize with no texture; one is created on the first frame."""
+        self.texture = None
+        self.textures_created = 0
+    
+    def get_texture(self, width, height):
+        """
+        Get the texture for a frame size, creating it only when the size changes.
+        
+        Args:
+            width, height: Frame dimensions in pixels
+        
+        Returns:
+            Kivy Texture flipped vertically via its texture coordinates
+        """
+        if self.texture is None or tuple(self.texture.size) != (width, height):
+            self.texture = Texture.create(size=(width, height), colorfmt='bgr')
+            # OpenCV rows run top-down, GL rows bottom-up: flip with tex coords
+            self.texture.flip_vertical()
+            self.textures_created += 1
+        return self.texture
+    
+    def show(self, widget, frame):
+        """
+        Upload a frame and display it on a widget.
+        
+        Args:
+            widget: Kivy Image widget
+            frame: BGR uint8 frame of shape (height, width, 3)
+        """
+        height, width = frame.shape[:2]
+        texture = self.get_texture(width, height)
+        
+        # blit_buffer needs a contiguous 1-D buffer; reshape is a view, not a copy
+        buf = np.ascontiguousarray(frame).reshape(-1)
+        texture.blit_buffer(buf, colorfmt='bgr', bufferfmt='ubyte', mipmap_generation=False)
+        
+        if widget.texture is not texture:
+            widget.texture = texture
+        else:
+            # Same texture object: the canvas must be told its contents changed
+            widget.canvas.ask_update()
+    
+    def clear(self, widget):
+        """Remove the frame from a widget, keeping the texture for reuse."""
+        widget.texture = None
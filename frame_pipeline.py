@@ -0,0 +1,163 @@
+"""
+Threaded capture -> inference -> analysis pipeline.
+Pose inference and frame annotation run on worker threads connected by
+bounded queues; finished results are handed to a dispatch callable (the UI
+uses Clock.schedule_once) so the UI thread only displays them.
+"""
+
+import logging
+import queue
+import threading
+import time
+
+
+logger = logging.getLogger(__name__)
+
+
+class FramePipeline:
+    """Runs inference and analysis stages on worker threads."""
+    
+    def __init__(self, stream, infer, analyze, on_result, dispatch=None,
+                 queue_size=2, name='pipeline', on_latency=None):
+        """
+        Initialize the pipeline.
+        
+        Args:
+            stream: Started CameraStream supplying frames
+            infer: Callable(frame) -> pose result, run on the inference thread
+            analyze: Callable(frame, pose_result) -> result, run on the analysis thread
+            on_result: Callable(result) receiving finished results
+            dispatch: Callable(fn) that runs fn on the consumer's thread
+                      (default: call directly on the analysis thread)
+            queue_size: Maximum frames waiting between inference and analysis
+            name: Name prefix for worker threads
+            on_latency: Optional Callable(seconds) receiving each frame's time
+                        from read to finished analysis (on the analysis thread)
+        """
+        self.stream = stream
+        self.infer = infer
+        self.analyze = analyze
+        self.on_result = on_result
+        self.dispatch = dispatch
+        self.name = name
+        self.on_latency = on_latency
+        self.last_latency = 0.0
+        self.frames_processed = 0
+        self.frames_dropped = 0
+        self.errors = 0
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._result = None
+        self._result_lock = threading.Lock()
+        self._delivery_pending = False
+        self._running = False
+        self._threads = []
+    
+    @property
+    def is_running(self):
+        """Whether the worker threads are running."""
+        return self._running
+    
+    def start(self):
+        """Start the inference and analysis worker threads."""
+        if self._running:
+            return self
+        self._running = True
+        self._threads = [
+            threading.Thread(target=self._inference_loop, name=f'{self.name}-inference', daemon=True),
+            threading.Thread(target=self._analysis_loop, name=f'{self.name}-analysis', daemon=True),
+        ]
+        for thread in self._threads:
+            thread.start()
+        return self
+    
+    def stop(self):
+        """Stop the worker threads and discard pending work."""
+        if not self._running:
+            return
+        self._running = False
+        for thread in self._threads:
+            thread.join(timeout=2.0)
+        self._threads = []
+        self._drain()
+        with self._result_lock:
+            self._result = None
+    
+    def _put(self, item):
+        """Put an item on the analysis queue, dropping the oldest when full."""
+        while True:
+            try:
+                self._queue.put_nowait(item)
+                return
+            except queue.Full:
+                try:
+                    self._queue.get_nowait()
+                    self.frames_dropped += 1
+                except queue.Empty:
+                    pass
+    
+    def _drain(self):
+        """Discard any items left on the analysis queue."""
+        while True:
+            try:
+                self._queue.get_nowait()
+            except queue.Empty:
+                return
+    
+    def _inference_loop(self):
+        """Inference stage: take the newest frame and run pose detection."""
+        while self._running:
+            ret, frame = self.stream.read(timeout=0.1)
+            if not ret:
+                if self.stream.failed:
+                    logger.error(f"{self.name}: failed to read frame, capture stream lost")
+                    return
+                continue
+            started = time.perf_counter()
+            try:
+                pose_result = self.infer(frame)
+            except Exception as e:
+                self.errors += 1
+                logger.error(f"{self.name}: inference failed: {e}")
+                continue
+            self._put((frame, pose_result, started))
+    
+    def _analysis_loop(self):
+        """Analysis stage: annotate frames and publish results."""
+        while self._running:
+            try:
+                frame, pose_result, started = self._queue.get(timeout=0.1)
+            except queue.Empty:
+                continue
+            try:
+                result = self.analyze(frame, pose_result)
+            except Exception as e:
+                self.errors += 1
+                logger.error(f"{self.name}: analysis failed: {e}")
+                continue
+            self.frames_processed += 1
+            self.last_latency = time.perf_counter() - started
+            if self.on_latency:
+                self.on_latency(self.last_latency)
+            self._publish(result)
+    
+    def _publish(self, result):
+        """Store the newest result and schedule one delivery for it."""
+        if self.dispatch is None:
+            self.on_result(result)
+            return
+        with self._result_lock:
+            self._result = result
+            if self._delivery_pending:
+                # The pending delivery will pick up this newer result
+                return
+            self._delivery_pending = True
+        self.dispatch(self._deliver)
+    
+    def _deliver(self):
+        """Hand the newest result to the consumer (runs on its thread)."""
+        with self._result_lock:
+            result = self._result
+            self._result = None
+            self._delivery_pending = False
+        if result is not None and self._running:
+            self.on_result(result)
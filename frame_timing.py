@@ -0,0 +1,304 @@
+"""
+Per-stage frame timing.
+Timestamps each stage of a frame's path (capture read, BGR->RGB, pose
+inference, landmark drawing, form checks, text, texture upload) with
+perf_counter_ns into fixed-size latency histograms, and tracks display FPS
+and dropped frames. Percentiles cover a rolling window of the last few
+seconds; the same numbers can be drawn onto the camera frame as a HUD.
+"""
+
+import bisect
+import collections
+import contextlib
+import math
+import threading
+import time
+import cv2
+
+
+# Stage names, in the order a frame passes through them
+STAGE_CAPTURE = 'capture_read'      # waiting for and reading a camera frame
+STAGE_CONVERT = 'bgr_to_rgb'        # downscale and BGR->RGB for the model
+STAGE_INFERENCE = 'pose_process'    # MediaPipe pose.process
+STAGE_DRAW = 'draw_landmarks'       # pose overlay
+STAGE_FORM = 'form_checks'          # posture/form evaluation and rep counting
+STAGE_TEXT = 'put_text'             # on-frame text
+STAGE_UPLOAD = 'texture_upload'     # texture upload (the flip is free: texture coords)
+STAGE_LATENCY = 'end_to_end'        # read to finished analysis
+STAGES = (STAGE_CAPTURE, STAGE_CONVERT, STAGE_INFERENCE, STAGE_DRAW, STAGE_FORM,
+          STAGE_TEXT, STAGE_UPLOAD, STAGE_LATENCY)
+
+# Histogram buckets: 1 us to ~17 s, 8 per doubling (~9% resolution)
+BUCKETS_PER_DOUBLING = 8
+MIN_BUCKET_NS = 1_000
+BUCKET_COUNT = 24 * BUCKETS_PER_DOUBLING
+BUCKET_BOUNDS = tuple(int(MIN_BUCKET_NS * 2 ** (i / BUCKETS_PER_DOUBLING)) for i in range(BUCKET_COUNT))
+
+# Percentiles cover the current and previous window
+DEFAULT_WINDOW = 5.0
+# Displayed frames used for the FPS estimate
+FPS_WINDOW_FRAMES = 60
+# Seconds without a displayed frame after which FPS reads 0
+FPS_STALE_AFTER = 2.0
+# Seconds between HUD text refreshes
+HUD_REFRESH = 0.5
+
+PERCENTILES = (50, 95, 99)
+
+
+class LatencyHistogram:
+    """Fixed-size log-bucketed latency histogram over a rolling window."""
+    
+    def __init__(self, window=DEFAULT_WINDOW):
+        """
+        Initialize an empty histogram.
+        
+        Args:
+            window: Seconds per window; percentiles use the current and the
+                    previous window, so they reflect the last 1-2 windows
+        """
+        self.window_ns = int(window * 1e9)
+        self.total = 0
+        self._current = [0] * (BUCKET_COUNT + 1)
+        self._previous = [0] * (BUCKET_COUNT + 1)
+        self._window_start = time.perf_counter_ns()
+        self._max = [0, 0]
+        self._sum = [0, 0]
+    
+    def record(self, duration_ns, now_ns=None):
+        """
+        Add one sample.
+        
+        Args:
+            duration_ns: Stage duration in nanoseconds
+            now_ns: perf_counter_ns() at the end of the stage (default: now)
+        """
+        if now_ns is None:
+            now_ns = time.perf_counter_ns()
+        if now_ns - self._window_start >= self.window_ns:
+            self._rotate(now_ns)
+        self._current[bisect.bisect_left(BUCKET_BOUNDS, duration_ns)] += 1
+        self._sum[0] += duration_ns
+        if duration_ns > self._max[0]:
+            self._max[0] = duration_ns
+        self.total += 1
+    
+    def _rotate(self, now_ns):
+        """Start a new window; anything older than one full window is dropped."""
+        stale = now_ns - self._window_start >= 2 * self.window_ns
+        self._previous = [0] * (BUCKET_COUNT + 1) if stale else self._current
+        self._current = [0] * (BUCKET_COUNT + 1)
+        self._max = [0, 0 if stale else self._max[0]]
+        self._sum = [0, 0 if stale else self._sum[0]]
+        self._window_start = now_ns
+    
+    def stats(self):
+        """
+        Summarize the rolling window.
+        
+        Returns:
+            Dictionary with count, mean, max and p50/p95/p99 in milliseconds
+            (percentiles are bucket upper bounds, capped at the maximum)
+        """
+        counts = [a + b for a, b in zip(self._current, self._previous)]
+        count = sum(counts)
+        largest = max(self._max)
+        stats = {'count': count, 'mean': sum(self._sum) / count / 1e6 if count else 0.0,
+                 'max': largest / 1e6}
+        for pct in PERCENTILES:
+            stats[f'p{pct}'] = self._percentile(counts, count, pct, largest) / 1e6
+        return stats
+    
+    @staticmethod
+    def _percentile(counts, count, pct, largest):
+        """Nearest-rank percentile from bucket counts, in nanoseconds."""
+        if not count:
+            return 0
+        rank = max(math.ceil(pct / 100.0 * count), 1)
+        seen = 0
+        for index, bucket in enumerate(counts):
+            seen += bucket
+            if seen >= rank:
+                bound = BUCKET_BOUNDS[index] if index < BUCKET_COUNT else largest
+                return min(bound, largest)
+        return largest
+
+
+class FrameTimings:
+    """Per-stage latency histograms, display FPS and drop counters for one stream."""
+    
+    def __init__(self, name='stream', window=DEFAULT_WINDOW):
+        """
+        Initialize the timings.
+        
+        Stages may be recorded from different threads; each stage is expected
+        to be recorded by one thread at a time.
+        
+        Args:
+            name: Stream name
+            window: Rolling window for the percentiles in seconds
+        """
+        self.name = name
+        self.window = window
+        self.frames_shown = 0
+        self._histograms = {}
+        self._lock = threading.Lock()
+        self._shown = collections.deque(maxlen=FPS_WINDOW_FRAMES)
+        self._drop_counters = {}
+        self._hud_rows = []
+        self._hud_updated = 0.0
+    
+    def histogram(self, stage):
+        """Get (creating on first use) the histogram of a stage."""
+        histogram = self._histograms.get(stage)
+        if histogram is None:
+            with self._lock:
+                histogram = self._histograms.setdefault(stage, LatencyHistogram(self.window))
+        return histogram
+    
+    def record(self, stage, duration_ns):
+        """Record a stage duration in nanoseconds."""
+        self.histogram(stage).record(duration_ns)
+    
+    @contextlib.contextmanager
+    def stage(self, stage):
+        """Time a block: ``with timings.stage(STAGE_DRAW): ...``"""
+        started = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            now = time.perf_counter_ns()
+            self.histogram(stage).record(now - started, now)
+    
+    def frame_shown(self):
+        """Count a frame reaching the display (for FPS)."""
+        self._shown.append(time.perf_counter_ns())
+        self.frames_shown += 1
+    
+    def watch_drops(self, source, counter):
+        """
+        Report a component's dropped-frame counter in snapshots.
+        
+        Args:
+            source: Name shown for the counter (e.g. 'camera')
+            counter: Callable() returning the number of frames dropped so far
+        """
+        self._drop_counters[source] = counter
+    
+    def fps(self):
+        """Frames displayed per second over the last FPS_WINDOW_FRAMES frames."""
+        shown = list(self._shown)
+        if len(shown) < 2:
+            return 0.0
+        span = shown[-1] - shown[0]
+        if span <= 0 or time.perf_counter_ns() - shown[-1] > FPS_STALE_AFTER * 1e9:
+            return 0.0
+        return (len(shown) - 1) / (span / 1e9)
+    
+    def snapshot(self):
+        """
+        Get the current timings.
+        
+        Returns:
+            Dictionary with 'stages' (stage -> LatencyHistogram.stats(), in
+            STAGES order followed by any other stages), 'fps', 'frames_shown'
+            and 'dropped' (source -> count)
+        """
+        with self._lock:
+            names = sorted(self._histograms, key=lambda s: (STAGES.index(s) if s in STAGES else len(STAGES), s))
+        dropped = {}
+        for source, counter in self._drop_counters.items():
+            try:
+                dropped[source] = counter()
+            except Exception:
+                dropped[source] = None
+        return {
+            'stages': {name: self._histograms[name].stats() for name in names},
+            'fps': self.fps(),
+            'frames_shown': self.frames_shown,
+            'dropped': dropped,
+        }
+    
+    def hud_rows(self):
+        """HUD text rows, refreshed at most every HUD_REFRESH seconds."""
+        now = time.monotonic()
+        if now - self._hud_updated >= HUD_REFRESH:
+            self._hud_rows = format_snapshot(self.snapshot())
+            self._hud_updated = now
+        return self._hud_rows
+
+
+def percentile(values, pct):
+    """
+    Nearest-rank percentile of raw samples (benchmarks; the histograms use buckets).
+    
+    Args:
+        values: Sequence of numbers
+        pct: Percentile between 0 and 100
+    
+    Returns:
+        Value at the percentile, or None for an empty sequence
+    """
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(math.ceil(pct / 100.0 * len(ordered)), 1)
+    return ordered[rank - 1]
+
+
+def timed(timings, stage):
+    """Time a block with optional timings: ``with timed(timings, STAGE_TEXT): ...``"""
+    if timings is None:
+        return contextlib.nullcontext()
+    return timings.stage(stage)
+
+
+def format_snapshot(snapshot):
+    """
+    Format a FrameTimings snapshot as rows of text cells.
+    
+    Returns:
+        List of tuples: FPS and drops, a header, then one row per recorded
+        stage with its p50/p95/p99 in milliseconds
+    """
+    drops = ' '.join(f'{source} {count}' for source, count in snapshot['dropped'].items()
+                     if count is not None)
+    rows = [(f"{snapshot['fps']:.1f} fps" + (f"  dropped: {drops}" if drops else ''),),
+            ('stage', 'p50', 'p95', 'p99 ms')]
+    for name, stats in snapshot['stages'].items():
+        if stats['count']:
+            rows.append((name, f"{stats['p50']:.1f}", f"{stats['p95']:.1f}", f"{stats['p99']:.1f}"))
+    return rows
+
+
+def draw_timings(frame, timings):
+    """
+    Draw the timing HUD in the bottom-left corner of a frame in place.
+    
+    Args:
+        frame: BGR frame to draw on
+        timings: FrameTimings of the stream
+    """
+    rows = timings.hud_rows()
+    if not rows:
+        return
+    height = frame.shape[0]
+    scale = max(0.8, height / 720.0)
+    font = cv2.FONT_HERSHEY_PLAIN
+    line_height = int(14 * scale) + 2
+    
+    # Hershey fonts are proportional: lay the columns out by measured width
+    def width(text):
+        return cv2.getTextSize(text, font, scale, 1)[0][0]
+    columns = max(len(row) for row in rows)
+    column_widths = [max((width(row[c]) for row in rows if len(row) == columns), default=0) + int(10 * scale)
+                     for c in range(columns)]
+    box_width = max(sum(column_widths), max(width(row[0]) for row in rows if len(row) < columns)) + 12
+    top = height - line_height * len(rows) - 8
+    
+    cv2.rectangle(frame, (0, top), (box_width, height), (0, 0, 0), -1)
+    for i, row in enumerate(rows):
+        x = 6
+        for c, text in enumerate(row):
+            cv2.putText(frame, text, (x, top + line_height * (i + 1)), font, scale, (0, 255, 255), 1)
+            x += column_widths[c]
@@ -0,0 +1,77 @@
+"""
+Inference input preparation.
+Downscales frames to a configurable inference resolution and converts them
+to RGB into buffers that are reused between frames, so display and drawing
+keep the camera's native resolution while MediaPipe sees a small image.
+"""
+
+import cv2
+import numpy as np
+
+
+# Inference resolutions (frame height in pixels); 0 keeps the native size
+NATIVE_RESOLUTION = 0
+INFERENCE_RESOLUTIONS = (NATIVE_RESOLUTION, 240, 360, 480, 720)
+DEFAULT_INFERENCE_RESOLUTION = 480
+
+
+class InferenceInput:
+    """Prepares RGB inference images at a fixed maximum height."""
+    
+    def __init__(self, max_height=DEFAULT_INFERENCE_RESOLUTION):
+        """
+        Initialize the preparer.
+        
+        Args:
+            max_height: Inference image height in pixels; taller frames are
+                        downscaled with their aspect ratio kept
+                        (NATIVE_RESOLUTION disables scaling)
+        """
+        if max_height < 0:
+            raise ValueError("Inference resolution must not be negative")
+        self.max_height = max_height
+        self.buffers_created = 0
+        self._resized = None
+        self._rgb = None
+    
+    def target_size(self, width, height):
+        """Get the (width, height) an image of the given size is scaled to."""
+        if self.max_height == NATIVE_RESOLUTION or height <= self.max_height:
+            return width, height
+        scale = self.max_height / height
+        return max(1, round(width * scale)), self.max_height
+    
+    def _buffer(self, current, width, height):
+        """Reuse a (height, width, 3) uint8 buffer, reallocating on size change."""
+        if current is None or current.shape[:2] != (height, width):
+            self.buffers_created += 1
+            return np.empty((height, width, 3), dtype=np.uint8)
+        return current
+    
+    def prepare(self, image):
+        """
+        Scale a BGR image to the inference resolution and convert it to RGB.
+        
+        The returned array is a reused buffer: it is only valid until the
+        next call.
+        
+        Args:
+            image: BGR image (full frame or crop; may be a non-contiguous view)
+        
+        Returns:
+            RGB uint8 image at the inference resolution
+        """
+        height, width = image.shape[:2]
+        target_w, target_h = self.target_size(width, height)
+        
+        if (target_w, target_h) != (width, height):
+            # Shrink first so the color conversion touches fewer pixels;
+            # bilinear is ~10x faster than INTER_AREA at non-integer scales and
+            # the model downsamples again to its own input size anyway
+            self._resized = self._buffer(self._resized, target_w, target_h)
+            cv2.resize(image, (target_w, target_h), dst=self._resized, interpolation=cv2.INTER_LINEAR)
+            image = self._resized
+        
+        self._rgb = self._buffer(self._rgb, target_w, target_h)
+        cv2.cvtColor(image, cv2.COLOR_BGR2RGB, dst=self._rgb)
+        return self._rgb
@@ -0,0 +1,75 @@
+"""
+Vectorized joint angle kernel.
+Computes every joint angle the form checks need in one numpy call over a
+landmark array, for a single frame (33, C) or a whole sequence (T, 33, C).
+"""
+
+import numpy as np
+from posture_detector import (
+    LEFT_SHOULDER, RIGHT_SHOULDER, LEFT_ELBOW, RIGHT_ELBOW, LEFT_WRIST, RIGHT_WRIST,
+    LEFT_HIP, RIGHT_HIP, LEFT_KNEE, RIGHT_KNEE, LEFT_ANKLE, RIGHT_ANKLE
+)
+
+
+# Rows of the joint triplet table: (end point, vertex, end point).
+# The angle is measured at the vertex.
+JOINT_NAMES = (
+    'left_elbow', 'right_elbow',
+    'left_knee', 'right_knee',
+    'left_hip', 'right_hip',
+    'left_shoulder', 'right_shoulder',
+)
+ANGLE_LEFT_ELBOW = 0
+ANGLE_RIGHT_ELBOW = 1
+ANGLE_LEFT_KNEE = 2
+ANGLE_RIGHT_KNEE = 3
+ANGLE_LEFT_HIP = 4
+ANGLE_RIGHT_HIP = 5
+ANGLE_LEFT_SHOULDER = 6
+ANGLE_RIGHT_SHOULDER = 7
+
+JOINT_TRIPLETS = np.array([
+    (LEFT_SHOULDER, LEFT_ELBOW, LEFT_WRIST),
+    (RIGHT_SHOULDER, RIGHT_ELBOW, RIGHT_WRIST),
+    (LEFT_HIP, LEFT_KNEE, LEFT_ANKLE),
+    (RIGHT_HIP, RIGHT_KNEE, RIGHT_ANKLE),
+    (LEFT_SHOULDER, LEFT_HIP, LEFT_KNEE),
+    (RIGHT_SHOULDER, RIGHT_HIP, RIGHT_KNEE),
+    (LEFT_ELBOW, LEFT_SHOULDER, LEFT_HIP),
+    (RIGHT_ELBOW, RIGHT_SHOULDER, RIGHT_HIP),
+], dtype=np.intp)
+
+
+def joint_angles(points, triplets=JOINT_TRIPLETS, scale=None):
+    """
+    Compute joint angles for a table of landmark triplets in one call.
+    
+    Args:
+        points: Landmark array of shape (..., 33, C) with x, y in the first
+                two columns: (33, 2) pixels, (33, 4) normalized landmarks or
+                (T, 33, 4) for a whole recording
+        triplets: (K, 3) integer array of (end, vertex, end) landmark IDs
+        scale: Optional (width, height) applied to x, y first; pass the frame
+               size for normalized landmarks so angles are not distorted by
+               the aspect ratio
+    
+    Returns:
+        float32 array of shape (..., K) with angles in degrees at each
+        vertex; degenerate triplets (coincident points) give 0
+    """
+    xy = np.asarray(points, dtype=np.float32)[..., :2]
+    if scale is not None:
+        xy = xy * np.asarray(scale, dtype=np.float32)
+    
+    # One gather per column of the table: shape (..., K, 2)
+    triplets = np.asarray(triplets, dtype=np.intp)
+    vertex = xy[..., triplets[:, 1], :]
+    v1 = xy[..., triplets[:, 0], :] - vertex
+    v2 = xy[..., triplets[:, 2], :] - vertex
+    
+    dot = np.einsum('...i,...i->...', v1, v2)
+    norm = np.sqrt(np.einsum('...i,...i->...', v1, v1) * np.einsum('...i,...i->...', v2, v2))
+    cosine = np.divide(dot, norm, out=np.ones_like(dot), where=norm > 0)
+    angles = np.degrees(np.arccos(np.clip(cosine, -1.0, 1.0)))
+    angles[norm == 0] = 0
+    return angles
@@ -0,0 +1,151 @@
+"""
+Temporal smoothing for pose landmarks.
+Filters operate on the whole (33, 4) landmark array at once and keep
+per-landmark state between frames, so rep counting thresholds see stable
+joint angles instead of per-frame jitter.
+"""
+
+import math
+import numpy as np
+
+
+# Smoothing modes stored in the 'landmark_smoothing' setting
+SMOOTHING_OFF = 'off'
+SMOOTHING_EMA = 'ema'
+SMOOTHING_ONE_EURO = 'one_euro'
+SMOOTHING_MODES = (SMOOTHING_OFF, SMOOTHING_EMA, SMOOTHING_ONE_EURO)
+
+# EMA weight of the newest frame
+DEFAULT_EMA_ALPHA = 0.5
+
+# One Euro parameters for normalized (0..1) landmark coordinates
+DEFAULT_MIN_CUTOFF = 1.0  # Hz; cutoff when a landmark is still
+DEFAULT_BETA = 10.0  # cutoff increase per unit/s of landmark speed
+DEFAULT_D_CUTOFF = 1.0  # Hz; cutoff for the speed estimate
+
+# Frame interval assumed when timestamps do not advance
+DEFAULT_FRAME_INTERVAL = 1.0 / 30
+
+
+class EmaLandmarkFilter:
+    """Exponential moving average over the landmark array."""
+    
+    def __init__(self, alpha=DEFAULT_EMA_ALPHA):
+        """
+        Initialize the filter.
+        
+        Args:
+            alpha: Weight of the newest frame (1.0 disables smoothing)
+        """
+        if not 0 < alpha <= 1:
+            raise ValueError("alpha must be in (0, 1]")
+        self.alpha = alpha
+        self._state = None
+    
+    def reset(self):
+        """Forget the filter state (e.g. when the pose is lost)."""
+        self._state = None
+    
+    def filter(self, points, timestamp=None):
+        """
+        Smooth one frame of landmarks.
+        
+        Args:
+            points: (33, 4) landmark array
+            timestamp: Unused; accepted for interface compatibility
+        
+        Returns:
+            Smoothed (33, 4) float32 array
+        """
+        points = np.asarray(points, dtype=np.float32)
+        if self._state is None or self._state.shape != points.shape:
+            self._state = points.copy()
+        else:
+            # state += alpha * (points - state), in place
+            self._state += self.alpha * (points - self._state)
+        return self._state.copy()
+
+
+class OneEuroLandmarkFilter:
+    """One Euro filter applied element-wise to the landmark array."""
+    
+    def __init__(self, min_cutoff=DEFAULT_MIN_CUTOFF, beta=DEFAULT_BETA,
+                 d_cutoff=DEFAULT_D_CUTOFF):
+        """
+        Initialize the filter.
+        
+        Args:
+            min_cutoff: Cutoff frequency (Hz) for still landmarks; lower is smoother
+            beta: Speed coefficient; higher reduces lag on fast movement
+            d_cutoff: Cutoff frequency (Hz) for the speed estimate
+        """
+        self.min_cutoff = min_cutoff
+        self.beta = beta
+        self.d_cutoff = d_cutoff
+        self._x = None
+        self._dx = None
+        self._timestamp = None
+    
+    @staticmethod
+    def _alpha(cutoff, dt):
+        """Smoothing factor for a cutoff frequency (scalar or array) and interval."""
+        tau = 1.0 / (2 * math.pi * cutoff)
+        return 1.0 / (1.0 + tau / dt)
+    
+    def reset(self):
+        """Forget the filter state (e.g. when the pose is lost)."""
+        self._x = None
+        self._dx = None
+        self._timestamp = None
+    
+    def filter(self, points, timestamp):
+        """
+        Smooth one frame of landmarks.
+        
+        Args:
+            points: (33, 4) landmark array
+            timestamp: Frame time in seconds (monotonic)
+        
+        Returns:
+            Smoothed (33, 4) float32 array
+        """
+        points = np.asarray(points, dtype=np.float32)
+        if self._x is None or self._x.shape != points.shape:
+            self._x = points.copy()
+            self._dx = np.zeros_like(points)
+            self._timestamp = timestamp
+            return self._x.copy()
+        
+        dt = timestamp - self._timestamp
+        if dt <= 0:
+            dt = DEFAULT_FRAME_INTERVAL
+        self._timestamp = timestamp
+        
+        # Smoothed speed of every coordinate
+        dx = (points - self._x) / dt
+        self._dx += self._alpha(self.d_cutoff, dt) * (dx - self._dx)
+        
+        # Per-coordinate cutoff: fast landmarks are smoothed less
+        cutoff = self.min_cutoff + self.beta * np.abs(self._dx)
+        alpha = self._alpha(cutoff, dt).astype(np.float32)
+        self._x += alpha * (points - self._x)
+        return self._x.copy()
+
+
+def create_landmark_filter(mode):
+    """
+    Create a landmark filter for a smoothing mode.
+    
+    Args:
+        mode: One of SMOOTHING_MODES
+    
+    Returns:
+        Filter instance, or None for SMOOTHING_OFF
+    """
+    if mode == SMOOTHING_EMA:
+        return EmaLandmarkFilter()
+    if mode == SMOOTHING_ONE_EURO:
+        return OneEuroLandmarkFilter()
+    if mode == SMOOTHING_OFF:
+        return None
+    raise ValueError(f"Unknown landmark smoothing mode: {mode}")
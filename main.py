@@ -1,6 +1,8 @@
 import os
 import warnings
 import sys
+import threading
+import startup_trace
 
 # Suppress warnings before importing other modules
 #os.environ['TF_CPP_MIN_LOG_LEVEL'] = '3'
@@ -13,6 +15,7 @@ import sys
 #warnings.filterwarnings('ignore', category=UserWarning, module='google.protobuf')
 #warnings.filterwarnings('ignore', category=FutureWarning, module='mediapipe')
 
+startup_trace.begin('import_cv2_numpy')
 import cv2
 # Set OpenCV log level to ERROR only (suppresses WARN messages)
 # Only available in OpenCV 4.x
@@ -21,37 +24,61 @@ import cv2
 #except AttributeError:
 #    pass  # setLogLevel not available in this OpenCV version
 import numpy as np
+startup_trace.end('import_cv2_numpy')
+startup_trace.begin('import_kivy')
 from kivy.app import App
 from kivy.uix.boxlayout import BoxLayout
 from kivy.uix.button import Button
 from kivy.uix.label import Label
 from kivy.uix.tabbedpanel import TabbedPanel
 from kivy.clock import Clock
-from kivy.graphics.texture import Texture
 from kivy.core.window import Window
 from kivy.logger import Logger
 from kivy.config import Config
 from kivy.lang import Builder
+startup_trace.end('import_kivy')
 
 # Configure Kivy to not require multitouch input device
 Config.set('input', 'mouse', 'mouse,multitouch_on_demand')
 
 # Load the KV layout file explicitly (filename doesn't match App class name)
 try:
-    Builder.load_file(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'posture_tracker.kv'))
+    with startup_trace.span('kv_parse'):
+        Builder.load_file(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'posture_tracker.kv'))
 except Exception as e:
     Logger.critical(f"Failed to load posture_tracker.kv: {e}")
     sys.exit(1)
 
+startup_trace.begin('import_app_modules')
 from database import SettingsDatabase
 from posture_detector import PostureDetector
 from exercise_database import ExerciseDatabase
 from exercise_detector import ExerciseDetector
+from camera_stream import CameraStream
+from camera_enumeration import CameraEnumerator, DEFAULT_MAX_CAMERAS
+from camera_profile import (CameraProfile, open_capture, negotiated_format, describe_format,
+                            profile_mismatches)
+from frame_pipeline import FramePipeline
+from frame_display import FrameDisplay
+from pose_engine import PoseEngineRegistry
+from posture_logger import PostureSampleWriter
+from landmark_filter import create_landmark_filter
+from pose_decimation import DecimatedPoseInference, DECIMATION_AUTO
+from roi_tracker import RoiTracker
+from inference_input import InferenceInput, INFERENCE_RESOLUTIONS, NATIVE_RESOLUTION
+from quality_controller import QualityController, QUALITY_LEVELS
+from frame_timing import (FrameTimings, timed, draw_timings, format_snapshot, STAGE_DRAW, STAGE_FORM,
+                          STAGE_TEXT, STAGE_UPLOAD, STAGE_LATENCY)
+startup_trace.end('import_app_modules')
 
 
 # Default application settings (used when database is unavailable)
 DEFAULT_CAMERA_INDEX = 0
 DEFAULT_TILT_THRESHOLD = 15.0
+DEFAULT_LANDMARK_SMOOTHING = 'one_euro'
+DEFAULT_INFERENCE_RESOLUTION = 480
+DEFAULT_MODEL_COMPLEXITY = 1  # MediaPipe full model (bundled)
+PERF_OVERLAY_KEY = 293  # F12 (Kivy keycode) toggles the frame timing overlay
 
 
 # UI Color Theme Palettes
@@ -115,46 +142,84 @@ class PostureTrackerApp(TabbedPanel):
         # Initialize tracking state first (needed by apply_theme)
         self.is_tracking = False
         self.capture = None
-        self.event = None
+        self.pipeline = None
+        self.tracking_inference = None
+        self.tracking_quality = None
+        self.tracking_level = None
+        self.tracking_overlay = True
+        # Per-stage timings of the current (or last) tracking session
+        self.tracking_timings = None
+        self.tracking_display = FrameDisplay()
         self._camera_list_retry_count = 0
+        # Last negotiated capture format per camera index
+        self.camera_formats = {}
+        # Last camera enumeration (None until the first scan finishes)
+        self.detected_cameras = None
         self._settings_load_retry_count = 0
         
         # Initialize training state
         self.is_training = False
         self.training_capture = None
-        self.training_event = None
+        self.training_pipeline = None
+        self.training_inference = None
+        self.training_quality = None
+        self.training_level = None
+        self.training_overlay = True
+        self.training_timings = None
+        self.training_display = FrameDisplay()
         self.current_exercise_id = None
         self.selected_exercise = None
+        self.exercise_detector = None
+        self.training_engine = None
         
         # Initialize database with error handling
         try:
-            self.db = SettingsDatabase()
+            with startup_trace.span('settings_db'):
+                self.db = SettingsDatabase()
         except Exception as e:
             Logger.error(f"Failed to initialize database: {e}")
             Logger.warning("Using default settings")
             self.db = None
         
+        # Keep the threshold in memory for the analysis thread; refreshed on change
+        self.tilt_threshold = self.db.get_tilt_threshold() if self.db else DEFAULT_TILT_THRESHOLD
+        self.landmark_smoothing = (self.db.get_landmark_smoothing() if self.db
+                                   else DEFAULT_LANDMARK_SMOOTHING)
+        self.inference_resolution = (self.db.get_inference_resolution() if self.db
+                                     else DEFAULT_INFERENCE_RESOLUTION)
+        # Frame timing HUD on the camera displays (toggled with F12)
+        self.perf_overlay = bool(self.db) and self.db.get_perf_overlay() is True
+        if self.db:
+            self.db.subscribe(self.on_setting_changed)
+        
+        # Posture samples are buffered and written in batches while tracking
+        self.sample_writer = PostureSampleWriter(self.db) if self.db else None
+        
         # Load and apply theme before creating detector
         theme = self.db.get_theme() if self.db else 'dark'
         self.apply_theme(theme)
         
-        # Initialize detector with error handling
-        try:
-            self.detector = PostureDetector()
-        except Exception as e:
-            Logger.error(f"Failed to initialize PostureDetector: {e}")
-            Logger.error("Pose detection will not be available")
-            self.detector = None
+        # Both tabs share one pose engine, created when tracking/training starts
+        self.pose_engines = PoseEngineRegistry(PostureDetector)
+        self.detector = None
+        # Engine loaded and warmed up in the background after the first paint;
+        # held for the app's lifetime so starting a tab reuses it
+        self.preloaded_engine = None
+        self.model_loading = False
+        # Model complexities that failed to load (not retried this session)
+        self.unavailable_complexities = set()
+        
+        # Camera enumeration, cached in the database
+        self.camera_enumerator = CameraEnumerator(self.db)
         
-        # Initialize exercise database and detector
+        # Initialize exercise database
         try:
-            self.exercise_db = ExerciseDatabase()
-            self.exercise_detector = ExerciseDetector()
+            with startup_trace.span('exercise_db'):
+                self.exercise_db = ExerciseDatabase()
         except Exception as e:
             Logger.error(f"Failed to initialize exercise components: {e}")
             Logger.error("Training features will not be available")
             self.exercise_db = None
-            self.exercise_detector = None
         
         # Populate camera list after UI is built (give more time for widget initialization)
         Clock.schedule_once(self.populate_camera_list, 0.5)
@@ -187,6 +252,19 @@ class PostureTrackerApp(TabbedPanel):
         # Update UI colors if widgets exist
         self.update_ui_colors()
     
+    def on_setting_changed(self, key, value):
+        """Refresh cached settings when the database reports a change."""
+        if key == 'tilt_threshold':
+            self.tilt_threshold = float(value)
+        elif key == 'landmark_smoothing':
+            # Applies from the next start of tracking/training
+            self.landmark_smoothing = value
+        elif key == 'inference_resolution':
+            # Applies from the next start of tracking/training
+            self.inference_resolution = int(value)
+        elif key == 'perf_overlay':
+            self.perf_overlay = value == '1'
+    
     def update_ui_colors(self):
         """Update colors of all UI elements to match current theme."""
         # Update main background
@@ -225,15 +303,36 @@ class PostureTrackerApp(TabbedPanel):
                 Logger.error("Camera spinner not available after 5 seconds")
             return
         
-        camera_spinner = self.ids.camera_spinner
-        available_cameras = []
+        # Enumerate off the UI thread; cached devices are not opened
+        self.scan_cameras(self.set_camera_spinner_values)
+    
+    def scan_cameras(self, callback, refresh=False):
+        """
+        Enumerate cameras on a background thread.
         
-        # Try to detect available cameras (check indices 0-2, reduced for faster startup)
-        for i in range(3):
-            cap = cv2.VideoCapture(i)
-            if cap.isOpened():
-                available_cameras.append(f"Camera {i}")
-                cap.release()
+        Args:
+            callback: Callable(cameras) run on the UI thread with the result
+            refresh: Probe every device instead of trusting the cache
+        """
+        def scan():
+            startup_trace.begin('camera_scan')
+            try:
+                cameras = self.camera_enumerator.enumerate(refresh=refresh)
+            except Exception as e:
+                Logger.error(f"Camera enumeration failed: {e}")
+                cameras = []
+            startup_trace.end('camera_scan')
+            self.detected_cameras = cameras
+            self.dispatch_to_ui(lambda: callback(cameras))
+        
+        threading.Thread(target=scan, name='camera-scan', daemon=True).start()
+    
+    def set_camera_spinner_values(self, cameras):
+        """Fill the camera selection spinner from an enumeration (runs on the UI thread)."""
+        if 'camera_spinner' not in self.ids:
+            return
+        camera_spinner = self.ids.camera_spinner
+        available_cameras = [cam['name'] for cam in cameras if cam['available']]
         
         if not available_cameras:
             available_cameras = ["No cameras found"]
@@ -247,7 +346,12 @@ class PostureTrackerApp(TabbedPanel):
         else:
             camera_spinner.text = available_cameras[0]
         
-        Logger.info(f"Found cameras: {available_cameras}")
+        Logger.info(f"Found cameras: {available_cameras} "
+                    f"({self.camera_enumerator.probes} devices probed)")
+        
+        # Keep the Settings list in step once it has been drawn
+        if 'camera_list_container' in self.ids:
+            self._update_camera_list(cameras)
     
     def get_selected_camera_index(self):
         """Get the selected camera index from the spinner."""
@@ -262,34 +366,220 @@ class PostureTrackerApp(TabbedPanel):
                 return default_camera
         return default_camera
     
-    def start_tracking(self):
-        """Start video capture and posture tracking."""
-        if not self.detector:
-            Logger.error("Cannot start tracking: PostureDetector not initialized")
-            if 'status_label' in self.ids:
-                self.ids.status_label.text = 'Detector not available'
-                self.ids.status_label.color = CURRENT_THEME['bad']
+    def get_camera_profile(self, camera_index):
+        """Get a camera's stored capture profile (driver defaults if none or invalid)."""
+        if not self.db:
+            return CameraProfile()
+        try:
+            return CameraProfile.from_dict(self.db.get_camera_profile(camera_index))
+        except (TypeError, ValueError) as e:
+            Logger.warning(f"Invalid capture profile for camera {camera_index}: {e}")
+            return CameraProfile()
+    
+    def open_camera(self, camera_index, name, timings=None):
+        """
+        Open a camera with its capture profile and report the negotiated format.
+        
+        Args:
+            camera_index: Camera device index
+            name: Stream name ('tracking' or 'training')
+            timings: Optional FrameTimings recording capture reads
+        
+        Returns:
+            CameraStream (check isOpened())
+        """
+        profile = self.get_camera_profile(camera_index)
+        capture = open_capture(camera_index, profile)
+        stream = CameraStream(capture, name=name, timings=timings)
+        if stream.isOpened():
+            self.report_camera_format(camera_index, profile, capture)
+        return stream
+    
+    def report_camera_format(self, camera_index, profile, capture):
+        """
+        Log the format a camera negotiated and any requested values it refused.
+        
+        Returns:
+            negotiated_format() dictionary
+        """
+        try:
+            negotiated = negotiated_format(capture)
+        except Exception as e:
+            Logger.warning(f"Camera {camera_index} format could not be read: {e}")
+            return None
+        self.camera_formats[camera_index] = negotiated
+        Logger.info(f"Camera {camera_index} negotiated {describe_format(negotiated)}, "
+                    f"buffer {negotiated['buffer_size'] or 'default'}")
+        for mismatch in profile_mismatches(profile, negotiated):
+            Logger.warning(f"Camera {camera_index} did not grant {mismatch}")
+        return negotiated
+    
+    def warm_up_pose_engine(self):
+        """
+        Load and warm up the default pose engine on a background thread.
+        
+        MediaPipe is imported, the graph built and a dummy inference run off
+        the UI thread; the Start buttons show a loading state meanwhile.
+        """
+        if self.preloaded_engine or self.model_loading:
             return
+        self.model_loading = True
+        self.show_model_loading(True)
+        
+        def load():
+            engine, seconds = None, 0.0
+            try:
+                with startup_trace.span('model_load'):
+                    engine = self.pose_engines.acquire(model_complexity=DEFAULT_MODEL_COMPLEXITY)
+                with startup_trace.span('model_warm_up'):
+                    seconds = engine.warm_up()
+            except Exception as e:
+                Logger.error(f"Failed to load pose model: {e}")
+            self.dispatch_to_ui(lambda: self.on_pose_engine_loaded(engine, seconds))
+        
+        threading.Thread(target=load, name='pose-warm-up', daemon=True).start()
+    
+    def on_pose_engine_loaded(self, engine, seconds):
+        """Finish the background model load (runs on the UI thread)."""
+        self.model_loading = False
+        self.preloaded_engine = engine
+        self.show_model_loading(False)
+        if engine:
+            Logger.info(f"Pose model ready (warm-up inference {seconds * 1000:.0f} ms)")
+            startup_trace.mark('model_ready')
+            if startup_trace.AUTOSTART:
+                self.start_tracking()
+    
+    def show_model_loading(self, loading):
+        """Show or clear the loading state of the Start buttons."""
+        for button_id, text, running in (('start_button', 'Start Tracking', self.is_tracking),
+                                         ('training_start_button', 'Start Exercise', self.is_training)):
+            if button_id in self.ids:
+                button = self.ids[button_id]
+                button.text = 'Loading model…' if loading else text
+                button.disabled = loading or running
+    
+    def acquire_pose_engine(self, model_complexity=DEFAULT_MODEL_COMPLEXITY):
+        """Get the shared pose engine, or None if it cannot be created."""
+        try:
+            return self.pose_engines.acquire(model_complexity=model_complexity)
+        except Exception as e:
+            Logger.error(f"Failed to initialize PostureDetector: {e}")
+            Logger.error("Pose detection will not be available")
+            return None
+    
+    def create_inference_stage(self, engine, stream, level=None):
+        """
+        Build the pipeline inference stage for a pose engine.
+        
+        Detection runs on a crop around the previous landmarks scaled to the
+        inference resolution, is followed by temporal landmark smoothing (if
+        enabled) and runs on every Nth frame per the stream's decimation
+        setting; each pipeline gets its own crop, buffers, filter and
+        decimation state.
+        
+        Args:
+            engine: Shared PostureDetector
+            stream: Stream name ('tracking' or 'training')
+            level: QualityLevel capping the resolution and setting the minimum
+                   decimation (None = use the settings as they are)
         
+        Returns:
+            DecimatedPoseInference (call close() when the pipeline stops)
+        """
+        try:
+            landmark_filter = create_landmark_filter(self.landmark_smoothing)
+        except ValueError as e:
+            Logger.warning(f"{e}; landmark smoothing disabled")
+            landmark_filter = None
+        
+        resolution = self.inference_resolution
+        if resolution not in INFERENCE_RESOLUTIONS:
+            Logger.warning(f"Invalid inference resolution {resolution}; using {DEFAULT_INFERENCE_RESOLUTION}")
+            resolution = DEFAULT_INFERENCE_RESOLUTION
+        if level:
+            resolution = level.resolution(resolution)
+        roi_tracker = RoiTracker()
+        inference_input = InferenceInput(resolution)
+        timings = self.tracking_timings if stream == 'tracking' else self.training_timings
+        
+        def infer(frame):
+            return engine.smooth(engine.detect(frame, roi_tracker, inference_input, timings), landmark_filter)
+        
+        decimation = DECIMATION_AUTO
+        if self.db:
+            try:
+                decimation = int(self.db.get_inference_decimation(stream))
+            except (TypeError, ValueError):
+                decimation = DECIMATION_AUTO
+        min_decimation = 1
+        if level:
+            # A level raises the floor of automatic N, or a pinned N, to its own
+            # decimation; the controller is fed the N actually in use
+            if decimation == DECIMATION_AUTO:
+                min_decimation = level.decimation
+            else:
+                decimation = max(decimation, level.decimation)
+        try:
+            return DecimatedPoseInference(engine, infer, decimation=decimation, name=stream,
+                                          min_decimation=min_decimation)
+        except ValueError as e:
+            Logger.warning(f"{e}; using automatic decimation")
+            return DecimatedPoseInference(engine, infer, name=stream, min_decimation=min_decimation)
+    
+    def start_tracking(self):
+        """Start video capture and posture tracking."""
         if not self.is_tracking:
+            self.tracking_quality = self.create_quality_controller('tracking')
+            level = self.tracking_quality.current if self.tracking_quality else None
+            self.detector = self.acquire_pose_engine(
+                level.model_complexity if level else DEFAULT_MODEL_COMPLEXITY)
+            if not self.detector:
+                Logger.error("Cannot start tracking: PostureDetector not initialized")
+                if 'status_label' in self.ids:
+                    self.ids.status_label.text = 'Detector not available'
+                    self.ids.status_label.color = CURRENT_THEME['bad']
+                return
+            
             # Get selected camera index
             camera_index = self.get_selected_camera_index()
             
-            # Open camera
-            self.capture = cv2.VideoCapture(camera_index)
+            # Open camera with its capture profile; frames are read on a background thread
+            self.tracking_timings = FrameTimings('tracking')
+            self.capture = self.open_camera(camera_index, 'tracking', self.tracking_timings)
             
             if not self.capture.isOpened():
                 Logger.error(f"Failed to open camera {camera_index}")
+                self.capture.release()
+                self.capture = None
+                self.pose_engines.release(self.detector)
+                self.detector = None
                 return
             
+            self.capture.start()
             self.is_tracking = True
             self.ids.start_button.disabled = True
             self.ids.stop_button.disabled = False
             if 'camera_spinner' in self.ids:
                 self.ids.camera_spinner.disabled = True
             
-            # Schedule frame update
-            self.event = Clock.schedule_interval(self.update_frame, 1.0/30.0)
+            # Run inference and analysis off the UI thread
+            self.tracking_inference = self.create_inference_stage(self.detector, 'tracking', level)
+            self.tracking_level = level
+            self.tracking_overlay = level.overlay if level else True
+            self.show_quality_level('tracking', level)
+            self.pipeline = FramePipeline(
+                self.capture,
+                infer=self.tracking_inference,
+                analyze=self.analyze_tracking_frame,
+                on_result=self.update_frame,
+                dispatch=self.dispatch_to_ui,
+                name='tracking',
+                on_latency=self.record_tracking_latency,
+            ).start()
+            self.watch_dropped_frames(self.tracking_timings, self.capture, self.pipeline)
+            if self.sample_writer:
+                self.sample_writer.start()
             Logger.info(f"Tracking started with camera {camera_index}")
     
     def stop_tracking(self):
@@ -297,18 +587,41 @@ class PostureTrackerApp(TabbedPanel):
         if self.is_tracking:
             self.is_tracking = False
             
-            # Stop scheduled updates
-            if self.event:
-                self.event.cancel()
-                self.event = None
+            # Stop pipeline workers
+            if self.pipeline:
+                self.pipeline.stop()
+                self.pipeline = None
+            if self.tracking_inference:
+                Logger.info(f"Tracking inference: {self.tracking_inference.inferences} of "
+                            f"{self.tracking_inference.frames} frames inferred")
+                self.tracking_inference.close()
+                self.tracking_inference = None
+            if self.tracking_quality:
+                Logger.info(f"Tracking quality: {self.tracking_quality.current.name} "
+                            f"after {self.tracking_quality.changes} changes")
+                self.tracking_quality = None
+            self.tracking_level = None
+            self.show_quality_level('tracking', None)
+            self.log_frame_timings('Tracking', self.tracking_timings)
+            
+            # Write out any buffered posture samples
+            if self.sample_writer:
+                self.sample_writer.stop()
             
             # Release camera
             if self.capture:
+                Logger.info(f"Tracking capture: {self.capture.frames_captured} frames, "
+                            f"{self.capture.frames_dropped} dropped")
                 self.capture.release()
                 self.capture = None
             
+            # Hand back the shared pose engine
+            if self.detector:
+                self.pose_engines.release(self.detector)
+                self.detector = None
+            
             # Clear display
-            self.ids.camera_display.texture = None
+            self.tracking_display.clear(self.ids.camera_display)
             self.ids.tilt_label.text = '0.0°'
             self.ids.status_label.text = 'Stopped'
             self.ids.status_label.color = CURRENT_THEME['neutral']
@@ -319,30 +632,241 @@ class PostureTrackerApp(TabbedPanel):
                 self.ids.camera_spinner.disabled = False
             Logger.info("Tracking stopped")
     
-    def update_frame(self, dt):
-        """Update video frame and detect posture."""
-        if not self.is_tracking or not self.capture or not self.detector:
+    def watch_dropped_frames(self, timings, capture, pipeline):
+        """Report a stream's camera and pipeline drop counters in its timings."""
+        timings.watch_drops('camera', lambda: capture.frames_dropped)
+        timings.watch_drops('pipeline', lambda: pipeline.frames_dropped)
+    
+    def frame_timings(self, stream):
+        """
+        Get the per-stage frame timings of a stream.
+        
+        Args:
+            stream: Stream name ('tracking' or 'training')
+        
+        Returns:
+            FrameTimings.snapshot() of the running (or last) session, or None
+            if the stream has not been started
+        """
+        timings = self.tracking_timings if stream == 'tracking' else self.training_timings
+        return timings.snapshot() if timings else None
+    
+    def log_frame_timings(self, label, timings):
+        """Log a finished session's frame timings."""
+        if timings:
+            for row in format_snapshot(timings.snapshot()):
+                Logger.info(f"{label} timings: {'  '.join(row)}")
+    
+    def toggle_perf_overlay(self):
+        """Show or hide the frame timing overlay (saved as a setting)."""
+        self.perf_overlay = not self.perf_overlay
+        if self.db:
+            try:
+                self.db.set_perf_overlay(self.perf_overlay)
+            except Exception as e:
+                Logger.warning(f"Failed to save overlay setting: {e}")
+    
+    def dispatch_to_ui(self, callback):
+        """Run a pipeline callback on the Kivy UI thread."""
+        Clock.schedule_once(lambda dt: callback(), 0)
+    
+    def create_quality_controller(self, stream):
+        """
+        Create the adaptive quality controller for a stream.
+        
+        Returns:
+            QualityController, or None if adaptive quality is disabled
+        """
+        enabled = self.db.get_adaptive_quality() if self.db else True
+        if enabled is not True:
+            return None
+        return QualityController(
+            on_change=lambda level: self.dispatch_to_ui(lambda: self.apply_quality_level(stream, level)))
+    
+    def record_tracking_latency(self, latency):
+        """Feed a tracking frame's latency to its timings and quality controller (analysis thread)."""
+        if self.tracking_timings:
+            self.tracking_timings.record(STAGE_LATENCY, int(latency * 1e9))
+        controller = self.tracking_quality
+        stage = self.tracking_inference
+        if controller and stage:
+            controller.record(latency, stage.inference_time, stage.decimation)
+    
+    def record_training_latency(self, latency):
+        """Feed a training frame's latency to its timings and quality controller (analysis thread)."""
+        if self.training_timings:
+            self.training_timings.record(STAGE_LATENCY, int(latency * 1e9))
+        controller = self.training_quality
+        stage = self.training_inference
+        if controller and stage:
+            controller.record(latency, stage.inference_time, stage.decimation)
+    
+    def quality_state(self, stream):
+        """
+        Get a running stream's pipeline, pose engine and quality controller.
+        
+        Returns:
+            Tuple of (pipeline, engine, controller), or None if the stream
+            is not running with adaptive quality
+        """
+        if stream == 'tracking':
+            if self.is_tracking and self.pipeline and self.tracking_quality:
+                return self.pipeline, self.detector, self.tracking_quality
+        elif self.is_training and self.training_pipeline and self.training_quality:
+            return self.training_pipeline, self.training_engine, self.training_quality
+        return None
+    
+    def apply_quality_level(self, stream, level_index):
+        """
+        Switch a running stream to a quality level (runs on the UI thread).
+        
+        When the level uses another model complexity, its engine is loaded on
+        a background thread first (lite and heavy models download on first
+        use), then the switch completes on the UI thread.
+        
+        Args:
+            stream: Stream name ('tracking' or 'training')
+            level_index: Index into QUALITY_LEVELS
+        """
+        state = self.quality_state(stream)
+        if not state:
+            return
+        engine = state[1]
+        level = QUALITY_LEVELS[level_index]
+        if (getattr(engine, 'model_complexity', None) == level.model_complexity
+                or level.model_complexity in self.unavailable_complexities):
+            self.switch_quality_level(stream, level_index, None)
             return
         
-        ret, frame = self.capture.read()
+        def load():
+            try:
+                new_engine = self.pose_engines.acquire(model_complexity=level.model_complexity)
+            except Exception as e:
+                Logger.warning(f"Pose model complexity {level.model_complexity} not available: {e}")
+                self.unavailable_complexities.add(level.model_complexity)
+                new_engine = None
+            self.dispatch_to_ui(lambda: self.switch_quality_level(stream, level_index, new_engine))
+        
+        threading.Thread(target=load, name=f'{stream}-quality', daemon=True).start()
+    
+    def switch_quality_level(self, stream, level_index, new_engine):
+        """
+        Swap a stream's inference stage for a quality level (runs on the UI thread).
+        
+        Without a new engine the level runs on the current model, keeping
+        its resolution, decimation and overlay reductions; a level that would
+        then change nothing is marked unavailable and skipped.
         
-        if not ret:
-            Logger.error("Failed to read frame")
+        Args:
+            stream: Stream name ('tracking' or 'training')
+            level_index: Index into QUALITY_LEVELS
+            new_engine: Engine acquired for the level, or None to keep the current one
+        """
+        state = self.quality_state(stream)
+        if not state or state[2].level != level_index:
+            # Stream stopped or the controller moved on while loading
+            if new_engine:
+                self.pose_engines.release(new_engine)
             return
+        pipeline, engine, controller = state
+        level = QUALITY_LEVELS[level_index]
+        
+        if new_engine is None:
+            new_engine = engine
+            active = self.tracking_level if stream == 'tracking' else self.training_level
+            if active and (level.resolution(self.inference_resolution),
+                           level.decimation, level.overlay) == (
+                               active.resolution(self.inference_resolution),
+                               active.decimation, active.overlay):
+                fallback = controller.mark_unavailable(level_index)
+                if fallback != level_index:
+                    self.apply_quality_level(stream, fallback)
+                return
         
-        # Process frame for posture detection
-        processed_frame, tilt_angle, left_shoulder, right_shoulder = self.detector.process_frame(frame)
+        stage = self.create_inference_stage(new_engine, stream, level)
+        old_stage = pipeline.infer
+        pipeline.infer = stage
+        if stream == 'tracking':
+            self.detector = new_engine
+            self.tracking_inference = stage
+            self.tracking_level = level
+            self.tracking_overlay = level.overlay
+        else:
+            self.training_engine = new_engine
+            self.training_inference = stage
+            self.training_level = level
+            self.training_overlay = level.overlay
+            if self.exercise_detector:
+                self.exercise_detector.posture_detector = new_engine
+        
+        # Closing joins the old keyframe worker: keep that wait off the UI thread
+        def retire():
+            old_stage.close()
+            if new_engine is not engine:
+                self.pose_engines.release(engine)
+        threading.Thread(target=retire, name=f'{stream}-quality-retire', daemon=True).start()
+        
+        self.show_quality_level(stream, level)
+        Logger.info(f"{stream.capitalize()} quality: {level.name}")
+    
+    def show_quality_level(self, stream, level):
+        """Show a stream's quality level in its status bar (None clears it)."""
+        label_id = 'quality_label' if stream == 'tracking' else 'training_quality_label'
+        if label_id in self.ids:
+            self.ids[label_id].text = level.name if level else ''
+    
+    def analyze_tracking_frame(self, frame, pose_result):
+        """
+        Evaluate posture and annotate the frame (runs on the analysis thread).
         
-        # Get threshold from database
-        threshold = self.db.get_tilt_threshold() if self.db else DEFAULT_TILT_THRESHOLD
+        Returns:
+            Dictionary with the annotated frame and posture values
+        """
+        timings = self.tracking_timings
+        if self.detector and self.tracking_overlay:
+            with timed(timings, STAGE_DRAW):
+                self.detector.draw_overlay(frame, pose_result)
         
-        # Check if posture is bad
-        is_bad_posture = tilt_angle > threshold
+        with timed(timings, STAGE_FORM):
+            tilt_angle = pose_result.tilt_angle
+            
+            # Threshold is cached in memory (kept current via on_setting_changed)
+            threshold = self.tilt_threshold
+            
+            # Check if posture is bad
+            is_bad_posture = tilt_angle > threshold
+            
+            # Record the sample (buffered; written by the background writer)
+            if self.sample_writer and pose_result.has_pose:
+                self.sample_writer.log(tilt_angle, is_bad_posture)
+        
+        # Display threshold on frame
+        with timed(timings, STAGE_TEXT):
+            cv2.putText(frame, f'Threshold: {threshold:.1f}', (10, 30),
+                        cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 2)
+            cv2.putText(frame, f'Tilt: {tilt_angle:.1f}', (10, 60),
+                        cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 2)
+        if self.perf_overlay and timings:
+            draw_timings(frame, timings)
+        
+        return {
+            'frame': frame,
+            'tilt_angle': tilt_angle,
+            'is_bad_posture': is_bad_posture,
+        }
+    
+    def update_frame(self, result):
+        """Display a processed tracking frame (runs on the UI thread)."""
+        if not self.is_tracking:
+            return
+        
+        processed_frame = result['frame']
+        tilt_angle = result['tilt_angle']
         
         # Update UI
         self.ids.tilt_label.text = f'{tilt_angle:.1f}°'
         
-        if is_bad_posture:
+        if result['is_bad_posture']:
             self.ids.status_label.text = 'Bad Posture!'
             self.ids.status_label.color = CURRENT_THEME['bad']
             self.ids.tilt_label.color = CURRENT_THEME['bad']
@@ -351,17 +875,12 @@ class PostureTrackerApp(TabbedPanel):
             self.ids.status_label.color = CURRENT_THEME['good']
             self.ids.tilt_label.color = CURRENT_THEME['good']
         
-        # Display threshold on frame
-        cv2.putText(processed_frame, f'Threshold: {threshold:.1f}', (10, 30),
-                    cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 2)
-        cv2.putText(processed_frame, f'Tilt: {tilt_angle:.1f}', (10, 60),
-                    cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 2)
-        
-        # Convert to texture and display
-        buf = cv2.flip(processed_frame, 0).tobytes()
-        texture = Texture.create(size=(processed_frame.shape[1], processed_frame.shape[0]), colorfmt='bgr')
-        texture.blit_buffer(buf, colorfmt='bgr', bufferfmt='ubyte')
-        self.ids.camera_display.texture = texture
+        # Upload into the reused display texture
+        with timed(self.tracking_timings, STAGE_UPLOAD):
+            self.tracking_display.show(self.ids.camera_display, processed_frame)
+        if self.tracking_timings:
+            self.tracking_timings.frame_shown()
+        startup_trace.mark(startup_trace.FIRST_FRAME)
     
     def validate_threshold(self, value):
         """Validate and clamp threshold value to valid range (0-90 degrees)."""
@@ -389,6 +908,12 @@ class PostureTrackerApp(TabbedPanel):
             threshold = float(self.ids.threshold_input.text)
             threshold = self.validate_threshold(threshold)
             self.db.set_tilt_threshold(threshold)
+            
+            # Inference resolution (used from the next start of a camera)
+            if 'inference_resolution_spinner' in self.ids:
+                resolution = self.parse_inference_resolution(self.ids.inference_resolution_spinner.text)
+                self.db.set_inference_resolution(resolution)
+            
             self.ids.settings_status.text = f'Settings saved! Threshold: {threshold}°'
             self.ids.settings_status.color = CURRENT_THEME['good']
             Logger.info(f"Settings saved: threshold={threshold}")
@@ -401,8 +926,21 @@ class PostureTrackerApp(TabbedPanel):
             self.ids.settings_status.color = CURRENT_THEME['bad']
             Logger.error(f"Failed to save settings to database: {e}")
     
+    @staticmethod
+    def format_inference_resolution(height):
+        """Format an inference resolution for the settings spinner."""
+        return 'Native' if height == NATIVE_RESOLUTION else f'{height}p'
+    
+    @staticmethod
+    def parse_inference_resolution(text):
+        """Parse a settings spinner label into an inference resolution."""
+        if text == 'Native':
+            return NATIVE_RESOLUTION
+        return int(text.rstrip('p'))
+    
     def load_settings(self):
         """Load current settings into the settings tab."""
+        startup_trace.mark('load_settings')
         if not self.db:
             Logger.error("Cannot load settings: Database not initialized")
             return
@@ -432,6 +970,11 @@ class PostureTrackerApp(TabbedPanel):
                 theme = self.db.get_theme()
                 self.ids.theme_spinner.text = theme.capitalize()
             
+            # Load inference resolution
+            if 'inference_resolution_spinner' in self.ids:
+                resolution = self.db.get_inference_resolution()
+                self.ids.inference_resolution_spinner.text = self.format_inference_resolution(resolution)
+            
             if 'settings_status' in self.ids:
                 self.ids.settings_status.text = ''
         except Exception as e:
@@ -440,61 +983,61 @@ class PostureTrackerApp(TabbedPanel):
                 self.ids.settings_status.text = 'Error loading settings'
                 self.ids.settings_status.color = CURRENT_THEME['bad']
     
-    def detect_cameras(self, max_cameras=10):
+    def detect_cameras(self, max_cameras=DEFAULT_MAX_CAMERAS):
         """
         Detect available cameras and return information about them.
         
+        Devices are listed from video4linux where available and probed in
+        parallel; the result replaces the cached enumeration.
+        
         Args:
-            max_cameras: Maximum number of camera indices to check (default: 10).
-                        Most systems have 0-2 cameras, but checking up to 10 covers
-                        edge cases with multiple USB cameras or virtual cameras.
+            max_cameras: Number of camera indices to probe when the platform
+                        has no device listing (default: 10)
         
         Returns:
             List of dicts with camera info: [{'index': 0, 'name': 'Camera 0', 'available': True, 'info': '...'}]
         """
-        cameras = []
-        
-        for i in range(max_cameras):
-            cap = cv2.VideoCapture(i)
-            
-            if cap.isOpened():
-                # Try to get camera properties
-                width = cap.get(cv2.CAP_PROP_FRAME_WIDTH)
-                height = cap.get(cv2.CAP_PROP_FRAME_HEIGHT)
-                
-                # Try to read a frame to verify it's working
-                ret, frame = cap.read()
-                
-                camera_info = {
-                    'index': i,
-                    'name': f'Camera {i}',
-                    'available': ret,
-                    'info': f'{int(width)}x{int(height)}' if ret else 'Failed to read frame'
-                }
-                cameras.append(camera_info)
-                cap.release()
-            
+        cameras = self.camera_enumerator.enumerate(refresh=True, max_cameras=max_cameras)
+        self.detected_cameras = cameras
         return cameras
     
-    def refresh_camera_list(self):
-        """Refresh the camera list in the settings tab."""
+    def refresh_camera_list(self, rescan=True):
+        """
+        Refresh the camera list in the settings tab.
+        
+        Args:
+            rescan: Probe every device; otherwise show the last (or cached) scan
+        """
         if 'camera_list_container' not in self.ids:
             Logger.warning("camera_list_container not yet available")
             return
         
+        if not rescan:
+            if self.detected_cameras is not None:
+                self._update_camera_list()
+            else:
+                self.scan_cameras(self.set_camera_spinner_values)
+            return
+        
         if 'camera_scan_status' in self.ids:
             self.ids.camera_scan_status.text = 'Scanning...'
             self.ids.camera_scan_status.color = CURRENT_THEME['scanning']
         
-        # Run camera detection (this might take a moment)
-        Clock.schedule_once(lambda dt: self._update_camera_list(), 0.1)
+        # Probe every device off the UI thread, then redraw the list and spinner
+        self.scan_cameras(self.set_camera_spinner_values, refresh=True)
     
-    def _update_camera_list(self):
-        """Update the camera list UI with detected cameras."""
+    def _update_camera_list(self, cameras=None):
+        """
+        Update the camera list UI with detected cameras.
+        
+        Args:
+            cameras: Enumeration to show (default: the last scan)
+        """
         from kivy.metrics import dp, sp
         from kivy.graphics import Color, RoundedRectangle
 
-        cameras = self.detect_cameras()
+        if cameras is None:
+            cameras = self.detected_cameras or []
         
         # Clear existing camera list
         container = self.ids.camera_list_container
@@ -534,7 +1077,8 @@ class PostureTrackerApp(TabbedPanel):
                 is_default = '  ★' if cam['index'] == default_camera else ''
                 
                 info_label = Label(
-                    text=f"{status_icon} {cam['name']}{is_default}  —  {cam['info']}",
+                    text=f"{status_icon} {cam['name']}{is_default}  —  {cam['info']}"
+                         + (f"  ·  {cam['label']}" if cam.get('label') else ''),
                     size_hint_x=0.5,
                     color=status_color,
                     font_size=sp(13),
@@ -605,15 +1149,18 @@ class PostureTrackerApp(TabbedPanel):
             self.ids.camera_scan_status.text = f'Testing Camera {camera_index}...'
             self.ids.camera_scan_status.color = CURRENT_THEME['scanning']
         
-        cap = cv2.VideoCapture(camera_index)
+        profile = self.get_camera_profile(camera_index)
+        cap = open_capture(camera_index, profile)
         
         if cap.isOpened():
+            negotiated = self.report_camera_format(camera_index, profile, cap)
             ret, frame = cap.read()
             cap.release()
             
             if ret:
                 if 'camera_scan_status' in self.ids:
-                    self.ids.camera_scan_status.text = f'Camera {camera_index} test successful!'
+                    details = f' — {describe_format(negotiated)}' if negotiated else ''
+                    self.ids.camera_scan_status.text = f'Camera {camera_index} test successful!{details}'
                     self.ids.camera_scan_status.color = CURRENT_THEME['good']
                 Logger.info(f"Camera {camera_index} test successful")
             else:
@@ -757,26 +1304,43 @@ class PostureTrackerApp(TabbedPanel):
     
     def start_training(self):
         """Start training mode with camera."""
-        if not self.exercise_detector or not self.selected_exercise:
+        if not self.exercise_db or not self.selected_exercise:
             Logger.error("Cannot start training: No exercise selected")
             if 'training_feedback_label' in self.ids:
                 self.ids.training_feedback_label.text = 'Please select an exercise first'
             return
         
         if not self.is_training:
+            self.training_quality = self.create_quality_controller('training')
+            level = self.training_quality.current if self.training_quality else None
+            self.training_engine = self.acquire_pose_engine(
+                level.model_complexity if level else DEFAULT_MODEL_COMPLEXITY)
+            if not self.training_engine:
+                Logger.error("Cannot start training: PostureDetector not initialized")
+                if 'training_feedback_label' in self.ids:
+                    self.ids.training_feedback_label.text = 'Detector not available'
+                return
+            
             # Get selected camera index
             camera_index = self.get_selected_camera_index()
             
-            # Open camera
-            self.training_capture = cv2.VideoCapture(camera_index)
+            # Open camera with its capture profile; frames are read on a background thread
+            self.training_timings = FrameTimings('training')
+            self.training_capture = self.open_camera(camera_index, 'training', self.training_timings)
             
             if not self.training_capture.isOpened():
                 Logger.error(f"Failed to open camera {camera_index} for training")
+                self.training_capture.release()
+                self.training_capture = None
+                self.pose_engines.release(self.training_engine)
+                self.training_engine = None
                 return
             
+            self.training_capture.start()
             self.is_training = True
             
-            # Set exercise in detector
+            # Set exercise in detector (form checks run on the shared engine)
+            self.exercise_detector = ExerciseDetector(self.training_engine)
             self.exercise_detector.set_exercise(self.current_exercise_id)
             
             # Update UI
@@ -789,8 +1353,21 @@ class PostureTrackerApp(TabbedPanel):
             if 'category_filter_spinner' in self.ids:
                 self.ids.category_filter_spinner.disabled = True
             
-            # Schedule frame update
-            self.training_event = Clock.schedule_interval(self.update_training_frame, 1.0/30.0)
+            # Run inference and form checks off the UI thread
+            self.training_inference = self.create_inference_stage(self.training_engine, 'training', level)
+            self.training_level = level
+            self.training_overlay = level.overlay if level else True
+            self.show_quality_level('training', level)
+            self.training_pipeline = FramePipeline(
+                self.training_capture,
+                infer=self.training_inference,
+                analyze=self.analyze_training_frame,
+                on_result=self.update_training_frame,
+                dispatch=self.dispatch_to_ui,
+                name='training',
+                on_latency=self.record_training_latency,
+            ).start()
+            self.watch_dropped_frames(self.training_timings, self.training_capture, self.training_pipeline)
             Logger.info(f"Training started for {self.selected_exercise.name}")
     
     def stop_training(self):
@@ -798,19 +1375,38 @@ class PostureTrackerApp(TabbedPanel):
         if self.is_training:
             self.is_training = False
             
-            # Stop scheduled updates
-            if self.training_event:
-                self.training_event.cancel()
-                self.training_event = None
+            # Stop pipeline workers
+            if self.training_pipeline:
+                self.training_pipeline.stop()
+                self.training_pipeline = None
+            if self.training_inference:
+                Logger.info(f"Training inference: {self.training_inference.inferences} of "
+                            f"{self.training_inference.frames} frames inferred")
+                self.training_inference.close()
+                self.training_inference = None
+            if self.training_quality:
+                Logger.info(f"Training quality: {self.training_quality.current.name} "
+                            f"after {self.training_quality.changes} changes")
+                self.training_quality = None
+            self.training_level = None
+            self.show_quality_level('training', None)
+            self.log_frame_timings('Training', self.training_timings)
             
             # Release camera
             if self.training_capture:
+                Logger.info(f"Training capture: {self.training_capture.frames_captured} frames, "
+                            f"{self.training_capture.frames_dropped} dropped")
                 self.training_capture.release()
                 self.training_capture = None
             
+            # Hand back the shared pose engine
+            if self.training_engine:
+                self.pose_engines.release(self.training_engine)
+                self.training_engine = None
+            
             # Clear display
             if 'training_camera_display' in self.ids:
-                self.ids.training_camera_display.texture = None
+                self.training_display.clear(self.ids.training_camera_display)
             if 'training_feedback_label' in self.ids:
                 self.ids.training_feedback_label.text = 'Training stopped'
             
@@ -834,19 +1430,26 @@ class PostureTrackerApp(TabbedPanel):
                 self.ids.training_reps_label.text = '0'
             Logger.info("Training counter reset")
     
-    def update_training_frame(self, dt):
-        """Update training video frame with exercise detection."""
-        if not self.is_training or not self.training_capture or not self.exercise_detector:
-            return
-        
-        ret, frame = self.training_capture.read()
+    def analyze_training_frame(self, frame, pose_result):
+        """
+        Check exercise form and annotate the frame (runs on the analysis thread).
         
-        if not ret:
-            Logger.error("Failed to read training frame")
+        Returns:
+            Tuple of (processed_frame, feedback_dict)
+        """
+        timings = self.training_timings
+        result = self.exercise_detector.evaluate(frame, pose_result, self.current_exercise_id,
+                                                 overlay=self.training_overlay, timings=timings)
+        if self.perf_overlay and timings:
+            draw_timings(frame, timings)
+        return result
+    
+    def update_training_frame(self, result):
+        """Display a processed training frame (runs on the UI thread)."""
+        if not self.is_training:
             return
         
-        # Process frame for exercise detection
-        processed_frame, feedback = self.exercise_detector.process_frame(frame, self.current_exercise_id)
+        processed_frame, feedback = result
         
         # Update UI with feedback
         if 'training_reps_label' in self.ids:
@@ -854,13 +1457,13 @@ class PostureTrackerApp(TabbedPanel):
         if 'training_feedback_label' in self.ids:
             self.ids.training_feedback_label.text = feedback['feedback']
         
-        # Convert to texture and display
-        buf = cv2.flip(processed_frame, 0).tobytes()
-        texture = Texture.create(size=(processed_frame.shape[1], processed_frame.shape[0]), colorfmt='bgr')
-        texture.blit_buffer(buf, colorfmt='bgr', bufferfmt='ubyte')
-        
+        # Upload into the reused display texture
         if 'training_camera_display' in self.ids:
-            self.ids.training_camera_display.texture = texture
+            with timed(self.training_timings, STAGE_UPLOAD):
+                self.training_display.show(self.ids.training_camera_display, processed_frame)
+            if self.training_timings:
+                self.training_timings.frame_shown()
+            startup_trace.mark(startup_trace.FIRST_FRAME)
     
     def add_current_exercise_to_workout(self):
         """Add currently selected exercise to workout list."""
@@ -1008,6 +1611,7 @@ class MainApp(App):
     
     def build(self):
         """Build the application UI."""
+        startup_trace.begin('build')
         self.title = 'Posture Tracker'
         Window.size = (800, 600)
         Window.minimum_width = 480
@@ -1016,8 +1620,9 @@ class MainApp(App):
         self.root = PostureTrackerApp()
         # Load settings when app starts (give more time for widget initialization)
         Clock.schedule_once(lambda dt: self.root.load_settings(), 0.5)
-        # Populate camera list in settings tab
-        Clock.schedule_once(lambda dt: self.root.refresh_camera_list(), 1.0)
+        # Populate camera list in settings tab (from the cached enumeration)
+        Clock.schedule_once(lambda dt: self.root.refresh_camera_list(rescan=False), 1.0)
+        startup_trace.end('build')
         return self.root
     
     def start_tracking(self):
@@ -1068,15 +1673,38 @@ class MainApp(App):
         """Clear workout list."""
         self.root.clear_workout()
     
+    def on_start(self):
+        """Load the pose model once the window has been drawn."""
+        startup_trace.mark('on_start')
+        # Lets bench_startup.py end a run once its target phase is reached
+        startup_trace.set_exit_handler(lambda: Clock.schedule_once(lambda dt: self.stop()))
+        Window.bind(on_flip=self._on_first_flip)
+        Window.bind(on_key_down=self._on_key_down)
+    
+    def _on_key_down(self, window, key, *args):
+        """Toggle the frame timing overlay with F12."""
+        if key == PERF_OVERLAY_KEY:
+            self.root.toggle_perf_overlay()
+            return True
+        return False
+    
+    def _on_first_flip(self, *args):
+        """Start the background model warm-up after the first paint."""
+        Window.unbind(on_flip=self._on_first_flip)
+        startup_trace.mark('first_paint')
+        self.root.warm_up_pose_engine()
+    
     def on_stop(self):
         """Clean up when app is closing."""
         if self.root:
             self.root.stop_tracking()
             self.root.stop_training()
-            if self.root.detector:
-                self.root.detector.release()
-            if self.root.exercise_detector:
-                self.root.exercise_detector.release()
+            if self.root.preloaded_engine:
+                self.root.pose_engines.release(self.root.preloaded_engine)
+                self.root.preloaded_engine = None
+            self.root.pose_engines.shutdown()
+            if self.root.db:
+                self.root.db.close()
         return True
 
 
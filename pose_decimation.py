@@ -0,0 +1,187 @@
+"""
+Inference decimation with landmark extrapolation.
+Pose inference runs on every Nth frame on a worker thread; frames in
+between get landmarks extrapolated from the two most recent inference
+results, so overlay and analysis still update at the capture rate.
+"""
+
+import logging
+import math
+import threading
+import time
+
+from posture_detector import PoseResult
+
+
+logger = logging.getLogger(__name__)
+
+# Decimation settings: 0 adjusts N from measured timings, 1 infers every frame
+DECIMATION_AUTO = 0
+MAX_DECIMATION = 8
+
+# Longest time landmarks are extrapolated past the newest inference;
+# beyond it the pose is held instead of drifting
+MAX_EXTRAPOLATION = 0.25  # seconds
+
+# Weight of the newest measurement in the timing averages
+TIMING_SMOOTHING = 0.2
+
+
+class DecimatedPoseInference:
+    """Callable inference stage that runs pose inference on every Nth frame."""
+    
+    def __init__(self, engine, infer=None, decimation=DECIMATION_AUTO, name='pose', min_decimation=1):
+        """
+        Initialize the stage.
+        
+        Args:
+            engine: PostureDetector used to derive shoulder data for estimates
+            infer: Callable(frame) -> PoseResult (default: engine.detect)
+            decimation: Run inference every N frames (1 = every frame,
+                        DECIMATION_AUTO = adjust N from measured timings)
+            name: Name of the inference worker thread
+            min_decimation: Lowest N the automatic mode may choose
+        """
+        if not 0 <= decimation <= MAX_DECIMATION:
+            raise ValueError(f"Decimation must be between 0 and {MAX_DECIMATION}")
+        self.engine = engine
+        self.infer = infer if infer is not None else engine.detect
+        self.pinned = decimation
+        self.min_decimation = max(1, min(min_decimation, MAX_DECIMATION))
+        self.name = name
+        # Frames handled on every path, and how many of them ran inference
+        self.frames = 0
+        self.inferences = 0
+        self.inference_time = 0.0
+        self.frame_interval = 0.0
+        self._history = []  # up to two (timestamp, PoseResult), oldest first
+        self._frames_since_submit = 0
+        self._last_frame_time = None
+        self._pending = None
+        self._busy = False
+        self._lock = threading.Lock()
+        self._work = threading.Condition(self._lock)
+        self._running = False
+        self._closed = False
+        self._thread = None
+    
+    @property
+    def decimation(self):
+        """Current N: inference runs on every Nth frame."""
+        if self.pinned != DECIMATION_AUTO:
+            return self.pinned
+        if self.frame_interval <= 0 or self.inference_time <= 0:
+            return self.min_decimation
+        return max(self.min_decimation, min(MAX_DECIMATION, math.ceil(self.inference_time / self.frame_interval)))
+    
+    def __call__(self, frame):
+        """
+        Get a pose result for a frame (runs on the pipeline's inference thread).
+        
+        Args:
+            frame: BGR video frame
+        
+        Returns:
+            PoseResult, either inferred or extrapolated
+        """
+        self.frames += 1
+        if self.pinned == 1:
+            # No decimation: infer every frame synchronously
+            self.inferences += 1
+            return self.infer(frame)
+        
+        now = time.monotonic()
+        if self._last_frame_time is not None:
+            self._update_average('frame_interval', now - self._last_frame_time)
+        self._last_frame_time = now
+        
+        self._start_worker()
+        self._frames_since_submit += 1
+        with self._lock:
+            if self._frames_since_submit >= self.decimation and not self._busy:
+                self._pending = (now, frame.copy())
+                self._busy = True
+                self._frames_since_submit = 0
+                self._work.notify()
+            history = list(self._history)
+        
+        h, w = frame.shape[:2]
+        return self._estimate(history, now, w, h)
+    
+    def close(self):
+        """Stop the inference worker (frames still in flight get no pose)."""
+        with self._lock:
+            self._closed = True
+            self._running = False
+            self._pending = None
+            self._work.notify()
+        if self._thread is not None:
+            self._thread.join(timeout=2.0)
+            self._thread = None
+        with self._lock:
+            self._history = []
+            self._busy = False
+    
+    def _start_worker(self):
+        """Start the inference worker on first use."""
+        if self._running or self._closed:
+            return
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name=f'{self.name}-keyframes', daemon=True)
+        self._thread.start()
+    
+    def _run(self):
+        """Worker loop: run inference on submitted keyframes."""
+        while True:
+            with self._lock:
+                while self._running and self._pending is None:
+                    self._work.wait()
+                if not self._running:
+                    return
+                timestamp, frame = self._pending
+                self._pending = None
+            
+            started = time.monotonic()
+            try:
+                result = self.infer(frame)
+            except Exception as e:
+                logger.error(f"{self.name}: inference failed: {e}")
+                result = None
+            self._update_average('inference_time', time.monotonic() - started)
+            
+            with self._lock:
+                if result is not None:
+                    self.inferences += 1
+                    self._history = (self._history + [(timestamp, result)])[-2:]
+                self._busy = False
+    
+    def _update_average(self, attribute, value):
+        """Update a timing average with a new measurement."""
+        average = getattr(self, attribute)
+        setattr(self, attribute, value if average <= 0 else
+                average + TIMING_SMOOTHING * (value - average))
+    
+    def _estimate(self, history, timestamp, width, height):
+        """Extrapolate a pose result for a frame from recent inference results."""
+        if not history or not history[-1][1].has_pose:
+            return PoseResult(None, width, height)
+        
+        t1, latest = history[-1]
+        points = latest.points
+        if len(history) == 2 and history[0][1].has_pose:
+            t0, previous = history[0]
+            if t1 > t0:
+                # Linear extrapolation, limited to a short horizon
+                elapsed = min(timestamp - t1, MAX_EXTRAPOLATION)
+                points = points + (points - previous.points) * (elapsed / (t1 - t0))
+        
+        landmarks = None
+        if latest.landmarks is not None:
+            # Private copy for drawing; the keyframe result stays untouched
+            landmarks = type(latest.landmarks)()
+            landmarks.CopyFrom(latest.landmarks)
+        result = PoseResult(landmarks, width, height, points=points)
+        if landmarks is not None:
+            result.set_points(points)
+        self.engine.update_shoulders(result)
+        return result
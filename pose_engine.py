@@ -0,0 +1,150 @@
+"""
+Shared pose engine registry.
+Hands out lazily created PostureDetector instances with reference counting,
+so the Camera and Training tabs share one MediaPipe graph. Engines that are
+no longer referenced are closed after an idle timeout.
+"""
+
+import threading
+
+
+# Seconds an unreferenced engine stays loaded before it is closed
+DEFAULT_IDLE_TIMEOUT = 60.0
+
+
+class PoseEngineRegistry:
+    """Reference-counted registry of shared pose engines."""
+    
+    def __init__(self, factory, idle_timeout=DEFAULT_IDLE_TIMEOUT):
+        """
+        Initialize the registry.
+        
+        Args:
+            factory: Callable(**options) creating an engine (e.g. PostureDetector)
+            idle_timeout: Seconds before an unreferenced engine is released
+                          (0 releases immediately)
+        """
+        self.factory = factory
+        self.idle_timeout = idle_timeout
+        self._entries = {}
+        # Engines being built: key -> {'done': Event, 'error': exception or None}
+        self._pending = {}
+        self._lock = threading.Lock()
+    
+    @staticmethod
+    def _key(options):
+        """Build a hashable registry key from engine options."""
+        return tuple(sorted(options.items()))
+    
+    def acquire(self, **options):
+        """
+        Get a shared engine, creating it on first use.
+        
+        The engine is built outside the registry lock, so releasing or
+        acquiring other engines never waits for a model to load; concurrent
+        callers asking for the same options wait for the one build.
+        
+        Args:
+            **options: Options passed to the factory; engines are shared per
+                       distinct set of options
+        
+        Returns:
+            Engine instance (must be handed back with release())
+        """
+        key = self._key(options)
+        while True:
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is not None:
+                    if entry['timer'] is not None:
+                        entry['timer'].cancel()
+                        entry['timer'] = None
+                    entry['refs'] += 1
+                    return entry['engine']
+                pending = self._pending.get(key)
+                building = pending is None
+                if building:
+                    pending = {'done': threading.Event(), 'error': None}
+                    self._pending[key] = pending
+            if building:
+                return self._build(key, options, pending)
+            # Another caller is building this engine: wait, then take a reference
+            pending['done'].wait()
+            if pending['error'] is not None:
+                raise pending['error']
+    
+    def _build(self, key, options, pending):
+        """Build an engine without the lock held and register it with one reference."""
+        try:
+            engine = self.factory(**options)
+        except BaseException as e:
+            with self._lock:
+                self._pending.pop(key, None)
+                pending['error'] = e
+                pending['done'].set()
+            raise
+        with self._lock:
+            self._entries[key] = {'engine': engine, 'refs': 1, 'timer': None}
+            self._pending.pop(key, None)
+            pending['done'].set()
+        return engine
+    
+    def release(self, engine):
+        """
+        Hand back an engine obtained from acquire().
+        
+        The engine is closed once it has been unreferenced for idle_timeout.
+        """
+        with self._lock:
+            key = self._find(engine)
+            if key is None:
+                return
+            entry = self._entries[key]
+            entry['refs'] = max(entry['refs'] - 1, 0)
+            if entry['refs'] > 0:
+                return
+            if self.idle_timeout <= 0:
+                self._close(key)
+                return
+            timer = threading.Timer(self.idle_timeout, self._release_idle, args=(key, engine))
+            timer.daemon = True
+            entry['timer'] = timer
+            timer.start()
+    
+    def refcount(self, engine):
+        """Get the number of outstanding references to an engine."""
+        with self._lock:
+            key = self._find(engine)
+            return self._entries[key]['refs'] if key is not None else 0
+    
+    def is_loaded(self, **options):
+        """Check whether an engine for the given options is currently loaded."""
+        with self._lock:
+            return self._key(options) in self._entries
+    
+    def shutdown(self):
+        """Close all engines regardless of outstanding references."""
+        with self._lock:
+            for key in list(self._entries):
+                self._close(key)
+    
+    def _find(self, engine):
+        """Find the registry key of an engine (caller holds the lock)."""
+        for key, entry in self._entries.items():
+            if entry['engine'] is engine:
+                return key
+        return None
+    
+    def _release_idle(self, key, engine):
+        """Idle timer callback: close the engine if still unreferenced."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry['engine'] is engine and entry['refs'] == 0:
+                self._close(key)
+    
+    def _close(self, key):
+        """Close and forget an engine (caller holds the lock)."""
+        entry = self._entries.pop(key)
+        if entry['timer'] is not None:
+            entry['timer'].cancel()
+        entry['engine'].release()
@@ -5,10 +5,13 @@ import os
 import sys
 import warnings
 import time
+import threading
 from contextlib import contextmanager
+from frame_timing import timed, STAGE_CONVERT, STAGE_INFERENCE
 
 # Suppress TensorFlow/MediaPipe warnings
 os.environ['TF_CPP_MIN_LOG_LEVEL'] = '3'
+os.environ.setdefault('GLOG_minloglevel', '2')
 os.environ['OPENCV_LOG_LEVEL'] = 'ERROR'
 os.environ['OPENCV_VIDEOIO_DEBUG'] = '0'
 warnings.filterwarnings('ignore', category=UserWarning, module='google.protobuf')
@@ -24,7 +27,18 @@ except AttributeError:
 
 @contextmanager
 def suppress_stderr():
-    """Context manager to suppress stderr output (for C++ library warnings)."""
+    """
+    Context manager to suppress stderr output (for C++ library warnings).
+    
+    The redirection swaps file descriptor 2 for the whole process, so it is
+    only done on the main thread: off the main thread (e.g. while the model
+    loads in the background) the UI keeps its console log and tracebacks,
+    and TF_CPP_MIN_LOG_LEVEL/absl logging keep the libraries quiet instead.
+    """
+    if threading.current_thread() is not threading.main_thread():
+        yield
+        return
+    
     # Check if stderr has a file descriptor (may not be available in some environments)
     try:
         stderr_fd = sys.stderr.fileno()
@@ -54,22 +68,147 @@ def suppress_stderr():
             os.close(devnull_fd)
 
 
-# Import MediaPipe with suppressed stderr to avoid initialization warnings
-with suppress_stderr():
-    import mediapipe as mp
+def _quiet_absl():
+    """Limit absl logging (used by MediaPipe) to errors."""
+    try:
+        from absl import logging as absl_logging
+    except ImportError:
+        return
+    absl_logging.set_verbosity(absl_logging.ERROR)
+    absl_logging.set_stderrthreshold('error')
+
+
+# MediaPipe (and TensorFlow Lite) load on first use, not at import time
+_mediapipe = None
+_mediapipe_lock = threading.Lock()
+
+
+def load_mediapipe():
+    """
+    Import MediaPipe on first use (with suppressed stderr to avoid
+    initialization warnings).
+    
+    Returns:
+        The mediapipe module
+    """
+    global _mediapipe
+    with _mediapipe_lock:
+        if _mediapipe is None:
+            with suppress_stderr():
+                import mediapipe
+                _quiet_absl()
+            _mediapipe = mediapipe
+        return _mediapipe
+
+
+# MediaPipe Pose landmark IDs (fixed 33-point topology)
+NUM_LANDMARKS = 33
+NOSE = 0
+LEFT_SHOULDER = 11
+RIGHT_SHOULDER = 12
+LEFT_ELBOW = 13
+RIGHT_ELBOW = 14
+LEFT_WRIST = 15
+RIGHT_WRIST = 16
+LEFT_HIP = 23
+RIGHT_HIP = 24
+LEFT_KNEE = 25
+RIGHT_KNEE = 26
+LEFT_ANKLE = 27
+RIGHT_ANKLE = 28
+
+# Columns of the landmark array
+X, Y, Z, VISIBILITY = 0, 1, 2, 3
+
+# Side of the blank image used to warm up a new graph
+WARM_UP_SIZE = 256
+
+
+def landmarks_to_array(landmarks):
+    """
+    Convert MediaPipe pose landmarks to a (33, 4) float32 array.
+    
+    Args:
+        landmarks: MediaPipe NormalizedLandmarkList
+    
+    Returns:
+        Array of normalized (x, y, z, visibility) rows indexed by landmark ID
+    """
+    return np.array([(lm.x, lm.y, lm.z, lm.visibility) for lm in landmarks.landmark],
+                    dtype=np.float32)
+
+
+class PoseResult:
+    """Result of a single pose inference on one frame."""
+    
+    def __init__(self, landmarks, width, height, points=None):
+        """
+        Initialize a pose result.
+        
+        Args:
+            landmarks: MediaPipe pose landmarks (None if no pose detected)
+            width, height: Dimensions of the analyzed frame
+            points: Optional precomputed (33, 4) landmark array; converted
+                    from landmarks when omitted
+        """
+        self.landmarks = landmarks
+        self.width = width
+        self.height = height
+        self.left_shoulder = None
+        self.right_shoulder = None
+        self.tilt_angle = 0
+        
+        # Landmarks converted once per frame: normalized (33, 4) array and
+        # (33, 2) pixel coordinates, both indexed by landmark ID
+        if points is None and landmarks is not None:
+            points = landmarks_to_array(landmarks)
+        self.points = points
+        self.pixels = None
+        if points is not None:
+            self.pixels = points[:, :2] * np.array([width, height], dtype=np.float32)
+    
+    def set_points(self, points):
+        """
+        Replace the landmark array (e.g. with smoothed values).
+        
+        Pixel coordinates are recomputed and the MediaPipe landmarks are
+        updated in place so the drawn skeleton matches the array.
+        
+        Args:
+            points: (33, 4) landmark array
+        """
+        self.points = points
+        self.pixels = points[:, :2] * np.array([self.width, self.height], dtype=np.float32)
+        if self.landmarks is not None:
+            for lm, (x, y, z, visibility) in zip(self.landmarks.landmark, points.tolist()):
+                lm.x, lm.y, lm.z, lm.visibility = x, y, z, visibility
+    
+    @property
+    def has_pose(self):
+        """Whether a pose was detected in the frame."""
+        return self.points is not None
 
 
 class PostureDetector:
     """Posture detection using MediaPipe Pose."""
     
-    def __init__(self):
-        """Initialize MediaPipe Pose solution."""
+    def __init__(self, model_complexity=1):
+        """
+        Initialize MediaPipe Pose solution.
+        
+        Args:
+            model_complexity: Pose landmark model (0 = lite, 1 = full, 2 = heavy);
+                              lite and heavy models are downloaded on first use
+        """
+        self.model_complexity = model_complexity
+        mp = load_mediapipe()
         self.mp_pose = mp.solutions.pose
         self.mp_drawing = mp.solutions.drawing_utils
         self.mp_drawing_styles = mp.solutions.drawing_styles
         # Initialize Pose with suppressed stderr to avoid absl warnings
         with suppress_stderr():
             self.pose = self.mp_pose.Pose(
+                model_complexity=model_complexity,
                 min_detection_confidence=0.5,
                 min_tracking_confidence=0.5
             )
@@ -77,6 +216,8 @@ class PostureDetector:
             # initialization to be written to the suppressed stderr before restoring.
             # This is necessary because warnings are generated by background threads.
             time.sleep(0.1)
+        # The graph may be shared between pipelines; inference is serialized
+        self._lock = threading.Lock()
     
     def calculate_tilt(self, left_shoulder, right_shoulder):
         """Calculate shoulder tilt angle."""
@@ -90,6 +231,142 @@ class PostureDetector:
         angle = math.degrees(math.atan2(y_diff, x_diff))
         return abs(angle)
     
+    def detect(self, frame, roi_tracker=None, inference_input=None, timings=None):
+        """
+        Run pose inference once on a frame.
+        
+        Args:
+            frame: BGR video frame
+            roi_tracker: Optional RoiTracker; inference then runs on a crop
+                         around the previous landmarks and falls back to the
+                         full frame when the pose is lost
+            inference_input: Optional InferenceInput scaling the image down to
+                             the inference resolution; landmarks are
+                             normalized, so they still map onto the full frame
+            timings: Optional FrameTimings recording the color conversion
+                     and pose.process stages
+            
+        Returns:
+            PoseResult with full-frame landmarks and derived shoulder data
+        """
+        h, w, c = frame.shape
+        if roi_tracker is None:
+            landmarks = self._process(frame, inference_input, timings)
+            result = PoseResult(landmarks, w, h)
+        else:
+            image, region = roi_tracker.crop(frame)
+            landmarks = self._process(image, inference_input, timings)
+            if landmarks is None and region is not None:
+                # Lost inside the crop: retry on the full frame right away
+                roi_tracker.reset()
+                roi_tracker.fallbacks += 1
+                region = None
+                landmarks = self._process(frame, inference_input, timings)
+            
+            result = PoseResult(landmarks, w, h)
+            if region is not None:
+                result.set_points(roi_tracker.to_frame(result.points, region, w, h))
+            roi_tracker.update(result.points, w, h)
+        
+        self.update_shoulders(result)
+        return result
+    
+    def _process(self, image, inference_input=None, timings=None):
+        """Run the MediaPipe graph on a BGR image and return its landmarks."""
+        with timed(timings, STAGE_CONVERT):
+            if inference_input is not None:
+                # Downscale and convert to RGB into reused buffers
+                rgb_image = inference_input.prepare(image)
+            else:
+                # Convert BGR to RGB
+                rgb_image = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+        
+        # Process the frame (timed inside the lock: waiting for the other tab is not inference)
+        with self._lock:
+            with timed(timings, STAGE_INFERENCE):
+                results = self.pose.process(rgb_image)
+        return results.pose_landmarks
+    
+    def smooth(self, result, landmark_filter, timestamp=None):
+        """
+        Apply a temporal landmark filter to a pose result in place.
+        
+        Args:
+            result: PoseResult from detect()
+            landmark_filter: Filter from landmark_filter.create_landmark_filter
+                             (None leaves the result unchanged)
+            timestamp: Frame time in seconds (default: now, monotonic)
+        
+        Returns:
+            The same PoseResult with smoothed landmarks and shoulder data
+        """
+        if landmark_filter is None:
+            return result
+        if not result.has_pose:
+            # Start fresh when the pose is found again instead of gliding
+            landmark_filter.reset()
+            return result
+        if timestamp is None:
+            timestamp = time.monotonic()
+        result.set_points(landmark_filter.filter(result.points, timestamp))
+        self.update_shoulders(result)
+        return result
+    
+    def update_shoulders(self, result):
+        """Derive shoulder positions and tilt from a result's landmark array."""
+        if not result.has_pose:
+            return
+        
+        # Get shoulder positions (integer pixels for drawing)
+        left_x, left_y = result.pixels[LEFT_SHOULDER]
+        result.left_shoulder = (int(left_x), int(left_y))
+        
+        right_x, right_y = result.pixels[RIGHT_SHOULDER]
+        result.right_shoulder = (int(right_x), int(right_y))
+        
+        # Calculate tilt angle
+        result.tilt_angle = self.calculate_tilt(result.left_shoulder, result.right_shoulder)
+    
+    def draw_overlay(self, frame, result):
+        """
+        Draw pose landmarks and the shoulder line onto a frame in place.
+        
+        Args:
+            frame: BGR video frame to draw on
+            result: PoseResult from detect()
+        """
+        if not result.has_pose:
+            return
+        
+        # Draw pose landmarks on the frame
+        self.mp_drawing.draw_landmarks(
+            frame,
+            result.landmarks,
+            self.mp_pose.POSE_CONNECTIONS,
+            landmark_drawing_spec=self.mp_drawing_styles.get_default_pose_landmarks_style()
+        )
+        
+        # Draw line between shoulders
+        cv2.line(frame, result.left_shoulder, result.right_shoulder, (0, 255, 0), 2)
+        
+        # Draw shoulder points
+        cv2.circle(frame, result.left_shoulder, 5, (0, 0, 255), -1)
+        cv2.circle(frame, result.right_shoulder, 5, (0, 0, 255), -1)
+    
+    def analyze(self, frame):
+        """
+        Run pose inference once on a frame and draw the posture overlay.
+        
+        Args:
+            frame: BGR video frame (landmarks are drawn onto it in place)
+        
+        Returns:
+            PoseResult with raw landmarks and derived shoulder data
+        """
+        result = self.detect(frame)
+        self.draw_overlay(frame, result)
+        return result
+    
     def process_frame(self, frame):
         """
         Process a video frame for posture detection.
@@ -97,50 +374,26 @@ class PostureDetector:
         Returns:
             processed_frame: Frame with pose landmarks drawn
             tilt_angle: Shoulder tilt angle in degrees
-            is_bad_posture: Boolean indicating if posture is bad
+            left_shoulder: Left shoulder pixel coordinates (or None)
+            right_shoulder: Right shoulder pixel coordinates (or None)
         """
-        # Convert BGR to RGB
-        rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        
-        # Process the frame
-        results = self.pose.process(rgb_frame)
-        
-        tilt_angle = 0
-        left_shoulder = None
-        right_shoulder = None
+        result = self.analyze(frame)
+        return frame, result.tilt_angle, result.left_shoulder, result.right_shoulder
+    
+    def warm_up(self):
+        """
+        Run one inference on a blank image.
         
-        if results.pose_landmarks:
-            # Draw pose landmarks on the frame
-            self.mp_drawing.draw_landmarks(
-                frame,
-                results.pose_landmarks,
-                self.mp_pose.POSE_CONNECTIONS,
-                landmark_drawing_spec=self.mp_drawing_styles.get_default_pose_landmarks_style()
-            )
-            
-            # Get shoulder positions
-            landmarks = results.pose_landmarks.landmark
-            h, w, c = frame.shape
-            
-            # Left shoulder (landmark 11)
-            left_shoulder_lm = landmarks[self.mp_pose.PoseLandmark.LEFT_SHOULDER.value]
-            left_shoulder = (int(left_shoulder_lm.x * w), int(left_shoulder_lm.y * h))
-            
-            # Right shoulder (landmark 12)
-            right_shoulder_lm = landmarks[self.mp_pose.PoseLandmark.RIGHT_SHOULDER.value]
-            right_shoulder = (int(right_shoulder_lm.x * w), int(right_shoulder_lm.y * h))
-            
-            # Calculate tilt angle
-            tilt_angle = self.calculate_tilt(left_shoulder, right_shoulder)
-            
-            # Draw line between shoulders
-            cv2.line(frame, left_shoulder, right_shoulder, (0, 255, 0), 2)
-            
-            # Draw shoulder points
-            cv2.circle(frame, left_shoulder, 5, (0, 0, 255), -1)
-            cv2.circle(frame, right_shoulder, 5, (0, 0, 255), -1)
+        The first call on a new graph pays for TensorFlow Lite delegate and
+        buffer setup; warming up moves that cost off the first real frame.
         
-        return frame, tilt_angle, left_shoulder, right_shoulder
+        Returns:
+            Seconds the warm-up inference took
+        """
+        blank = np.zeros((WARM_UP_SIZE, WARM_UP_SIZE, 3), dtype=np.uint8)
+        started = time.perf_counter()
+        self._process(blank)
+        return time.perf_counter() - started
     
     def release(self):
         """Release MediaPipe resources."""
@@ -0,0 +1,139 @@
+"""
+Batched posture time-series logging.
+Tilt samples are buffered in memory and written to the posture_samples table
+by a background thread, one executemany transaction per batch.
+"""
+
+import logging
+import threading
+import time
+
+
+logger = logging.getLogger(__name__)
+
+# Flush when either limit is reached
+DEFAULT_FLUSH_INTERVAL = 5.0  # seconds
+DEFAULT_MAX_BATCH = 300  # samples (10 s at 30 Hz)
+# Samples kept for retry while writes fail; the oldest are dropped beyond it
+DEFAULT_MAX_PENDING = 3000  # samples (100 s at 30 Hz)
+
+# Longest gap a single sample may account for; longer gaps (pose lost,
+# tracking paused) count as untracked time
+MAX_SAMPLE_DURATION = 1.0  # seconds
+
+
+class PostureSampleWriter:
+    """Buffers posture samples and flushes them from a background thread."""
+    
+    def __init__(self, db, flush_interval=DEFAULT_FLUSH_INTERVAL, max_batch=DEFAULT_MAX_BATCH,
+                 max_pending=DEFAULT_MAX_PENDING):
+        """
+        Initialize the writer.
+        
+        Args:
+            db: SettingsDatabase the samples are written to
+            flush_interval: Maximum seconds a sample waits in the buffer
+            max_batch: Buffered sample count that triggers an early flush
+            max_pending: Most samples kept for retry while writes fail
+        """
+        self.db = db
+        self.flush_interval = flush_interval
+        self.max_batch = max_batch
+        self.max_pending = max_pending
+        self.samples_written = 0
+        self.samples_dropped = 0
+        self.flush_count = 0
+        self._buffer = []
+        self._retry_at = 0.0
+        self._last_timestamp = None
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._running = False
+        self._thread = None
+    
+    @property
+    def pending(self):
+        """Number of samples waiting to be written."""
+        with self._lock:
+            return len(self._buffer)
+    
+    def log(self, tilt_angle, is_bad_posture, timestamp=None):
+        """
+        Buffer one posture sample (cheap; never touches the database).
+        
+        Args:
+            tilt_angle: Shoulder tilt in degrees
+            is_bad_posture: Whether the tilt exceeded the threshold
+            timestamp: Unix time of the sample (default: now)
+        """
+        if timestamp is None:
+            timestamp = time.time()
+        with self._lock:
+            # Each sample accounts for the time since the previous one
+            if self._last_timestamp is None:
+                duration = 0.0
+            else:
+                duration = min(max(timestamp - self._last_timestamp, 0.0), MAX_SAMPLE_DURATION)
+            self._last_timestamp = timestamp
+            self._buffer.append((timestamp, float(tilt_angle), 1 if is_bad_posture else 0, duration))
+            # After a failed write, wait out the interval instead of retrying per sample
+            full = len(self._buffer) >= self.max_batch and time.monotonic() >= self._retry_at
+        if full:
+            self._wakeup.set()
+    
+    def start(self):
+        """Start the background writer thread."""
+        if self._running:
+            return self
+        self._running = True
+        self._last_timestamp = None
+        self._wakeup.clear()
+        self._thread = threading.Thread(target=self._run, name='posture-writer', daemon=True)
+        self._thread.start()
+        return self
+    
+    def stop(self):
+        """Stop the writer thread and flush any remaining samples."""
+        if self._running:
+            self._running = False
+            self._wakeup.set()
+            self._thread.join(timeout=5.0)
+            self._thread = None
+        self.flush()
+    
+    def flush(self):
+        """
+        Write all buffered samples in a single transaction.
+        
+        If the write fails (e.g. the database is locked), the batch goes back
+        to the front of the buffer and is retried on the next flush.
+        
+        Returns:
+            Number of samples written
+        """
+        with self._lock:
+            batch, self._buffer = self._buffer, []
+        if not batch:
+            return 0
+        try:
+            self.db.add_posture_samples(batch)
+        except Exception as e:
+            with self._lock:
+                self._buffer = batch + self._buffer
+                dropped = max(len(self._buffer) - self.max_pending, 0)
+                del self._buffer[:dropped]
+                self.samples_dropped += dropped
+                self._retry_at = time.monotonic() + self.flush_interval
+            logger.error(f"Failed to write {len(batch)} posture samples, will retry"
+                         + (f" ({dropped} oldest dropped)" if dropped else '') + f": {e}")
+            return 0
+        self.samples_written += len(batch)
+        self.flush_count += 1
+        return len(batch)
+    
+    def _run(self):
+        """Writer loop: flush on interval or when the batch is full."""
+        while self._running:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            self.flush()
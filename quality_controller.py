@@ -0,0 +1,188 @@
+"""
+Adaptive quality control.
+Watches per-frame processing time against a latency budget and steps a
+stream down a quality ladder (model complexity, inference resolution,
+decimation, landmark overlay) when it overruns, and back up with
+hysteresis when headroom returns.
+"""
+
+import threading
+
+
+# Per-frame latency budget (one frame at 30 fps)
+DEFAULT_FRAME_BUDGET = 1.0 / 30
+
+# Step down after this many consecutive frames over budget
+DOWN_AFTER_FRAMES = 15
+# Step up after this many consecutive frames under UP_HEADROOM * budget
+UP_AFTER_FRAMES = 90
+UP_HEADROOM = 0.6
+
+# Weight of the newest frame in the smoothed load
+LOAD_SMOOTHING = 0.1
+
+
+class QualityLevel:
+    """One rung of the quality ladder."""
+    
+    def __init__(self, name, model_complexity, max_resolution, decimation, overlay):
+        """
+        Initialize a quality level.
+        
+        Args:
+            name: Label shown in the UI
+            model_complexity: MediaPipe Pose model complexity (0, 1 or 2)
+            max_resolution: Cap on the inference height (None = no cap)
+            decimation: Minimum inference decimation N
+            overlay: Whether landmarks are drawn on the frame
+        """
+        self.name = name
+        self.model_complexity = model_complexity
+        self.max_resolution = max_resolution
+        self.decimation = decimation
+        self.overlay = overlay
+    
+    def resolution(self, configured):
+        """
+        Effective inference height for a configured one (0 = native).
+        
+        Args:
+            configured: Inference resolution from the settings
+        """
+        if self.max_resolution is None:
+            return configured
+        if configured == 0:
+            return self.max_resolution
+        return min(configured, self.max_resolution)
+
+
+# Highest quality first
+QUALITY_LEVELS = (
+    QualityLevel('High', 2, None, 1, True),
+    QualityLevel('Balanced', 1, None, 1, True),
+    QualityLevel('Fast', 0, None, 1, True),
+    QualityLevel('Fast 360p', 0, 360, 1, True),
+    QualityLevel('Fast 240p', 0, 240, 1, True),
+    QualityLevel('Fast 240p ½', 0, 240, 2, True),
+    QualityLevel('Fast 240p ⅓', 0, 240, 3, True),
+    QualityLevel('Minimal', 0, 240, 3, False),
+)
+# MediaPipe's default model complexity
+DEFAULT_LEVEL = 1
+
+
+class QualityController:
+    """Chooses a quality level from measured per-frame load."""
+    
+    def __init__(self, budget=DEFAULT_FRAME_BUDGET, levels=QUALITY_LEVELS,
+                 level=DEFAULT_LEVEL, on_change=None):
+        """
+        Initialize the controller.
+        
+        Args:
+            budget: Per-frame latency budget in seconds
+            levels: Quality ladder, highest quality first
+            level: Starting level index
+            on_change: Callable(level_index) called when the level changes
+                       (runs on the thread calling record())
+        """
+        self.budget = budget
+        self.levels = levels
+        self.level = level
+        self.on_change = on_change
+        self.load = None
+        self.changes = 0
+        self._unavailable = set()
+        self._over = 0
+        self._under = 0
+        self._lock = threading.Lock()
+    
+    @property
+    def current(self):
+        """The active QualityLevel."""
+        return self.levels[self.level]
+    
+    def record(self, latency, inference_time=0.0, decimation=1):
+        """
+        Record one processed frame.
+        
+        Args:
+            latency: Seconds from reading the frame to finishing its analysis
+            inference_time: Seconds per pose inference (when it runs off the
+                            frame path, e.g. on decimated keyframes)
+            decimation: Frames per inference
+        
+        Returns:
+            New level index if the level changed, else None
+        """
+        frame_load = max(latency, inference_time / max(decimation, 1))
+        with self._lock:
+            if self.load is None:
+                self.load = frame_load
+            else:
+                self.load += LOAD_SMOOTHING * (frame_load - self.load)
+            
+            if self.load > self.budget:
+                self._over += 1
+                self._under = 0
+            elif self.load < self.budget * UP_HEADROOM:
+                self._under += 1
+                self._over = 0
+            else:
+                # Inside the hysteresis band: hold the level
+                self._over = 0
+                self._under = 0
+            
+            new_level = None
+            if self._over >= DOWN_AFTER_FRAMES:
+                new_level = self._next_level(self.level, 1)
+            elif self._under >= UP_AFTER_FRAMES:
+                new_level = self._next_level(self.level, -1)
+            if new_level is None:
+                if self._over >= DOWN_AFTER_FRAMES or self._under >= UP_AFTER_FRAMES:
+                    # Already at the end of the ladder
+                    self._over = 0
+                    self._under = 0
+                return None
+            self._set_level(new_level)
+        
+        if self.on_change:
+            self.on_change(new_level)
+        return new_level
+    
+    def mark_unavailable(self, level):
+        """
+        Exclude a level (e.g. its model could not be loaded).
+        
+        If it is the active level, the controller moves to the nearest
+        available lower-quality level (or higher if none is left).
+        
+        Returns:
+            The active level index afterwards
+        """
+        with self._lock:
+            self._unavailable.add(level)
+            if self.level == level:
+                new_level = self._next_level(level, 1)
+                if new_level is None:
+                    new_level = self._next_level(level, -1)
+                if new_level is not None:
+                    self._set_level(new_level)
+            return self.level
+    
+    def _next_level(self, level, step):
+        """Find the next available level in a direction (caller holds the lock)."""
+        level += step
+        while 0 <= level < len(self.levels):
+            if level not in self._unavailable:
+                return level
+            level += step
+        return None
+    
+    def _set_level(self, level):
+        """Switch levels and start measuring afresh (caller holds the lock)."""
+        self.level = level
+        self.changes += 1
+        self.load = None
+        self._over = 0
+        self._under = 0
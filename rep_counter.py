@@ -0,0 +1,195 @@
+"""
+Table-driven rep counting.
+Each exercise's form_checks['rep_counting'] spec is compiled once into a
+flat transition table over (state, angle zone); counting a frame is then a
+few comparisons and table lookups regardless of the exercise.
+"""
+
+import numpy as np
+from joint_angles import JOINT_NAMES
+
+
+# Counter states
+STATE_UNKNOWN = 0
+STATE_REST = 1
+STATE_PEAK = 2
+STATE_NAMES = ('unknown', 'rest', 'peak')
+
+# Angle zones: rest side of the band, inside the band, peak side
+ZONE_REST = 0
+ZONE_BAND = 1
+ZONE_PEAK = 2
+NUM_ZONES = 3
+
+# Seconds a position must persist before a transition is committed
+DEFAULT_DWELL = 0.1
+
+COMBINE_MODES = ('mean', 'min', 'max')
+
+
+class RepProgram:
+    """Compiled rep counting rules for one exercise."""
+    
+    def __init__(self, joints, combine, rest_angle, peak_angle, transitions, counts, dwell):
+        """
+        Initialize a compiled program (use compile_rep_program).
+        
+        Args:
+            joints: Index array into the joint_angles output
+            combine: How joint angles are combined ('mean', 'min' or 'max')
+            rest_angle: Angle at (or beyond) which the body is at rest
+            peak_angle: Angle at (or beyond) which the working position is reached
+            transitions: Flat table; next state = transitions[state * NUM_ZONES + zone]
+            counts: Flat table; reps added = counts[state * NUM_ZONES + zone]
+            dwell: Per-state seconds a new state must persist before it is entered
+        """
+        self.joints = joints
+        self.combine = combine
+        self.rest_angle = rest_angle
+        self.peak_angle = peak_angle
+        self.peak_is_high = peak_angle > rest_angle
+        self.transitions = transitions
+        self.counts = counts
+        self.dwell = dwell
+    
+    def joint_angle(self, angles):
+        """Combine the program's joint angles from a joint_angles() result."""
+        if len(self.joints) == 1:
+            return float(angles[self.joints[0]])
+        values = angles[self.joints]
+        if self.combine == 'min':
+            return float(values.min())
+        if self.combine == 'max':
+            return float(values.max())
+        return float(values.mean())
+    
+    def zone(self, angle):
+        """Classify an angle into ZONE_REST, ZONE_BAND or ZONE_PEAK."""
+        if self.peak_is_high:
+            if angle >= self.peak_angle:
+                return ZONE_PEAK
+            return ZONE_REST if angle <= self.rest_angle else ZONE_BAND
+        if angle <= self.peak_angle:
+            return ZONE_PEAK
+        return ZONE_REST if angle >= self.rest_angle else ZONE_BAND
+
+
+def compile_rep_program(spec):
+    """
+    Compile a rep counting spec into a RepProgram.
+    
+    Args:
+        spec: Dictionary with
+              'joints': joint names from joint_angles.JOINT_NAMES
+              'rest': angle of the rest position
+              'peak': angle of the working position; the gap between rest
+                      and peak is the hysteresis band
+              'combine': 'mean' (default), 'min' or 'max' over the joints
+              'dwell': seconds a position must persist (default 0.1)
+              'hold': seconds the working position must be held before it
+                      counts (default: dwell); used for holds and stretches
+    
+    Returns:
+        RepProgram
+    """
+    joints = np.array([JOINT_NAMES.index(name) for name in spec['joints']], dtype=np.intp)
+    combine = spec.get('combine', 'mean')
+    if combine not in COMBINE_MODES:
+        raise ValueError(f"Unknown combine mode: {combine}")
+    rest_angle = float(spec['rest'])
+    peak_angle = float(spec['peak'])
+    if rest_angle == peak_angle:
+        raise ValueError("Rest and peak angles must differ")
+    dwell = float(spec.get('dwell', DEFAULT_DWELL))
+    hold = float(spec.get('hold', dwell))
+    
+    # next state for each (state, zone); the band keeps the current state
+    table = {
+        STATE_UNKNOWN: (STATE_REST, STATE_UNKNOWN, STATE_PEAK),
+        STATE_REST: (STATE_REST, STATE_REST, STATE_PEAK),
+        STATE_PEAK: (STATE_REST, STATE_PEAK, STATE_PEAK),
+    }
+    transitions = []
+    counts = []
+    for state in (STATE_UNKNOWN, STATE_REST, STATE_PEAK):
+        for zone in range(NUM_ZONES):
+            target = table[state][zone]
+            transitions.append(target)
+            # A rep is completed when the body returns to rest from the peak
+            counts.append(1 if state == STATE_PEAK and target == STATE_REST else 0)
+    
+    return RepProgram(joints, combine, rest_angle, peak_angle, tuple(transitions),
+                      tuple(counts), (0.0, dwell, hold))
+
+
+def compile_rep_programs(exercises):
+    """
+    Compile the rep counting specs of a list of exercises.
+    
+    Returns:
+        Dictionary of exercise ID to RepProgram (exercises without a spec
+        are left out)
+    """
+    programs = {}
+    for exercise in exercises:
+        spec = exercise.form_checks.get('rep_counting')
+        if spec:
+            programs[exercise.id] = compile_rep_program(spec)
+    return programs
+
+
+class RepCounter:
+    """Rep counting state for one exercise, driven by a RepProgram."""
+    
+    def __init__(self, program):
+        """
+        Initialize the counter.
+        
+        Args:
+            program: RepProgram from compile_rep_program
+        """
+        self.program = program
+        self.reset()
+    
+    def reset(self):
+        """Reset the rep count and state."""
+        self.reps = 0
+        self.state = STATE_UNKNOWN
+        self.angle = 0.0
+        self._pending = None
+        self._pending_since = 0.0
+    
+    @property
+    def state_name(self):
+        """Current state as a string ('unknown', 'rest' or 'peak')."""
+        return STATE_NAMES[self.state]
+    
+    def update(self, angles, timestamp):
+        """
+        Advance the counter by one frame.
+        
+        Args:
+            angles: joint_angles() result for the frame
+            timestamp: Frame time in seconds (monotonic)
+        
+        Returns:
+            Current rep count
+        """
+        program = self.program
+        self.angle = program.joint_angle(angles)
+        index = self.state * NUM_ZONES + program.zone(self.angle)
+        target = program.transitions[index]
+        
+        if target == self.state:
+            self._pending = None
+            return self.reps
+        
+        # Commit the transition only once the new position has persisted
+        if self._pending != target:
+            self._pending = target
+            self._pending_since = timestamp
+        if timestamp - self._pending_since >= program.dwell[target]:
+            self.reps += program.counts[index]
+            self.state = target
+            self._pending = None
+        return self.reps
@@ -0,0 +1,145 @@
+"""
+Region-of-interest tracking for pose inference.
+Crops the inference input to a padded box around the previous frame's
+landmarks and maps landmarks found in the crop back to full-frame
+coordinates; tracking falls back to the full frame when the pose is lost.
+"""
+
+import numpy as np
+
+
+# Padding around the landmark bounding box, as a fraction of its size
+DEFAULT_PADDING = 0.35
+# Smallest crop side as a fraction of the frame side
+MIN_ROI_FRACTION = 0.25
+# Landmarks below this visibility do not shape the box
+VISIBILITY_THRESHOLD = 0.5
+# Fewest visible landmarks needed to keep tracking
+MIN_VISIBLE_LANDMARKS = 4
+# Keep the current box while it contains the landmarks and is at most this
+# many times larger than needed (avoids re-cropping on every small move)
+MAX_AREA_RATIO = 2.0
+# Boxes covering more of the frame than this are not worth cropping
+FULL_FRAME_RATIO = 0.9
+
+
+class RoiTracker:
+    """Tracks the crop region used for pose inference on one stream."""
+    
+    def __init__(self, padding=DEFAULT_PADDING, min_fraction=MIN_ROI_FRACTION):
+        """
+        Initialize the tracker with no region (full-frame detection).
+        
+        Args:
+            padding: Box padding as a fraction of the landmark box size
+            min_fraction: Smallest crop side as a fraction of the frame side
+        """
+        self.padding = padding
+        self.min_fraction = min_fraction
+        self.region = None  # (x0, y0, x1, y1) in pixels, or None for full frame
+        self.pixels_processed = 0
+        self.pixels_total = 0
+        self.fallbacks = 0
+    
+    @property
+    def pixel_ratio(self):
+        """Fraction of frame pixels actually fed to inference so far."""
+        return self.pixels_processed / self.pixels_total if self.pixels_total else 1.0
+    
+    def reset(self):
+        """Drop the region; the next frame is processed in full."""
+        self.region = None
+    
+    def crop(self, frame):
+        """
+        Crop a frame to the current region.
+        
+        Args:
+            frame: Full BGR frame
+        
+        Returns:
+            Tuple of (image, region); region is None when image is the full frame
+        """
+        h, w = frame.shape[:2]
+        region = self.region
+        if region is not None and (region[2] > w or region[3] > h):
+            # Frame size changed under us
+            region = self.region = None
+        self.pixels_total += w * h
+        if region is None:
+            self.pixels_processed += w * h
+            return frame, None
+        x0, y0, x1, y1 = region
+        self.pixels_processed += (x1 - x0) * (y1 - y0)
+        return frame[y0:y1, x0:x1], region
+    
+    @staticmethod
+    def to_frame(points, region, width, height):
+        """
+        Map normalized crop landmarks to normalized full-frame landmarks.
+        
+        Args:
+            points: (33, 4) landmark array relative to the crop
+            region: (x0, y0, x1, y1) crop box in pixels
+            width, height: Full frame size
+        
+        Returns:
+            New (33, 4) array relative to the full frame
+        """
+        x0, y0, x1, y1 = region
+        crop_w = x1 - x0
+        mapped = points.copy()
+        mapped[:, 0] = (x0 + points[:, 0] * crop_w) / width
+        mapped[:, 1] = (y0 + points[:, 1] * (y1 - y0)) / height
+        # z shares the x scale in MediaPipe's convention
+        mapped[:, 2] = points[:, 2] * (crop_w / width)
+        return mapped
+    
+    def update(self, points, width, height):
+        """
+        Update the region from full-frame landmarks.
+        
+        Args:
+            points: (33, 4) full-frame landmark array, or None if the pose was lost
+            width, height: Full frame size
+        """
+        if points is None:
+            self.reset()
+            return
+        visible = points[points[:, 3] >= VISIBILITY_THRESHOLD]
+        if len(visible) < MIN_VISIBLE_LANDMARKS:
+            self.reset()
+            return
+        
+        # Landmark box in pixels, clipped to the frame
+        xs = np.clip(visible[:, 0] * width, 0, width)
+        ys = np.clip(visible[:, 1] * height, 0, height)
+        bx0, bx1 = float(xs.min()), float(xs.max())
+        by0, by1 = float(ys.min()), float(ys.max())
+        
+        pad_x = (bx1 - bx0) * self.padding
+        pad_y = (by1 - by0) * self.padding
+        box_w = max(bx1 - bx0 + 2 * pad_x, width * self.min_fraction)
+        box_h = max(by1 - by0 + 2 * pad_y, height * self.min_fraction)
+        cx = (bx0 + bx1) / 2
+        cy = (by0 + by1) / 2
+        x0 = int(max(0, cx - box_w / 2))
+        y0 = int(max(0, cy - box_h / 2))
+        x1 = int(min(width, cx + box_w / 2))
+        y1 = int(min(height, cy + box_h / 2))
+        
+        if self.region is not None:
+            # Keep the current box while the landmarks stay inside it with
+            # half the padding to spare and it is not much larger than needed
+            rx0, ry0, rx1, ry1 = self.region
+            inside = (rx0 <= max(0, bx0 - pad_x / 2) and ry0 <= max(0, by0 - pad_y / 2) and
+                      rx1 >= min(width, bx1 + pad_x / 2) and ry1 >= min(height, by1 + pad_y / 2))
+            oversized = (rx1 - rx0) * (ry1 - ry0) > (x1 - x0) * (y1 - y0) * MAX_AREA_RATIO
+            if inside and not oversized:
+                return
+        
+        if (x1 - x0) * (y1 - y0) >= width * height * FULL_FRAME_RATIO:
+            # Nearly the whole frame: cropping would not save anything
+            self.region = None
+        else:
+            self.region = (x0, y0, x1, y1)
@@ -0,0 +1,171 @@
+"""
+Opt-in startup tracer.
+Records monotonic timestamps for each startup phase, from interpreter
+launch to the first camera frame on screen, and writes them as a JSON
+timeline. Enabled by setting POSTURE_STARTUP_TRACE to the output path
+('1' writes startup_timeline.json); otherwise every call is a no-op.
+
+Only the standard library is imported, so main.py can load this module
+before anything else.
+"""
+
+import atexit
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+
+TRACE_ENV = 'POSTURE_STARTUP_TRACE'
+# Phase after which the timeline is written and the app asked to quit
+# (used by bench_startup.py)
+EXIT_ENV = 'POSTURE_STARTUP_TRACE_EXIT'
+# Set to start tracking as soon as the model is ready, so a benchmark run
+# reaches the first frame without a click
+AUTOSTART_ENV = 'POSTURE_STARTUP_TRACE_AUTOSTART'
+DEFAULT_TIMELINE_PATH = 'startup_timeline.json'
+
+# Phase that completes a normal startup trace
+FIRST_FRAME = 'first_frame'
+
+_path = os.environ.get(TRACE_ENV, '')
+ENABLED = bool(_path) and _path != '0'
+TIMELINE_PATH = (DEFAULT_TIMELINE_PATH if _path == '1' else _path) if ENABLED else None
+EXIT_PHASE = os.environ.get(EXIT_ENV) or None
+AUTOSTART = ENABLED and os.environ.get(AUTOSTART_ENV, '') not in ('', '0')
+
+_lock = threading.Lock()
+_events = []
+_open = {}
+_written = False
+_exit_handler = None
+
+
+def _process_age():
+    """Seconds since this process was created (0 if the platform does not say)."""
+    try:
+        with open('/proc/self/stat') as f:
+            # Field 22 (after the parenthesized command name) is the start time in ticks
+            fields = f.read().rsplit(')', 1)[1].split()
+        with open('/proc/uptime') as f:
+            uptime = float(f.read().split()[0])
+        return max(uptime - int(fields[19]) / os.sysconf('SC_CLK_TCK'), 0.0)
+    except (OSError, ValueError, IndexError):
+        return 0.0
+
+
+# Timeline origin: process creation, so interpreter start-up is included
+_origin = time.monotonic() - (_process_age() if ENABLED else 0.0)
+if ENABLED:
+    _events.append({'name': 'interpreter', 'start': 0.0, 'end': time.monotonic() - _origin})
+
+
+def _now():
+    """Seconds since the timeline origin."""
+    return time.monotonic() - _origin
+
+
+def begin(name):
+    """Start a phase that ends later, possibly on another thread (see end())."""
+    if not ENABLED:
+        return
+    with _lock:
+        _open.setdefault(name, _now())
+
+
+def end(name):
+    """End a phase started with begin(); ignored if it was never started."""
+    if not ENABLED:
+        return
+    with _lock:
+        start = _open.pop(name, None)
+        if start is None:
+            return
+        _events.append({'name': name, 'start': start, 'end': _now()})
+    _phase_done(name)
+
+
+def mark(name):
+    """Record an instant (only the first mark of a name counts)."""
+    if not ENABLED:
+        return
+    with _lock:
+        if any(event['name'] == name for event in _events):
+            return
+        now = _now()
+        _events.append({'name': name, 'start': now, 'end': now})
+    _phase_done(name)
+
+
+@contextmanager
+def span(name):
+    """Time a phase: ``with startup_trace.span('kv_parse'): ...``"""
+    begin(name)
+    try:
+        yield
+    finally:
+        end(name)
+
+
+def set_exit_handler(handler):
+    """
+    Register how to quit the app once EXIT_PHASE is reached.
+    
+    Args:
+        handler: Callable() that stops the app (may be called from any thread)
+    """
+    global _exit_handler
+    _exit_handler = handler
+
+
+def timeline():
+    """
+    Get the recorded phases.
+    
+    Returns:
+        Dictionary with process info and phases (name, start, end, duration
+        in seconds from process creation), ordered by start time
+    """
+    with _lock:
+        events = sorted(_events, key=lambda event: (event['start'], event['end']))
+        return {
+            'pid': os.getpid(),
+            'python': sys.version.split()[0],
+            'created': time.time() - _now(),
+            'phases': [dict(event, duration=event['end'] - event['start']) for event in events],
+        }
+
+
+def write(path=None):
+    """
+    Write the timeline as JSON (once; later calls are ignored).
+    
+    Returns:
+        Path written, or None
+    """
+    global _written
+    if not ENABLED:
+        return None
+    with _lock:
+        if _written:
+            return None
+        _written = True
+    path = path or TIMELINE_PATH
+    with open(path, 'w') as f:
+        json.dump(timeline(), f, indent=2)
+    return path
+
+
+def _phase_done(name):
+    """Finish the trace when the first frame or the requested exit phase is reached."""
+    if name == FIRST_FRAME or name == EXIT_PHASE:
+        write()
+    if name == EXIT_PHASE and _exit_handler is not None:
+        _exit_handler()
+
+
+if ENABLED:
+    # Startups that never show a frame still leave a timeline
+    atexit.register(write)
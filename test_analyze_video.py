@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+"""
+Test headless video analysis.
+The frame reader, per-frame records and both output formats are checked
+with a scripted pose engine; one short run goes through the command line
+with the real model.
+"""
+
+import csv
+import io
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+import cv2
+import numpy as np
+
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+FPS = 30
+
+
+def write_video(path, count, size=(320, 240)):
+    """Write a short MJPG clip; returns False if no encoder is available."""
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*'MJPG'), FPS, size)
+    if not writer.isOpened():
+        return False
+    for i in range(count):
+        writer.write(np.full((size[1], size[0], 3), i * 10 % 256, dtype=np.uint8))
+    writer.release()
+    return True
+
+
+def test_video_reader():
+    """Test decoding ahead of the consumer, timestamps and early stops."""
+    print("Testing video reader...")
+    from analyze_video import VideoReader
+    
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = os.path.join(tmpdir, 'clip.avi')
+        if not write_video(path, 20):
+            print("  - Skipped: no video encoder available")
+            return True
+        
+        frames = list(VideoReader(path, read_ahead=2))
+        assert [index for index, _, _ in frames] == list(range(20))
+        assert all(abs(timestamp - index / FPS) < 1e-6 for index, timestamp, _ in frames)
+        assert frames[0][2].shape == (240, 320, 3)
+        
+        # Stopping early must not leave the reader blocked on a full queue
+        reader = VideoReader(path, read_ahead=2)
+        for index, _, _ in reader:
+            if index == 3:
+                break
+        
+        try:
+            VideoReader(os.path.join(tmpdir, 'missing.avi'))
+            assert False, "A missing video should raise IOError"
+        except IOError:
+            pass
+    print("  ✓ Every frame in order with video timestamps; early stop and missing files handled")
+    return True
+
+
+def make_engine():
+    """PostureDetector whose pose squats every 15 frames, with tilted shoulders and a gap."""
+    from posture_detector import (PostureDetector, PoseResult, LEFT_SHOULDER, RIGHT_SHOULDER,
+                                  LEFT_HIP, LEFT_KNEE, LEFT_ANKLE)
+    
+    class ScriptedEngine(PostureDetector):
+        def __init__(self):
+            self.mp_pose = None
+            self.frame = 0
+        
+        def detect(self, frame, roi_tracker=None, inference_input=None, timings=None):
+            h, w = frame.shape[:2]
+            index, self.frame = self.frame, self.frame + 1
+            if index in (40, 41):
+                return PoseResult(None, w, h)
+            points = np.zeros((33, 4), dtype=np.float32)
+            points[:, 3] = 1.0
+            points[LEFT_SHOULDER, :2] = (0.4, 0.2)
+            points[RIGHT_SHOULDER, :2] = (0.6, 0.25)
+            points[LEFT_HIP, :2] = (0.5, 0.3)
+            points[LEFT_KNEE, :2] = (0.5, 0.5)
+            # Standing (180 degrees at the knee), then squatting (90 degrees)
+            points[LEFT_ANKLE, :2] = (0.5, 0.7) if index // 15 % 2 == 0 else (0.5 + 0.2 * h / w, 0.5)
+            result = PoseResult(None, w, h, points)
+            self.update_shoulders(result)
+            return result
+    
+    return ScriptedEngine()
+
+
+def scripted_frames(count):
+    """(index, timestamp, frame) tuples at FPS."""
+    frame = np.zeros((480, 640, 3), dtype=np.uint8)
+    return ((i, i / FPS, frame) for i in range(count))
+
+
+def test_analyze_frames():
+    """Test tilt, angles, rep events and feedback per frame, and the run totals."""
+    print("\nTesting frame records...")
+    from analyze_video import analyze_frames, RunSummary, NO_POSE_FEEDBACK
+    
+    records = list(analyze_frames(scripted_frames(90), make_engine(), 'squat', threshold=5.0, smoothing='off'))
+    assert len(records) == 90
+    first = records[0]
+    assert first['frame'] == 0 and first['time'] == 0.0 and first['pose']
+    assert 10.0 < first['tilt'] < 11.0 and first['bad_posture'], first
+    assert abs(first['angles']['left_knee'] - 180.0) < 0.5, first['angles']
+    assert abs(records[20]['angles']['left_knee'] - 90.0) < 0.5, records[20]['angles']
+    assert first['process_ms'] >= 0
+    
+    events = [record['frame'] for record in records if record['rep_event']]
+    assert len(events) == records[-1]['reps'] >= 2, events
+    assert all(records[i]['reps'] == records[i - 1]['reps'] + 1 for i in events)
+    
+    gap = records[40]
+    assert not gap['pose'] and not gap['bad_posture'] and gap['feedback'] == NO_POSE_FEEDBACK
+    assert gap['angles']['left_knee'] is None and gap['reps'] == records[39]['reps']
+    assert records[20]['feedback'] and '•' not in records[20]['feedback']
+    
+    totals = RunSummary()
+    for record in records:
+        totals.add(record)
+    summary = totals.summarize(3.0)
+    assert summary['frames'] == 90 and summary['fps'] == 30.0 and summary['reps'] == records[-1]['reps']
+    assert summary['pose_rate'] == 88 / 90 and summary['bad_posture_rate'] == 1.0, summary
+    
+    posture_only = next(analyze_frames(scripted_frames(1), make_engine(), smoothing='off'))
+    assert 'reps' not in posture_only and not posture_only['bad_posture']
+    print(f"  ✓ {records[-1]['reps']} reps at frames {events}; no-pose frames keep the count")
+    return True
+
+
+def test_record_writer():
+    """Test CSV columns and JSON Lines records."""
+    print("\nTesting output formats...")
+    from analyze_video import analyze_frames, RecordWriter
+    from joint_angles import JOINT_NAMES
+    
+    records = list(analyze_frames(scripted_frames(45), make_engine(), 'squat', smoothing='off'))
+    
+    stream = io.StringIO()
+    writer = RecordWriter(stream, 'csv', exercise=True)
+    for record in records:
+        writer.write(record)
+    rows = list(csv.DictReader(io.StringIO(stream.getvalue())))
+    assert len(rows) == 45
+    assert [f'angle_{name}' for name in JOINT_NAMES] == list(rows[0])[5:13], list(rows[0])
+    assert rows[0]['pose'] == '1' and rows[40]['pose'] == '0' and rows[40]['angle_left_knee'] == ''
+    assert rows[44]['reps'] == str(records[44]['reps'])
+    
+    stream = io.StringIO()
+    writer = RecordWriter(stream, 'jsonl', exercise=True)
+    for record in records:
+        writer.write(record)
+    lines = stream.getvalue().splitlines()
+    assert len(lines) == 45 and json.loads(lines[20]) == records[20]
+    
+    try:
+        RecordWriter(io.StringIO(), 'xml')
+        assert False, "Unknown formats should be rejected"
+    except ValueError:
+        pass
+    print("  ✓ One angle column per joint in CSV; JSON Lines round-trips")
+    return True
+
+
+def test_command_line():
+    """Test a short run with the real model and argument validation."""
+    print("\nTesting command line...")
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = os.path.join(tmpdir, 'clip.avi')
+        if not write_video(path, 10):
+            print("  - Skipped: no video encoder available")
+            return True
+        output = os.path.join(tmpdir, 'out.jsonl')
+        run = subprocess.run([sys.executable, 'analyze_video.py', path, '--exercise', 'squat',
+                              '--output', output, '--max-frames', '4'],
+                             capture_output=True, text=True, cwd=APP_DIR, timeout=300)
+        assert run.returncode == 0, run.stdout + run.stderr
+        with open(output) as f:
+            records = [json.loads(line) for line in f]
+        assert [record['frame'] for record in records] == [0, 1, 2, 3]
+        assert '4 frames' in run.stderr and '0 reps' in run.stderr, run.stderr
+        
+        bad = subprocess.run([sys.executable, 'analyze_video.py', path, '--exercise', 'no-such-exercise'],
+                             capture_output=True, text=True, cwd=APP_DIR, timeout=60)
+        assert bad.returncode == 2, bad.stderr
+        missing = subprocess.run([sys.executable, 'analyze_video.py', os.path.join(tmpdir, 'missing.avi')],
+                                 capture_output=True, text=True, cwd=APP_DIR, timeout=60)
+        assert missing.returncode == 1 and 'Cannot open video' in missing.stderr, missing.stderr
+    print("  ✓ JSON Lines written from the file extension; bad exercises and videos rejected")
+    return True
+
+
+def main():
+    """Run all tests."""
+    print("=" * 60)
+    print("Video Analysis Tests")
+    print("=" * 60)
+    
+    all_passed = True
+    for test in (test_video_reader, test_analyze_frames, test_record_writer, test_command_line):
+        try:
+            if not test():
+                all_passed = False
+        except Exception as e:
+            print(f"  ✗ {test.__name__} failed: {e}")
+            all_passed = False
+    
+    print("\n" + "=" * 60)
+    if all_passed:
+        print("✓ All video analysis tests passed!")
+    else:
+        print("✗ Some tests failed")
+    print("=" * 60)
+    return 0 if all_passed else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
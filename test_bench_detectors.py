@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+Test the detector benchmark suite.
+Frame sources, latency statistics and the baseline comparison are checked
+directly; one short run goes through the command line end to end.
+"""
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+import cv2
+import numpy as np
+
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def test_synthetic_frames():
+    """Test generated frames at the benchmark resolutions."""
+    print("Testing synthetic frames...")
+    from bench_detectors import synthetic_frames
+    
+    for height, width in ((480, 853), (720, 1280), (1080, 1920)):
+        frames = synthetic_frames(height, count=4)
+        assert len(frames) == 4
+        assert frames[0].shape == (height, width, 3) and frames[0].dtype == np.uint8
+        assert not np.array_equal(frames[0], frames[-1]), "The figure should move"
+    assert np.array_equal(synthetic_frames(480, count=2)[1], synthetic_frames(480, count=2)[1])
+    print("  ✓ 480p/720p/1080p, deterministic, moving figure")
+    return True
+
+
+def test_video_frames():
+    """Test reading and scaling a fixture video."""
+    print("\nTesting fixture videos...")
+    from bench_detectors import video_frames
+    
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = os.path.join(tmpdir, 'clip.avi')
+        writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*'MJPG'), 30, (320, 240))
+        if not writer.isOpened():
+            print("  - Skipped: no video encoder available")
+            return True
+        for i in range(12):
+            writer.write(np.full((240, 320, 3), i * 20, dtype=np.uint8))
+        writer.release()
+        
+        frames = video_frames(path, 480, limit=10)
+        assert len(frames) == 10 and frames[0].shape == (480, 640, 3), (len(frames), frames[0].shape)
+        assert video_frames(os.path.join(tmpdir, 'missing.avi'), 480, 10) == []
+    print("  ✓ Frames read up to the limit and scaled to the resolution")
+    return True
+
+
+def test_latency_stats():
+    """Test the per-frame latency summary."""
+    print("\nTesting latency statistics...")
+    from bench_detectors import latency_stats
+    
+    stats = latency_stats([ms * 1_000_000 for ms in range(1, 101)])
+    assert stats == {'mean': 50.5, 'p50': 50.0, 'p95': 95.0, 'p99': 99.0, 'max': 100.0}, stats
+    assert latency_stats([])['p95'] == 0.0
+    print("  ✓ Mean and nearest-rank percentiles in milliseconds")
+    return True
+
+
+class FakeEngine:
+    """PostureDetector stand-in that finds no pose."""
+    
+    mp_pose = None
+    
+    def __init__(self, model_complexity=1):
+        self.model_complexity = model_complexity
+        self.released = False
+    
+    def process_frame(self, frame):
+        return frame, 0.0, None, None
+    
+    def detect(self, frame):
+        from posture_detector import PoseResult
+        h, w = frame.shape[:2]
+        return PoseResult(None, w, h)
+    
+    def draw_overlay(self, frame, result):
+        pass
+    
+    def release(self):
+        self.released = True
+
+
+def test_run_case():
+    """Test one benchmark case for both detectors in-process."""
+    print("\nTesting run_case...")
+    from bench_detectors import run_case, SYNTHETIC_SOURCE
+    
+    engines = []
+    
+    def factory(model_complexity):
+        engines.append(FakeEngine(model_complexity))
+        return engines[-1]
+    
+    for detector in ('posture', 'exercise'):
+        result = run_case(detector, SYNTHETIC_SOURCE, 240, 2, frames=8, detector_factory=factory)
+        assert result['detector'] == detector and result['resolution'] == 240 and result['complexity'] == 2
+        assert result['frames'] == 8 and result['fps'] > 0 and result['pose_rate'] == 0.0
+        assert set(result['latency_ms']) == {'mean', 'p50', 'p95', 'p99', 'max'}
+        assert result['peak_rss_mb'] > 0
+    assert all(engine.released and engine.model_complexity == 2 for engine in engines)
+    print("  ✓ FPS, latency distribution, pose rate and peak RSS reported; engines released")
+    return True
+
+
+def make_result(fps, p95, rss, resolution=480):
+    """Benchmark result with the given headline numbers."""
+    return {'detector': 'posture', 'source': 'synthetic', 'resolution': resolution, 'complexity': 1,
+            'fps': fps, 'latency_ms': {'p95': p95}, 'peak_rss_mb': rss}
+
+
+def test_baseline_comparison():
+    """Test that only changes beyond the tolerance are flagged."""
+    print("\nTesting baseline comparison...")
+    from bench_detectors import compare_results
+    
+    baseline = {'results': [make_result(40.0, 30.0, 300.0), make_result(20.0, 60.0, 400.0, resolution=1080)]}
+    assert compare_results([make_result(36.0, 33.0, 330.0), make_result(20.0, 60.0, 400.0, resolution=1080)],
+                           baseline) == []
+    
+    regressions = compare_results([make_result(30.0, 40.0, 400.0)], baseline)
+    assert len(regressions) == 4, regressions
+    assert regressions[0] == 'posture/synthetic/480/1: fps 40.0 -> 30.0', regressions[0]
+    
+    # Cases new since the baseline are not compared
+    complete = [make_result(40.0, 30.0, 300.0), make_result(20.0, 60.0, 400.0, resolution=1080)]
+    assert compare_results(complete + [make_result(1.0, 999.0, 999.0, resolution=720)], baseline) == []
+    assert len(compare_results([make_result(30.0, 30.0, 300.0)] + complete[1:], baseline, tolerance=0.5)) == 0
+    
+    # Cases that passed in the baseline but now fail or are missing regress
+    failed = dict(make_result(1.0, 999.0, 999.0), error='no frames')
+    regressions = compare_results([failed], baseline['results'])
+    assert regressions == ['posture/synthetic/480/1: failed (no frames)',
+                           'posture/synthetic/1080/1: missing from this run'], regressions
+    failed_before = {'results': [dict(make_result(40.0, 30.0, 300.0), error='crashed')]}
+    assert compare_results([failed], failed_before) == []
+    print("  ✓ FPS drop, p95 and RSS growth flagged beyond the tolerance; failed and missing cases flagged")
+    return True
+
+
+def test_command_line():
+    """Test a short isolated run, baseline recording and comparison."""
+    print("\nTesting command line...")
+    with tempfile.TemporaryDirectory() as tmpdir:
+        baseline = os.path.join(tmpdir, 'baseline.json')
+        report_path = os.path.join(tmpdir, 'report.json')
+        command = [sys.executable, 'bench_detectors.py', '--detectors', 'posture', '--resolutions', '240',
+                   '--frames', '3', '--baseline', baseline]
+        first = subprocess.run(command + ['--update-baseline'], capture_output=True, text=True,
+                               cwd=APP_DIR, timeout=300)
+        assert first.returncode == 0, first.stdout + first.stderr
+        with open(baseline) as f:
+            report = json.load(f)
+        result = report['results'][0]
+        assert 'error' not in result, result
+        assert result['frames'] == 3 and result['fps'] > 0 and result['peak_rss_mb'] > 0
+        assert report['machine']['cpus'] == os.cpu_count()
+        
+        # A large tolerance keeps a three-frame timing from flagging noise
+        second = subprocess.run(command + ['--tolerance', '10', '--output', report_path],
+                                capture_output=True, text=True, cwd=APP_DIR, timeout=300)
+        assert second.returncode == 0 and 'No regressions' in second.stdout, second.stdout + second.stderr
+        assert os.path.exists(report_path)
+    print(f"  ✓ Case ran in a fresh interpreter at {result['fps']:.1f} fps; baseline compared")
+    return True
+
+
+def main():
+    """Run all tests."""
+    print("=" * 60)
+    print("Detector Benchmark Tests")
+    print("=" * 60)
+    
+    all_passed = True
+    for test in (test_synthetic_frames, test_video_frames, test_latency_stats, test_run_case,
+                 test_baseline_comparison, test_command_line):
+        try:
+            if not test():
+                all_passed = False
+        except Exception as e:
+            print(f"  ✗ {test.__name__} failed: {e}")
+            all_passed = False
+    
+    print("\n" + "=" * 60)
+    if all_passed:
+        print("✓ All detector benchmark tests passed!")
+    else:
+        print("✗ Some tests failed")
+    print("=" * 60)
+    return 0 if all_passed else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,273 @@
+#!/usr/bin/env python3
+"""
+Test camera enumeration.
+Devices come from a video4linux sysfs listing, are probed in parallel with
+a timeout, and cached so a second enumeration opens nothing.
+"""
+
+import os
+import sys
+import tempfile
+import threading
+import time
+
+
+def make_sysfs(root, devices):
+    """
+    Build a fake /sys/class/video4linux tree.
+    
+    Args:
+        root: Temporary directory
+        devices: List of (node_number, name, sysfs_index, usb_serial)
+    """
+    sysfs = os.path.join(root, 'video4linux')
+    os.makedirs(sysfs, exist_ok=True)
+    for number, name, index, serial in devices:
+        usb = os.path.join(root, 'devices', f'usb1-{serial}')
+        interface = os.path.join(usb, '1-1:1.0')
+        os.makedirs(interface, exist_ok=True)
+        for attr, value in (('idVendor', '046d'), ('idProduct', '0825'), ('serial', serial)):
+            with open(os.path.join(usb, attr), 'w') as f:
+                f.write(value + '\n')
+        node = os.path.join(sysfs, f'video{number}')
+        os.makedirs(node, exist_ok=True)
+        with open(os.path.join(node, 'name'), 'w') as f:
+            f.write(name + '\n')
+        with open(os.path.join(node, 'index'), 'w') as f:
+            f.write(f'{index}\n')
+        link = os.path.join(node, 'device')
+        if os.path.lexists(link):
+            os.remove(link)
+        os.symlink(interface, link)
+    return sysfs
+
+
+class RecordingProbe:
+    """Fake probe recording which devices were opened."""
+    
+    def __init__(self, delay=0.0, hang=()):
+        self.delay = delay
+        self.hang = set(hang)
+        self.opened = []
+        self.active = 0
+        self.max_active = 0
+        self._lock = threading.Lock()
+    
+    def __call__(self, candidate):
+        with self._lock:
+            self.opened.append(candidate['index'])
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        try:
+            time.sleep(5.0 if candidate['index'] in self.hang else self.delay)
+            return True, '640x480'
+        finally:
+            with self._lock:
+                self.active -= 1
+
+
+def test_sysfs_listing():
+    """Test that sysfs nodes are listed with identities, skipping metadata nodes."""
+    print("Testing video4linux listing...")
+    from camera_enumeration import list_video_devices
+    
+    with tempfile.TemporaryDirectory() as tmpdir:
+        sysfs = make_sysfs(tmpdir, [(0, 'HD Webcam', 0, 'A1'), (1, 'HD Webcam', 1, 'A1'),
+                                    (2, 'USB Cam', 0, 'B2')])
+        devices = list_video_devices(sysfs)
+        assert [d['index'] for d in devices] == [0, 2], devices
+        assert devices[0]['path'] == '/dev/video0'
+        assert devices[0]['label'] == 'HD Webcam'
+        assert devices[0]['identity'].endswith('046d:0825:A1'), devices[0]['identity']
+        assert devices[0]['identity'] != devices[1]['identity']
+        assert list_video_devices(os.path.join(tmpdir, 'missing')) is None
+    print("  ✓ Capture nodes listed; metadata node skipped; USB identity read")
+    return True
+
+
+def test_cached_startup_opens_nothing():
+    """Test that a second enumeration is served from the database cache."""
+    print("\nTesting cached enumeration...")
+    from camera_enumeration import CameraEnumerator
+    from database import SettingsDatabase
+    
+    with tempfile.TemporaryDirectory() as tmpdir:
+        sysfs = make_sysfs(tmpdir, [(0, 'HD Webcam', 0, 'A1'), (2, 'USB Cam', 0, 'B2')])
+        db = SettingsDatabase(os.path.join(tmpdir, 'test.db'))
+        try:
+            probe = RecordingProbe()
+            cameras = CameraEnumerator(db, sysfs, probe).enumerate()
+            assert sorted(probe.opened) == [0, 2]
+            assert [c['name'] for c in cameras] == ['Camera 0', 'Camera 2']
+            
+            # A new session (new enumerator) finds everything in the cache
+            probe = RecordingProbe()
+            cameras = CameraEnumerator(db, sysfs, probe).enumerate()
+            assert probe.opened == [], f"Cached devices were opened: {probe.opened}"
+            assert [c['available'] for c in cameras] == [True, True]
+            assert cameras[1]['label'] == 'USB Cam'
+            
+            # Another camera on the same node is probed again
+            make_sysfs(tmpdir, [(2, 'Other Cam', 0, 'C3')])
+            probe = RecordingProbe()
+            cameras = CameraEnumerator(db, sysfs, probe).enumerate()
+            assert probe.opened == [2], probe.opened
+            assert cameras[1]['label'] == 'Other Cam'
+            
+            # A refresh probes everything
+            probe = RecordingProbe()
+            CameraEnumerator(db, sysfs, probe).enumerate(refresh=True)
+            assert sorted(probe.opened) == [0, 2]
+        finally:
+            db.close()
+    print("  ✓ Cache hit opens no devices; identity change re-probes")
+    return True
+
+
+def test_parallel_probe_with_timeout():
+    """Test that devices are probed concurrently and hung ones time out."""
+    print("\nTesting parallel probing...")
+    from camera_enumeration import CameraEnumerator
+    
+    with tempfile.TemporaryDirectory() as tmpdir:
+        sysfs = make_sysfs(tmpdir, [(i, f'Cam {i}', 0, f'S{i}') for i in range(4)])
+        probe = RecordingProbe(delay=0.2, hang=(3,))
+        enumerator = CameraEnumerator(None, sysfs, probe, timeout=0.5, max_workers=4)
+        started = time.perf_counter()
+        cameras = enumerator.enumerate()
+        elapsed = time.perf_counter() - started
+        assert probe.max_active >= 2, f"Probes did not overlap (max {probe.max_active} active)"
+        assert elapsed < 1.5, f"Enumeration waited for the hung device ({elapsed:.2f} s)"
+        assert [c['available'] for c in cameras] == [True, True, True, False]
+        assert cameras[3]['info'] == 'Timed out'
+    print(f"  ✓ 4 devices in {elapsed:.2f} s; hung device reported as timed out")
+    return True
+
+
+def test_timed_out_not_cached():
+    """Test that timed-out devices are probed again next time."""
+    print("\nTesting timed-out devices...")
+    from camera_enumeration import CameraEnumerator
+    from database import SettingsDatabase
+    
+    with tempfile.TemporaryDirectory() as tmpdir:
+        sysfs = make_sysfs(tmpdir, [(0, 'Slow Cam', 0, 'A1')])
+        db = SettingsDatabase(os.path.join(tmpdir, 'test.db'))
+        try:
+            CameraEnumerator(db, sysfs, RecordingProbe(hang=(0,)), timeout=0.2).enumerate()
+            probe = RecordingProbe()
+            cameras = CameraEnumerator(db, sysfs, probe).enumerate()
+            assert probe.opened == [0] and cameras[0]['available']
+        finally:
+            db.close()
+    print("  ✓ Timed-out device re-probed")
+    return True
+
+
+def test_without_sysfs():
+    """Test index probing on platforms without video4linux."""
+    print("\nTesting platforms without a device listing...")
+    from camera_enumeration import CameraEnumerator
+    from database import SettingsDatabase
+    
+    def probe(candidate):
+        if candidate['index'] == 1:
+            return True, '1280x720'
+        return False, 'Could not be opened'
+    
+    with tempfile.TemporaryDirectory() as tmpdir:
+        db = SettingsDatabase(os.path.join(tmpdir, 'test.db'))
+        try:
+            missing = os.path.join(tmpdir, 'missing')
+            cameras = CameraEnumerator(db, missing, probe).enumerate(max_cameras=4)
+            assert [(c['index'], c['info']) for c in cameras] == [(1, '1280x720')], cameras
+            
+            recording = RecordingProbe()
+            cameras = CameraEnumerator(db, missing, recording).enumerate(max_cameras=4)
+            assert recording.opened == [] and [c['name'] for c in cameras] == ['Camera 1']
+        finally:
+            db.close()
+    print("  ✓ Indices probed once, then served from the cache")
+    return True
+
+
+def test_unavailable_reprobed():
+    """Test that cameras cached as unavailable are probed again next time."""
+    print("\nTesting cached unavailable cameras...")
+    from camera_enumeration import CameraEnumerator
+    from database import SettingsDatabase
+    
+    def busy(candidate):
+        return candidate['index'] != 2, '640x480' if candidate['index'] != 2 else 'Busy'
+    
+    with tempfile.TemporaryDirectory() as tmpdir:
+        sysfs = make_sysfs(tmpdir, [(0, 'HD Webcam', 0, 'A1'), (2, 'USB Cam', 0, 'B2')])
+        db = SettingsDatabase(os.path.join(tmpdir, 'test.db'))
+        try:
+            cameras = CameraEnumerator(db, sysfs, busy).enumerate()
+            assert [c['available'] for c in cameras] == [True, False]
+            
+            # The busy camera is free now: only it is opened, and it is found
+            probe = RecordingProbe()
+            cameras = CameraEnumerator(db, sysfs, probe).enumerate()
+            assert probe.opened == [2], probe.opened
+            assert [c['available'] for c in cameras] == [True, True]
+            
+            # Without a device listing, cached unavailable cameras are re-probed as well
+            missing = os.path.join(tmpdir, 'missing')
+            CameraEnumerator(db, missing, busy).enumerate(refresh=True, max_cameras=3)
+            probe = RecordingProbe()
+            cameras = CameraEnumerator(db, missing, probe).enumerate(max_cameras=3)
+            assert probe.opened == [2] and all(c['available'] for c in cameras), (probe.opened, cameras)
+        finally:
+            db.close()
+    print("  ✓ Only cameras cached as unavailable are opened again")
+    return True
+
+
+def test_timeout_per_device():
+    """Test that devices queued behind a hung one still get their own timeout."""
+    print("\nTesting per-device timeouts...")
+    from camera_enumeration import CameraEnumerator
+    
+    with tempfile.TemporaryDirectory() as tmpdir:
+        sysfs = make_sysfs(tmpdir, [(i, f'Cam {i}', 0, f'S{i}') for i in range(3)])
+        probe = RecordingProbe(delay=0.2, hang=(0,))
+        enumerator = CameraEnumerator(None, sysfs, probe, timeout=0.3, max_workers=1)
+        started = time.perf_counter()
+        cameras = enumerator.enumerate()
+        elapsed = time.perf_counter() - started
+        assert [c['info'] for c in cameras] == ['Timed out', '640x480', '640x480'], cameras
+        assert sorted(probe.opened) == [0, 1, 2] and elapsed < 1.2, (probe.opened, elapsed)
+    print(f"  ✓ Hung device timed out, queued devices probed ({elapsed:.2f} s)")
+    return True
+
+
+def main():
+    """Run all tests."""
+    print("=" * 60)
+    print("Camera Enumeration Tests")
+    print("=" * 60)
+    
+    all_passed = True
+    for test in (test_sysfs_listing, test_cached_startup_opens_nothing, test_parallel_probe_with_timeout,
+                 test_timed_out_not_cached, test_without_sysfs, test_unavailable_reprobed,
+                 test_timeout_per_device):
+        try:
+            if not test():
+                all_passed = False
+        except Exception as e:
+            print(f"  ✗ {test.__name__} failed: {e}")
+            all_passed = False
+    
+    print("\n" + "=" * 60)
+    if all_passed:
+        print("✓ All camera enumeration tests passed!")
+    else:
+        print("✗ Some tests failed")
+    print("=" * 60)
+    return 0 if all_passed else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
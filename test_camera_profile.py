@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""
+Test per-camera capture profiles.
+Profiles are applied in driver order when a camera opens, the negotiated
+format is read back, and profiles persist in the database.
+"""
+
+import os
+import sys
+import tempfile
+import cv2
+
+
+class FakeCapture:
+    """Stand-in for cv2.VideoCapture recording requested properties."""
+    
+    # Properties the fake driver refuses to change
+    fixed = {}
+    
+    def __init__(self, source, api=None, opens=True):
+        self.source = source
+        self.api = api
+        self.opened = opens
+        self.calls = []
+        self.props = {
+            cv2.CAP_PROP_FRAME_WIDTH: 640.0,
+            cv2.CAP_PROP_FRAME_HEIGHT: 480.0,
+            cv2.CAP_PROP_FPS: 30.0,
+            cv2.CAP_PROP_FOURCC: float(cv2.VideoWriter_fourcc(*'YUYV')),
+            cv2.CAP_PROP_BUFFERSIZE: 4.0,
+        }
+    
+    def isOpened(self):
+        return self.opened
+    
+    def release(self):
+        self.opened = False
+    
+    def set(self, prop, value):
+        self.calls.append(prop)
+        if prop in self.fixed:
+            return False
+        self.props[prop] = float(value)
+        return True
+    
+    def get(self, prop):
+        return self.props.get(prop, 0.0)
+    
+    def getBackendName(self):
+        return 'FAKE'
+
+
+def make_factory(failing_apis=()):
+    """Build a capture factory whose given backends fail to open."""
+    created = []
+    
+    def factory(source, api=None):
+        capture = FakeCapture(source, api, opens=api not in failing_apis)
+        created.append(capture)
+        return capture
+    return factory, created
+
+
+def test_profile_applied_in_order():
+    """Test that FOURCC is set before size, then fps and buffer size."""
+    print("Testing profile application...")
+    from camera_profile import CameraProfile, open_capture, negotiated_format
+    
+    factory, created = make_factory()
+    profile = CameraProfile(width=1280, height=720, fps=60, fourcc='MJPG', buffer_size=1)
+    capture = open_capture(0, profile, factory)
+    assert capture.calls == [cv2.CAP_PROP_FOURCC, cv2.CAP_PROP_FRAME_WIDTH, cv2.CAP_PROP_FRAME_HEIGHT,
+                             cv2.CAP_PROP_FPS, cv2.CAP_PROP_BUFFERSIZE], capture.calls
+    
+    negotiated = negotiated_format(capture)
+    assert negotiated == {'backend': 'FAKE', 'width': 1280, 'height': 720, 'fps': 60.0,
+                          'fourcc': 'MJPG', 'buffer_size': 1}, negotiated
+    print("  ✓ FOURCC, size, fps, buffer size; values read back")
+    return True
+
+
+def test_default_profile():
+    """Test that an empty profile only shrinks the driver buffer."""
+    print("\nTesting default profile...")
+    from camera_profile import open_capture
+    
+    factory, created = make_factory()
+    capture = open_capture(2, None, factory)
+    assert capture.source == 2 and capture.api is None
+    assert capture.calls == [cv2.CAP_PROP_BUFFERSIZE], capture.calls
+    print("  ✓ Driver defaults kept, buffer size 1")
+    return True
+
+
+def test_backend_selection():
+    """Test explicit backends and the fallback to the default backend."""
+    print("\nTesting backend selection...")
+    from camera_profile import CameraProfile, open_capture
+    
+    factory, created = make_factory()
+    capture = open_capture(1, CameraProfile(backend='v4l2'), factory)
+    assert capture.api == cv2.CAP_V4L2 and capture.isOpened()
+    
+    factory, created = make_factory(failing_apis=(cv2.CAP_V4L2,))
+    capture = open_capture(1, CameraProfile(backend='v4l2'), factory)
+    assert len(created) == 2 and not created[0].isOpened()
+    assert capture.api is None and capture.isOpened(), "Should fall back to the default backend"
+    print("  ✓ V4L2 requested; default backend used when it fails")
+    return True
+
+
+def test_gstreamer_pipeline():
+    """Test GStreamer pipelines with a dropping appsink."""
+    print("\nTesting GStreamer pipelines...")
+    from camera_profile import CameraProfile, open_capture
+    
+    profile = CameraProfile(width=1280, height=720, fps=30, fourcc='MJPG', backend='gstreamer')
+    pipeline = profile.gstreamer_pipeline(2)
+    assert pipeline.startswith('v4l2src device=/dev/video2 ! image/jpeg,width=1280,height=720,framerate=30/1')
+    assert 'appsink drop=true max-buffers=1' in pipeline, pipeline
+    
+    factory, created = make_factory()
+    capture = open_capture(2, profile, factory)
+    assert capture.source == pipeline and capture.api == cv2.CAP_GSTREAMER
+    assert capture.calls == [], "Pipeline caps carry the format; no properties are set"
+    
+    custom = CameraProfile(backend='gstreamer', pipeline='v4l2src device=/dev/video{index} ! appsink drop=true')
+    assert custom.gstreamer_pipeline(3) == 'v4l2src device=/dev/video3 ! appsink drop=true'
+    
+    factory, created = make_factory(failing_apis=(cv2.CAP_GSTREAMER,))
+    capture = open_capture(2, profile, factory)
+    assert capture.source == 2 and capture.isOpened(), "Should fall back when GStreamer is unavailable"
+    print("  ✓ Pipeline built from the profile; custom pipelines and fallback")
+    return True
+
+
+def test_profile_validation():
+    """Test that invalid profiles are rejected."""
+    print("\nTesting profile validation...")
+    from camera_profile import CameraProfile
+    
+    for kwargs in ({'backend': 'nope'}, {'fourcc': 'H264'}, {'width': 640},
+                   {'pipeline': 'videotestsrc ! appsink'}):
+        try:
+            CameraProfile(**kwargs)
+            assert False, f"{kwargs} should raise ValueError"
+        except ValueError:
+            pass
+    print("  ✓ Unknown backend/FOURCC, partial size and stray pipeline rejected")
+    return True
+
+
+def test_mismatches_reported():
+    """Test that refused values are listed."""
+    print("\nTesting mismatch reporting...")
+    from camera_profile import CameraProfile, open_capture, negotiated_format, profile_mismatches, describe_format
+    
+    FakeCapture.fixed = {cv2.CAP_PROP_FPS: True, cv2.CAP_PROP_FOURCC: True}
+    try:
+        factory, created = make_factory()
+        profile = CameraProfile(width=1280, height=720, fps=60, fourcc='MJPG')
+        negotiated = negotiated_format(open_capture(0, profile, factory))
+    finally:
+        FakeCapture.fixed = {}
+    mismatches = profile_mismatches(profile, negotiated)
+    assert mismatches == ['fps: 60 -> 30', 'fourcc: MJPG -> YUYV'], mismatches
+    assert describe_format(negotiated) == '1280x720 @ 30 fps YUYV (FAKE)', describe_format(negotiated)
+    print("  ✓ Refused fps and FOURCC reported")
+    return True
+
+
+def test_profile_database():
+    """Test that camera profiles persist in the database."""
+    print("\nTesting profile storage...")
+    from database import SettingsDatabase
+    from camera_profile import CameraProfile
+    
+    with tempfile.TemporaryDirectory() as tmpdir:
+        db = SettingsDatabase(os.path.join(tmpdir, 'test.db'))
+        try:
+            assert db.get_camera_profile(0) is None
+            profile = CameraProfile(width=1280, height=720, fps=30, fourcc='MJPG', backend='v4l2')
+            db.set_camera_profile(0, profile.to_dict())
+            stored = db.get_camera_profile(0)
+            assert stored == profile.to_dict(), stored
+            assert CameraProfile.from_dict(stored).to_dict() == profile.to_dict()
+            
+            db.set_camera_profile(0, {'fourcc': 'YUYV'})
+            assert db.get_camera_profile(0)['backend'] == 'auto'
+            assert db.get_camera_profile(0)['width'] is None
+            
+            try:
+                db.set_camera_profile(1, {'exposure': 5})
+                assert False, "Unknown fields should raise ValueError"
+            except ValueError:
+                pass
+            
+            db.delete_camera_profile(0)
+            assert db.get_camera_profile(0) is None
+        finally:
+            db.close()
+    print("  ✓ Stored, replaced and deleted per camera")
+    return True
+
+
+def main():
+    """Run all tests."""
+    print("=" * 60)
+    print("Camera Profile Tests")
+    print("=" * 60)
+    
+    all_passed = True
+    for test in (test_profile_applied_in_order, test_default_profile, test_backend_selection,
+                 test_gstreamer_pipeline, test_profile_validation, test_mismatches_reported,
+                 test_profile_database):
+        try:
+            if not test():
+                all_passed = False
+        except Exception as e:
+            print(f"  ✗ {test.__name__} failed: {e}")
+            all_passed = False
+    
+    print("\n" + "=" * 60)
+    if all_passed:
+        print("✓ All camera profile tests passed!")
+    else:
+        print("✗ Some tests failed")
+    print("=" * 60)
+    return 0 if all_passed else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
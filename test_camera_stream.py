@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Test the background capture stream used by the Camera and Training tabs.
+Uses a fake capture device so no camera is required.
+"""
+
+import sys
+import time
+import threading
+
+
+class FakeCapture:
+    """Minimal stand-in for cv2.VideoCapture producing numbered frames."""
+    
+    def __init__(self, frames=None, delay=0.001):
+        self.frames = frames
+        self.delay = delay
+        self.count = 0
+        self.released = False
+    
+    def isOpened(self):
+        return not self.released
+    
+    def read(self):
+        time.sleep(self.delay)
+        if self.released or (self.frames is not None and self.count >= self.frames):
+            return False, None
+        self.count += 1
+        return True, self.count
+    
+    def release(self):
+        self.released = True
+
+
+def test_latest_frame_slot():
+    """Test that read() returns the newest frame and drops older ones."""
+    print("Testing latest-frame slot...")
+    from camera_stream import CameraStream
+    
+    stream = CameraStream(FakeCapture()).start()
+    try:
+        ret, frame = stream.read(timeout=1.0)
+        assert ret, "Expected a frame from the stream"
+        
+        # Let several frames pile up without consuming them
+        time.sleep(0.05)
+        ret, newest = stream.read()
+        assert ret and newest > frame, f"Expected newer frame than {frame}, got {newest}"
+        assert stream.frames_dropped > 0, "Unconsumed frames should be counted as dropped"
+        
+        # Slot is emptied after pickup
+        stream._running = False
+        stream._thread.join(timeout=1.0)
+        stream.read()
+        ret, _ = stream.read()
+        assert not ret, "Slot should be empty after the newest frame was taken"
+        print(f"  ✓ Newest frame returned, {stream.frames_dropped} dropped")
+    finally:
+        stream.release()
+    return True
+
+
+def test_read_does_not_block():
+    """Test that read() without timeout returns immediately."""
+    print("\nTesting non-blocking read...")
+    from camera_stream import CameraStream
+    
+    stream = CameraStream(FakeCapture(delay=0.5)).start()
+    try:
+        start = time.perf_counter()
+        ret, frame = stream.read()
+        elapsed = time.perf_counter() - start
+        assert not ret and frame is None, "No frame should be available yet"
+        assert elapsed < 0.05, f"read() blocked for {elapsed:.3f}s"
+        print("  ✓ read() returns immediately when no frame is ready")
+    finally:
+        stream.release()
+    return True
+
+
+def test_failure_and_release():
+    """Test that a dead device marks the stream failed and release() cleans up."""
+    print("\nTesting failure detection and release...")
+    from camera_stream import CameraStream
+    
+    capture = FakeCapture(frames=3)
+    stream = CameraStream(capture).start()
+    deadline = time.time() + 2.0
+    while not stream.failed and time.time() < deadline:
+        time.sleep(0.01)
+    assert stream.failed, "Stream should be marked failed after repeated read errors"
+    assert stream.frames_captured == 3, f"Expected 3 frames, got {stream.frames_captured}"
+    
+    stream.release()
+    assert capture.released, "Capture device should be released"
+    assert not stream.isOpened(), "Stream should report closed after release"
+    assert not any(t.name == 'camera-capture' for t in threading.enumerate()), \
+        "Capture thread should have stopped"
+    print("  ✓ Failure detected and resources released")
+    return True
+
+
+def test_release_during_blocked_read():
+    """Test that release() never releases the device while a read is in progress."""
+    print("\nTesting release during a blocked read...")
+    from camera_stream import CameraStream
+    
+    class BlockingCapture(FakeCapture):
+        def __init__(self):
+            super().__init__()
+            self.unblock = threading.Event()
+            self.reading = threading.Event()
+            self.released_mid_read = False
+        
+        def read(self):
+            self.reading.set()
+            self.unblock.wait()
+            return True, 1
+        
+        def release(self):
+            self.released_mid_read = self.reading.is_set() and not self.unblock.is_set()
+            super().release()
+    
+    capture = BlockingCapture()
+    stream = CameraStream(capture).start()
+    assert capture.reading.wait(1.0)
+    stream.release()
+    assert not capture.released, "Device must not be released while the worker is in read()"
+    assert not stream.isOpened(), "Stream should report closed after release"
+    
+    capture.unblock.set()
+    deadline = time.time() + 2.0
+    while not capture.released and time.time() < deadline:
+        time.sleep(0.01)
+    assert capture.released and not capture.released_mid_read, "Worker should release the device on exit"
+    ret, _ = stream.read()
+    assert not ret, "A frame read after release() should not be published"
+    print("  ✓ Device released by the worker once its read returned")
+    return True
+
+
+def main():
+    """Run all tests."""
+    print("=" * 60)
+    print("Camera Stream Tests")
+    print("=" * 60)
+    
+    all_passed = True
+    for test in (test_latest_frame_slot, test_read_does_not_block, test_failure_and_release,
+                 test_release_during_blocked_read):
+        try:
+            if not test():
+                all_passed = False
+        except Exception as e:
+            print(f"✗ {test.__name__} failed: {e}")
+            import traceback
+            traceback.print_exc()
+            all_passed = False
+    
+    print("\n" + "=" * 60)
+    if all_passed:
+        print("All tests PASSED ✓")
+        return 0
+    else:
+        print("Some tests FAILED ✗")
+        return 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Test the connection management in SettingsDatabase: persistent per-thread
+connections, WAL journaling and rollback on failed writes.
+"""
+
+import sys
+import os
+import sqlite3
+import tempfile
+import threading
+
+
+def make_db_path():
+    """Create a temporary database file path."""
+    with tempfile.NamedTemporaryFile(mode='wb', delete=False, suffix='.db') as f:
+        return f.name
+
+
+def remove_db(path):
+    """Remove a database file and its WAL side files."""
+    for suffix in ('', '-wal', '-shm'):
+        if os.path.exists(path + suffix):
+            os.remove(path + suffix)
+
+
+def test_wal_and_pragmas():
+    """Test that the database uses WAL with synchronous=NORMAL."""
+    print("Testing journal mode...")
+    from database import SettingsDatabase
+    
+    path = make_db_path()
+    try:
+        db = SettingsDatabase(path)
+        conn = db._connection()
+        assert conn.execute('PRAGMA journal_mode').fetchone()[0] == 'wal'
+        assert conn.execute('PRAGMA synchronous').fetchone()[0] == 1, "Expected NORMAL (1)"
+        db.close()
+        print("  ✓ WAL journaling with synchronous=NORMAL")
+    finally:
+        remove_db(path)
+    return True
+
+
+def test_connection_per_thread():
+    """Test that each thread reuses its own long-lived connection."""
+    print("\nTesting per-thread connections...")
+    from database import SettingsDatabase
+    
+    path = make_db_path()
+    try:
+        db = SettingsDatabase(path)
+        main_conn = db._connection()
+        assert db._connection() is main_conn, "Connection should be reused"
+        
+        worker = {}
+        
+        def use_db():
+            worker['conn'] = db._connection()
+            db.add_exercise_to_workout('squat', sets=2, reps=5)
+        
+        thread = threading.Thread(target=use_db)
+        thread.start()
+        thread.join()
+        
+        assert worker['conn'] is not main_conn, "Threads must not share a connection"
+        assert len(db.get_current_workout()) == 1, "Worker write should be visible"
+        
+        db.close()
+        try:
+            main_conn.execute('SELECT 1')
+            print("  ✗ close() should close all connections")
+            return False
+        except sqlite3.ProgrammingError:
+            pass
+        
+        # The handler reconnects transparently after close()
+        assert db.get_current_workout()[0]['exercise_id'] == 'squat'
+        db.close()
+        print("  ✓ One connection per thread, closed by close()")
+    finally:
+        remove_db(path)
+    return True
+
+
+def test_failed_write_rolls_back():
+    """Test that a failed write does not leave a transaction open."""
+    print("\nTesting rollback on failure...")
+    from database import SettingsDatabase
+    
+    path = make_db_path()
+    try:
+        db = SettingsDatabase(path)
+        try:
+            db.add_exercise_to_workout(None)  # violates NOT NULL
+            print("  ✗ Expected an IntegrityError")
+            return False
+        except sqlite3.IntegrityError:
+            pass
+        
+        assert not db._connection().in_transaction, "Transaction left open after failure"
+        db.add_exercise_to_workout('pushup')
+        assert len(db.get_current_workout()) == 1
+        db.close()
+        print("  ✓ Failed write rolled back")
+    finally:
+        remove_db(path)
+    return True
+
+
+def main():
+    """Run all tests."""
+    print("=" * 60)
+    print("Database Connection Tests")
+    print("=" * 60)
+    
+    all_passed = True
+    for test in (test_wal_and_pragmas, test_connection_per_thread, test_failed_write_rolls_back):
+        try:
+            if not test():
+                all_passed = False
+        except Exception as e:
+            print(f"✗ {test.__name__} failed: {e}")
+            import traceback
+            traceback.print_exc()
+            all_passed = False
+    
+    print("\n" + "=" * 60)
+    if all_passed:
+        print("All tests PASSED ✓")
+        return 0
+    else:
+        print("Some tests FAILED ✗")
+        return 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
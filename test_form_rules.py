@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Test the declarative form-rule compiler.
+Feedback rules from Exercise.form_checks are compiled to arrays, evaluated
+to a bitmask per frame, and the text is built once per distinct bitmask.
+"""
+
+import sys
+import numpy as np
+
+
+def features_for(values):
+    """Build a feature vector from {feature_name: value}."""
+    from form_rules import FEATURE_NAMES
+    features = np.zeros(len(FEATURE_NAMES), dtype=np.float32)
+    for name, value in values.items():
+        features[FEATURE_NAMES.index(name)] = value
+    return features
+
+
+def test_pushup_rules_match_previous_feedback():
+    """Test compiled push-up rules against the former hand-written checks."""
+    print("Testing push-up feedback...")
+    from exercise_detector import FORM_RULES
+    
+    rules = FORM_RULES['pushup']
+    cases = [
+        ({'left_hip': 175, 'left_elbow': 170}, 'Good form!'),
+        ({'left_hip': 175, 'left_elbow': 60}, 'Good depth!'),
+        ({'left_hip': 175, 'left_elbow': 70}, 'Lower a bit more'),
+        ({'left_hip': 150, 'left_elbow': 90}, 'Keep body straight • Lower a bit more'),
+    ]
+    for values, expected in cases:
+        text = rules.feedback(rules.evaluate(features_for(values)))
+        assert text == expected, f"{values}: expected '{expected}', got '{text}'"
+    print(f"  ✓ {len(cases)} cases match")
+    return True
+
+
+def test_plank_and_squat_features():
+    """Test derived features used by the plank and squat rules."""
+    print("\nTesting derived features...")
+    from exercise_detector import FORM_RULES
+    from form_rules import compute_features
+    from joint_angles import joint_angles
+    from posture_detector import LEFT_SHOULDER, LEFT_HIP
+    
+    pixels = np.zeros((33, 2), dtype=np.float32)
+    pixels[LEFT_SHOULDER] = (100, 200)
+    pixels[LEFT_HIP] = (300, 300)
+    features = compute_features(pixels, joint_angles(pixels))
+    
+    plank = FORM_RULES['plank']
+    assert plank.feedback(plank.evaluate(features)) == 'Hips too low - engage core'
+    
+    # Torso leaning forward: vertical/horizontal ratio 0.5 < 1.5
+    squat = FORM_RULES['squat']
+    assert 'Keep chest up' in squat.feedback(squat.evaluate(features))
+    
+    pixels[LEFT_HIP] = (300, 200)
+    features = compute_features(pixels, joint_angles(pixels))
+    assert plank.feedback(plank.evaluate(features)) == 'Perfect alignment!'
+    print("  ✓ Plank and squat features evaluate correctly")
+    return True
+
+
+def test_comparisons_and_bitmask():
+    """Test comparison bounds and bitmask layout."""
+    print("\nTesting comparisons and bitmask...")
+    from form_rules import compile_form_rules
+    
+    rules = compile_form_rules({'rules': [
+        ('left_knee', '<', 90, 'a'),
+        ('left_knee', '<=', 90, 'b'),
+        ('left_knee', '>', 90, 'c'),
+        ('left_knee', '>=', 90, 'd'),
+        ('left_knee', 'between', (80, 90), 'e'),
+    ], 'default': 'none'})
+    assert len(rules) == 5
+    assert rules.evaluate(features_for({'left_knee': 90})) == 0b01010
+    assert rules.evaluate(features_for({'left_knee': 85})) == 0b10011
+    assert rules.evaluate(features_for({'left_knee': 95})) == 0b01100
+    assert rules.feedback(0) == 'none'
+    assert rules.feedback(0b10011) == 'a • b • e'
+    print("  ✓ Bounds and bit positions are correct")
+    return True
+
+
+def test_feedback_cached_per_mask():
+    """Test that feedback text is only built once per bitmask."""
+    print("\nTesting feedback cache...")
+    from form_rules import compile_form_rules
+    
+    rules = compile_form_rules({'rules': [
+        ('left_knee', '<', 90, 'Deep'),
+        ('right_knee', '<', 90, 'Deep'),
+    ]})
+    first = rules.feedback(0b11)
+    assert first == 'Deep', f"Duplicate messages should be merged, got '{first}'"
+    assert rules.feedback(0b11) is first, "Text should be reused for the same mask"
+    print("  ✓ Text reused and duplicate messages merged")
+    return True
+
+
+def test_invalid_rules():
+    """Test that invalid rules are rejected at compile time."""
+    print("\nTesting invalid rules...")
+    from form_rules import compile_form_rules
+    
+    for rule in (('left_toe', '<', 90, 'x'), ('left_knee', '==', 90, 'x')):
+        try:
+            compile_form_rules({'rules': [rule]})
+            assert False, f"Rule should be rejected: {rule}"
+        except ValueError:
+            pass
+    print("  ✓ Invalid rules raise ValueError")
+    return True
+
+
+def main():
+    """Run all tests."""
+    print("=" * 60)
+    print("Form Rule Tests")
+    print("=" * 60)
+    
+    all_passed = True
+    for test in (test_pushup_rules_match_previous_feedback, test_plank_and_squat_features,
+                 test_comparisons_and_bitmask, test_feedback_cached_per_mask, test_invalid_rules):
+        try:
+            if not test():
+                all_passed = False
+        except Exception as e:
+            print(f"  ✗ {test.__name__} failed: {e}")
+            all_passed = False
+    
+    print("\n" + "=" * 60)
+    if all_passed:
+        print("✓ All form rule tests passed!")
+    else:
+        print("✗ Some tests failed")
+    print("=" * 60)
+    return 0 if all_passed else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Test the reused display texture helper.
+Kivy's Texture is mocked so no OpenGL context is required.
+"""
+
+import sys
+import unittest.mock as mock
+import numpy as np
+
+
+class FakeTexture:
+    """Records texture operations performed by FrameDisplay."""
+    
+    def __init__(self, size):
+        self.size = size
+        self.flipped = 0
+        self.blits = []
+    
+    def flip_vertical(self):
+        self.flipped += 1
+    
+    def blit_buffer(self, buf, colorfmt='rgb', bufferfmt='ubyte', mipmap_generation=True):
+        self.blits.append((buf, colorfmt, bufferfmt))
+
+
+def make_widget():
+    """Create a stand-in for a Kivy Image widget."""
+    widget = mock.MagicMock()
+    widget.texture = None
+    return widget
+
+
+def test_texture_reused_across_frames():
+    """Test that one texture is created per display size and reused."""
+    print("Testing texture reuse...")
+    import frame_display
+    
+    with mock.patch('frame_display.Texture') as texture_cls:
+        create = texture_cls.create
+        create.side_effect = lambda size, colorfmt: FakeTexture(size)
+        display = frame_display.FrameDisplay()
+        widget = make_widget()
+        frame = np.zeros((48, 64, 3), dtype=np.uint8)
+        
+        for _ in range(5):
+            display.show(widget, frame)
+        
+        assert create.call_count == 1, f"Expected 1 texture, created {create.call_count}"
+        assert widget.texture is display.texture, "Widget should show the display texture"
+        assert display.texture.flipped == 1, "Texture should be flipped once, on creation"
+        assert len(display.texture.blits) == 5, "Every frame should be uploaded"
+        assert widget.canvas.ask_update.call_count == 4, "Canvas should be refreshed on reuse"
+        
+        # A new frame size needs a new texture
+        display.show(widget, np.zeros((96, 128, 3), dtype=np.uint8))
+        assert create.call_count == 2, "Size change should create a new texture"
+        assert tuple(display.texture.size) == (128, 96)
+        print("  ✓ Texture created once per size and reused")
+    return True
+
+
+def test_blit_uses_frame_buffer():
+    """Test that frames are uploaded without flipping or copying to bytes."""
+    print("\nTesting zero-copy upload...")
+    import frame_display
+    
+    with mock.patch('frame_display.Texture') as texture_cls:
+        texture_cls.create.side_effect = lambda size, colorfmt: FakeTexture(size)
+        display = frame_display.FrameDisplay()
+        widget = make_widget()
+        frame = np.arange(4 * 6 * 3, dtype=np.uint8).reshape(4, 6, 3)
+        
+        display.show(widget, frame)
+        buf, colorfmt, bufferfmt = display.texture.blits[0]
+        
+        assert isinstance(buf, np.ndarray) and buf.ndim == 1, "Expected a 1-D numpy buffer"
+        assert np.shares_memory(buf, frame), "Buffer should be a view of the frame"
+        assert np.array_equal(buf, frame.reshape(-1)), "Rows must not be flipped on the CPU"
+        assert (colorfmt, bufferfmt) == ('bgr', 'ubyte')
+        
+        display.clear(widget)
+        assert widget.texture is None, "clear() should detach the texture"
+        assert display.texture is not None, "clear() should keep the texture for reuse"
+        print("  ✓ Frame uploaded from its own buffer")
+    return True
+
+
+def main():
+    """Run all tests."""
+    print("=" * 60)
+    print("Frame Display Tests")
+    print("=" * 60)
+    
+    all_passed = True
+    for test in (test_texture_reused_across_frames, test_blit_uses_frame_buffer):
+        try:
+            if not test():
+                all_passed = False
+        except Exception as e:
+            print(f"✗ {test.__name__} failed: {e}")
+            import traceback
+            traceback.print_exc()
+            all_passed = False
+    
+    print("\n" + "=" * 60)
+    if all_passed:
+        print("All tests PASSED ✓")
+        return 0
+    else:
+        print("Some tests FAILED ✗")
+        return 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Test the threaded inference/analysis pipeline without a camera or GUI.
+"""
+
+import sys
+import time
+import threading
+
+
+class FakeStream:
+    """Stand-in for CameraStream that yields numbered frames."""
+    
+    def __init__(self, frames):
+        self.frames = list(range(1, frames + 1))
+        self.failed = False
+    
+    def read(self, timeout=None):
+        if not self.frames:
+            time.sleep(timeout or 0)
+            return False, None
+        return True, self.frames.pop(0)
+
+
+def wait_for(condition, timeout=2.0):
+    """Poll until condition() is true or the timeout expires."""
+    deadline = time.time() + timeout
+    while not condition() and time.time() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+
+def test_stages_run_on_worker_threads():
+    """Test that inference and analysis run off the calling thread."""
+    print("Testing stage threads...")
+    from frame_pipeline import FramePipeline
+    
+    main_thread = threading.current_thread().name
+    stage_threads = set()
+    results = []
+    
+    def infer(frame):
+        stage_threads.add(threading.current_thread().name)
+        return frame * 10
+    
+    def analyze(frame, pose_result):
+        stage_threads.add(threading.current_thread().name)
+        return (frame, pose_result)
+    
+    pipeline = FramePipeline(FakeStream(5), infer, analyze, results.append,
+                             queue_size=10, name='test').start()
+    try:
+        assert wait_for(lambda: len(results) == 5), f"Expected 5 results, got {len(results)}"
+        assert all(pose == frame * 10 for frame, pose in results), "Stage outputs not paired"
+        assert main_thread not in stage_threads, "Stages must not run on the calling thread"
+        assert stage_threads == {'test-inference', 'test-analysis'}, stage_threads
+        print("  ✓ Inference and analysis ran on worker threads")
+    finally:
+        pipeline.stop()
+    assert not pipeline.is_running, "Pipeline should be stopped"
+    return True
+
+
+def test_dispatch_coalesces_results():
+    """Test that only the newest result is delivered when the consumer lags."""
+    print("\nTesting result dispatch...")
+    from frame_pipeline import FramePipeline
+    
+    pending = []
+    delivered = []
+    pipeline = FramePipeline(FakeStream(20), lambda f: f, lambda f, p: f,
+                             delivered.append, dispatch=pending.append, queue_size=20).start()
+    try:
+        assert wait_for(lambda: pipeline.frames_processed == 20), "Not all frames processed"
+        assert len(pending) == 1, f"Expected one pending delivery, got {len(pending)}"
+        pending.pop()()
+        assert delivered == [20], f"Expected only the newest result, got {delivered}"
+        print("  ✓ Lagging consumer receives the newest result once")
+    finally:
+        pipeline.stop()
+    return True
+
+
+def test_bounded_queue_drops_oldest():
+    """Test that a slow analysis stage causes old frames to be dropped."""
+    print("\nTesting bounded queue...")
+    from frame_pipeline import FramePipeline
+    
+    results = []
+    
+    def slow_analyze(frame, pose_result):
+        time.sleep(0.02)
+        return frame
+    
+    pipeline = FramePipeline(FakeStream(30), lambda f: f, slow_analyze, results.append,
+                             queue_size=1).start()
+    try:
+        assert wait_for(lambda: results and results[-1] == 30), "Newest frame never analyzed"
+        assert pipeline.frames_dropped > 0, "Expected dropped frames with a full queue"
+        assert len(results) + pipeline.frames_dropped == 30, "Frames lost without being counted"
+        print(f"  ✓ {pipeline.frames_dropped} stale frames dropped, newest analyzed")
+    finally:
+        pipeline.stop()
+    return True
+
+
+def test_stage_errors_do_not_stop_pipeline():
+    """Test that an exception in a stage is counted and skipped."""
+    print("\nTesting stage error handling...")
+    from frame_pipeline import FramePipeline
+    
+    results = []
+    
+    def infer(frame):
+        if frame == 2:
+            raise RuntimeError("bad frame")
+        return frame
+    
+    pipeline = FramePipeline(FakeStream(4), infer, lambda f, p: f, results.append,
+                             queue_size=10).start()
+    try:
+        assert wait_for(lambda: len(results) == 3), f"Expected 3 results, got {results}"
+        assert pipeline.errors == 1, f"Expected 1 error, got {pipeline.errors}"
+        print("  ✓ Failed frame skipped, pipeline kept running")
+    finally:
+        pipeline.stop()
+    return True
+
+
+def main():
+    """Run all tests."""
+    print("=" * 60)
+    print("Frame Pipeline Tests")
+    print("=" * 60)
+    
+    all_passed = True
+    for test in (test_stages_run_on_worker_threads, test_dispatch_coalesces_results,
+                 test_bounded_queue_drops_oldest, test_stage_errors_do_not_stop_pipeline):
+        try:
+            if not test():
+                all_passed = False
+        except Exception as e:
+            print(f"✗ {test.__name__} failed: {e}")
+            import traceback
+            traceback.print_exc()
+            all_passed = False
+    
+    print("\n" + "=" * 60)
+    if all_passed:
+        print("All tests PASSED ✓")
+        return 0
+    else:
+        print("Some tests FAILED ✗")
+        return 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
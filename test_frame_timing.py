@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+"""
+Test per-stage frame timing.
+Stages are recorded into fixed-size rolling histograms, the detectors and
+camera stream time their stages when given a FrameTimings, and the app
+exposes the timings and draws them as an optional HUD.
+"""
+
+import os
+import sys
+import threading
+import time
+import types
+
+# Set up headless mode
+os.environ['KIVY_NO_CONSOLELOG'] = '1'
+os.environ['KIVY_NO_ARGS'] = '1'
+os.environ['KIVY_GL_BACKEND'] = 'mock'
+
+import numpy as np
+
+
+def test_histogram_percentiles():
+    """Test percentiles against exact values and the fixed memory size."""
+    print("Testing latency histogram...")
+    from frame_timing import LatencyHistogram, BUCKET_COUNT
+    
+    histogram = LatencyHistogram(window=60.0)
+    for us in range(1, 1001):
+        histogram.record(us * 1000)
+    stats = histogram.stats()
+    assert stats['count'] == 1000
+    for pct, exact in ((50, 0.5), (95, 0.95), (99, 0.99)):
+        # Bucket upper bounds: within one bucket (~9%) above the exact value
+        assert exact <= stats[f'p{pct}'] <= exact * 1.1, (pct, stats[f'p{pct}'])
+    assert stats['max'] == 1.0 and abs(stats['mean'] - 0.5005) < 1e-9
+    assert len(histogram._current) == BUCKET_COUNT + 1, "Histogram must not grow"
+    
+    histogram.record(60 * 10**9)  # beyond the last bucket
+    assert histogram.stats()['max'] == 60000.0
+    assert len(histogram._current) == BUCKET_COUNT + 1
+    print(f"  ✓ p50 {stats['p50']:.3f} p95 {stats['p95']:.3f} p99 {stats['p99']:.3f} ms, fixed size")
+    return True
+
+
+def test_rolling_window():
+    """Test that old samples age out after two windows."""
+    print("\nTesting rolling window...")
+    from frame_timing import LatencyHistogram
+    
+    histogram = LatencyHistogram(window=1.0)
+    start = histogram._window_start
+    for i in range(100):
+        histogram.record(50_000_000, start + i)  # 50 ms
+    histogram.record(1_000_000, start + 1_500_000_000)  # next window: 1 ms
+    stats = histogram.stats()
+    assert stats['count'] == 101 and stats['p50'] >= 50.0, stats
+    
+    histogram.record(1_000_000, start + 2_600_000_000)  # the 50 ms window has aged out
+    stats = histogram.stats()
+    assert stats['count'] == 2 and stats['max'] < 1.1, stats
+    
+    histogram.record(2_000_000, start + 9_000_000_000)  # idle: both windows are stale
+    assert histogram.stats()['count'] == 1
+    assert histogram.total == 103
+    print("  ✓ Percentiles follow the last one to two windows")
+    return True
+
+
+def test_frame_timings_snapshot():
+    """Test stage timing, FPS, drop counters and snapshot order."""
+    print("\nTesting FrameTimings...")
+    from frame_timing import FrameTimings, STAGE_CAPTURE, STAGE_TEXT, STAGE_UPLOAD, format_snapshot
+    
+    timings = FrameTimings('test')
+    with timings.stage(STAGE_UPLOAD):
+        time.sleep(0.002)
+    timings.record(STAGE_CAPTURE, 5_000_000)
+    timings.record('custom', 1_000)
+    timings.record(STAGE_TEXT, 1_000)
+    for _ in range(11):
+        timings.frame_shown()
+        time.sleep(0.01)
+    dropped = {'count': 3}
+    timings.watch_drops('camera', lambda: dropped['count'])
+    
+    snapshot = timings.snapshot()
+    assert list(snapshot['stages']) == [STAGE_CAPTURE, STAGE_TEXT, STAGE_UPLOAD, 'custom'], snapshot['stages']
+    assert snapshot['stages'][STAGE_UPLOAD]['p50'] >= 2.0
+    assert 40 < snapshot['fps'] < 110, snapshot['fps']
+    assert snapshot['frames_shown'] == 11 and snapshot['dropped'] == {'camera': 3}
+    
+    rows = format_snapshot(snapshot)
+    assert rows[0][0].endswith('dropped: camera 3'), rows[0]
+    assert [row[0] for row in rows[2:]] == [STAGE_CAPTURE, STAGE_TEXT, STAGE_UPLOAD, 'custom']
+    print(f"  ✓ Stages in pipeline order, {snapshot['fps']:.0f} fps, drops reported")
+    return True
+
+
+class FakePose:
+    """Stand-in for a MediaPipe Pose graph."""
+    
+    def process(self, image):
+        time.sleep(0.001)
+        return types.SimpleNamespace(pose_landmarks=None)
+
+
+def test_detector_stages():
+    """Test that detection, form checks and capture reads are timed."""
+    print("\nTesting instrumented stages...")
+    from frame_timing import (FrameTimings, STAGE_CAPTURE, STAGE_CONVERT, STAGE_INFERENCE, STAGE_DRAW,
+                              STAGE_FORM, STAGE_TEXT)
+    from posture_detector import PostureDetector
+    from exercise_detector import ExerciseDetector
+    from camera_stream import CameraStream
+    
+    timings = FrameTimings('test')
+    detector = PostureDetector.__new__(PostureDetector)
+    detector.pose = FakePose()
+    detector._lock = threading.Lock()
+    detector.draw_overlay = lambda frame, result: None
+    frame = np.zeros((120, 160, 3), dtype=np.uint8)
+    result = detector.detect(frame, timings=timings)
+    assert timings.histogram(STAGE_INFERENCE).stats()['p50'] >= 1.0
+    
+    exercise = ExerciseDetector.__new__(ExerciseDetector)
+    exercise.posture_detector = detector
+    exercise.rep_counters = {}
+    exercise.evaluate(frame, result, 'squat', timings=timings)
+    
+    class FakeCapture:
+        def read(self):
+            time.sleep(0.005)
+            return True, frame
+        
+        def isOpened(self):
+            return True
+        
+        def release(self):
+            pass
+    
+    stream = CameraStream(FakeCapture(), timings=timings).start()
+    assert stream.read(timeout=1.0)[0]
+    stream.release()
+    
+    stages = timings.snapshot()['stages']
+    for stage in (STAGE_CAPTURE, STAGE_CONVERT, STAGE_INFERENCE, STAGE_DRAW, STAGE_FORM, STAGE_TEXT):
+        assert stages.get(stage, {}).get('count'), f"{stage} not recorded: {list(stages)}"
+    assert stages[STAGE_CAPTURE]['p50'] >= 5.0
+    
+    # Without timings nothing is recorded and detection still works
+    assert detector.detect(frame).has_pose is False
+    print("  ✓ capture, conversion, inference, drawing, form checks and text timed")
+    return True
+
+
+def test_hud_drawn():
+    """Test that the HUD is drawn in the bottom-left corner only."""
+    print("\nTesting timing HUD...")
+    from frame_timing import FrameTimings, STAGE_INFERENCE, draw_timings
+    
+    timings = FrameTimings('test')
+    timings.record(STAGE_INFERENCE, 12_000_000)
+    frame = np.full((480, 640, 3), 128, dtype=np.uint8)
+    draw_timings(frame, timings)
+    assert np.all(frame[:300] == 128), "HUD should stay at the bottom"
+    assert np.any(frame[440:, :100] != 128), "HUD not drawn"
+    assert np.all(frame[:, 400:] == 128), "HUD should stay on the left"
+    
+    rows = timings.hud_rows()
+    timings.record(STAGE_INFERENCE, 90_000_000)
+    assert timings.hud_rows() is rows, "HUD text should be cached between refreshes"
+    print("  ✓ Drawn bottom-left; text refreshed at most every HUD_REFRESH")
+    return True
+
+
+def test_app_timings():
+    """Test the app's timing API, HUD toggle and tracking analysis stages."""
+    print("\nTesting app integration...")
+    import unittest.mock as mock
+    with mock.patch('kivy.core.window.Window'):
+        import main
+        from frame_timing import FrameTimings, STAGE_DRAW, STAGE_FORM, STAGE_TEXT, STAGE_LATENCY
+        
+        with mock.patch('main.SettingsDatabase') as mock_db:
+            mock_db.return_value.get_theme.return_value = 'dark'
+            app = main.PostureTrackerApp()
+    
+    assert app.frame_timings('tracking') is None
+    assert app.perf_overlay is False, "Overlay should be off unless the setting says otherwise"
+    
+    app.tracking_timings = FrameTimings('tracking')
+    app.detector = types.SimpleNamespace(draw_overlay=lambda frame, result: None)
+    app.sample_writer = None
+    app.tilt_threshold = 15.0
+    pose_result = types.SimpleNamespace(tilt_angle=3.0, has_pose=False)
+    
+    frame = np.full((480, 640, 3), 128, dtype=np.uint8)
+    app.analyze_tracking_frame(frame, pose_result)
+    app.record_tracking_latency(0.02)
+    assert np.all(frame[300:, :] == 128), "HUD drawn while the overlay is off"
+    
+    app.toggle_perf_overlay()
+    assert app.perf_overlay
+    app.db.set_perf_overlay.assert_called_with(True)
+    app.analyze_tracking_frame(frame, pose_result)
+    assert np.any(frame[440:, :100] != 128), "HUD not drawn with the overlay on"
+    
+    snapshot = app.frame_timings('tracking')
+    for stage in (STAGE_DRAW, STAGE_FORM, STAGE_TEXT):
+        assert snapshot['stages'][stage]['count'] == 2, stage
+    assert 20.0 <= snapshot['stages'][STAGE_LATENCY]['p50'] <= 22.0
+    
+    app.on_setting_changed('perf_overlay', '0')
+    assert not app.perf_overlay
+    print("  ✓ Stages recorded, snapshot API, overlay toggled and persisted")
+    return True
+
+
+def main():
+    """Run all tests."""
+    print("=" * 60)
+    print("Frame Timing Tests")
+    print("=" * 60)
+    
+    all_passed = True
+    for test in (test_histogram_percentiles, test_rolling_window, test_frame_timings_snapshot,
+                 test_detector_stages, test_hud_drawn, test_app_timings):
+        try:
+            if not test():
+                all_passed = False
+        except Exception as e:
+            print(f"  ✗ {test.__name__} failed: {e}")
+            all_passed = False
+    
+    print("\n" + "=" * 60)
+    if all_passed:
+        print("✓ All frame timing tests passed!")
+    else:
+        print("✗ Some tests failed")
+    print("=" * 60)
+    return 0 if all_passed else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
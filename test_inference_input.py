@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Test the separate inference resolution.
+Frames are downscaled and converted to RGB into reused buffers for
+inference, while landmarks still map onto the full-resolution frame.
+"""
+
+import os
+import sys
+import tempfile
+import threading
+import numpy as np
+
+from test_roi_tracker import BrightBoxPose
+
+
+def test_target_size():
+    """Test inference sizes for various frames."""
+    print("Testing target sizes...")
+    from inference_input import InferenceInput, NATIVE_RESOLUTION
+    
+    preparer = InferenceInput(480)
+    assert preparer.target_size(1920, 1080) == (853, 480)
+    assert preparer.target_size(640, 480) == (640, 480), "Frames at the target size are not scaled"
+    assert preparer.target_size(320, 240) == (320, 240), "Small frames are never upscaled"
+    assert InferenceInput(NATIVE_RESOLUTION).target_size(1920, 1080) == (1920, 1080)
+    print("  ✓ Aspect ratio kept, no upscaling")
+    return True
+
+
+def test_prepare_reuses_buffers():
+    """Test that prepare converts to RGB into reused buffers."""
+    print("\nTesting buffer reuse and color conversion...")
+    from inference_input import InferenceInput
+    
+    preparer = InferenceInput(240)
+    frame = np.zeros((1080, 1920, 3), dtype=np.uint8)
+    frame[:, :, 0] = 200  # blue in BGR
+    
+    first = preparer.prepare(frame)
+    assert first.shape == (240, 427, 3) and first.dtype == np.uint8
+    assert first[0, 0, 2] == 200 and first[0, 0, 0] == 0, "Expected BGR -> RGB conversion"
+    created = preparer.buffers_created
+    
+    second = preparer.prepare(frame)
+    assert second is first, "Buffer should be reused for same-size frames"
+    assert preparer.buffers_created == created
+    
+    # Non-contiguous crops work and get their own buffer size
+    crop = preparer.prepare(frame[100:700, 300:900])
+    assert crop.shape == (240, 240, 3)
+    print("  ✓ Buffers reused; RGB output at inference size")
+    return True
+
+
+def test_detect_maps_to_display_frame():
+    """Test that landmarks from a downscaled image map onto the full frame."""
+    print("\nTesting landmark projection onto the display frame...")
+    from inference_input import InferenceInput
+    from posture_detector import PostureDetector
+    
+    detector = PostureDetector.__new__(PostureDetector)
+    detector.pose = BrightBoxPose()
+    detector._lock = threading.Lock()
+    
+    frame = np.zeros((1080, 1920, 3), dtype=np.uint8)
+    frame[300:800, 800:1100] = 255
+    result = detector.detect(frame, inference_input=InferenceInput(360))
+    assert detector.pose.shapes[-1] == (360, 640), f"Unexpected inference size {detector.pose.shapes[-1]}"
+    assert (result.width, result.height) == (1920, 1080)
+    assert abs(result.pixels[:, 0].min() - 800) <= 4, result.pixels[:, 0].min()
+    assert abs(result.pixels[:, 1].max() - 800) <= 4, result.pixels[:, 1].max()
+    print("  ✓ Landmarks land on the full-resolution frame")
+    return True
+
+
+def test_resolution_setting():
+    """Test the inference resolution setting."""
+    print("\nTesting inference resolution setting...")
+    from database import SettingsDatabase
+    
+    with tempfile.TemporaryDirectory() as tmpdir:
+        db = SettingsDatabase(os.path.join(tmpdir, 'test.db'))
+        try:
+            assert db.get_inference_resolution() == 480
+            db.set_inference_resolution(0)
+            assert db.get_inference_resolution() == 0
+            try:
+                db.set_inference_resolution(123)
+                assert False, "Unsupported resolution should raise ValueError"
+            except ValueError:
+                pass
+        finally:
+            db.close()
+    print("  ✓ Setting persists and validates")
+    return True
+
+
+def test_settings_tab_widget():
+    """Test that the Settings tab exposes the inference resolution."""
+    print("\nTesting Settings tab...")
+    with open(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'posture_tracker.kv')) as f:
+        kv_content = f.read()
+    assert 'inference_resolution_spinner' in kv_content
+    print("  ✓ Inference resolution spinner present")
+    return True
+
+
+def main():
+    """Run all tests."""
+    print("=" * 60)
+    print("Inference Resolution Tests")
+    print("=" * 60)
+    
+    all_passed = True
+    for test in (test_target_size, test_prepare_reuses_buffers, test_detect_maps_to_display_frame,
+                 test_resolution_setting, test_settings_tab_widget):
+        try:
+            if not test():
+                all_passed = False
+        except Exception as e:
+            print(f"  ✗ {test.__name__} failed: {e}")
+            all_passed = False
+    
+    print("\n" + "=" * 60)
+    if all_passed:
+        print("✓ All inference resolution tests passed!")
+    else:
+        print("✗ Some tests failed")
+    print("=" * 60)
+    return 0 if all_passed else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
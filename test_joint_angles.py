@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Test the vectorized joint angle kernel.
+joint_angles must match the scalar calculate_angle helper and work on a
+single frame as well as a (T, 33, 4) sequence.
+"""
+
+import sys
+import numpy as np
+
+
+def test_matches_scalar_angles():
+    """Test kernel output against ExerciseDetector.calculate_angle."""
+    print("Testing kernel against scalar angles...")
+    from joint_angles import joint_angles, JOINT_TRIPLETS, JOINT_NAMES
+    from exercise_detector import ExerciseDetector
+    
+    detector = ExerciseDetector.__new__(ExerciseDetector)
+    rng = np.random.default_rng(0)
+    pixels = rng.uniform(0, 640, size=(33, 2)).astype(np.float32)
+    
+    angles = joint_angles(pixels)
+    assert angles.shape == (len(JOINT_TRIPLETS),), f"Unexpected shape {angles.shape}"
+    assert len(JOINT_NAMES) == len(JOINT_TRIPLETS)
+    for (a, b, c), angle in zip(JOINT_TRIPLETS, angles):
+        expected = detector.calculate_angle(pixels[a], pixels[b], pixels[c])
+        assert abs(angle - expected) < 1e-3, f"Angle mismatch: {angle} vs {expected}"
+    print(f"  ✓ {len(angles)} angles match the scalar helper")
+    return True
+
+
+def test_sequence_and_scale():
+    """Test a (T, 33, 4) sequence of normalized landmarks."""
+    print("\nTesting time axis and frame scaling...")
+    from joint_angles import joint_angles, JOINT_TRIPLETS
+    
+    rng = np.random.default_rng(1)
+    sequence = rng.uniform(0, 1, size=(20, 33, 4)).astype(np.float32)
+    
+    angles = joint_angles(sequence, scale=(640, 480))
+    assert angles.shape == (20, len(JOINT_TRIPLETS)), f"Unexpected shape {angles.shape}"
+    
+    # Each frame of the batch equals the single-frame result in pixels
+    pixels = sequence[5, :, :2] * np.array([640, 480], dtype=np.float32)
+    assert np.allclose(angles[5], joint_angles(pixels), atol=1e-3)
+    print("  ✓ Sequence angles match per-frame angles")
+    return True
+
+
+def test_custom_triplets_and_degenerate():
+    """Test a custom triplet table and coincident points."""
+    print("\nTesting custom triplets and degenerate joints...")
+    from joint_angles import joint_angles
+    
+    pixels = np.zeros((33, 2), dtype=np.float32)
+    pixels[1] = (1, 0)
+    pixels[2] = (0, 1)
+    pixels[3] = (-1, 0)
+    angles = joint_angles(pixels, triplets=[(1, 0, 2), (1, 0, 3), (4, 0, 5)])
+    assert np.allclose(angles, [90, 180, 0], atol=1e-3), f"Unexpected angles {angles}"
+    print("  ✓ Right, straight and degenerate angles are correct")
+    return True
+
+
+def main():
+    """Run all tests."""
+    print("=" * 60)
+    print("Joint Angle Kernel Tests")
+    print("=" * 60)
+    
+    all_passed = True
+    for test in (test_matches_scalar_angles, test_sequence_and_scale,
+                 test_custom_triplets_and_degenerate):
+        try:
+            if not test():
+                all_passed = False
+        except Exception as e:
+            print(f"  ✗ {test.__name__} failed: {e}")
+            all_passed = False
+    
+    print("\n" + "=" * 60)
+    if all_passed:
+        print("✓ All joint angle tests passed!")
+    else:
+        print("✗ Some tests failed")
+    print("=" * 60)
+    return 0 if all_passed else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
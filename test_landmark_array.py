@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Test the array-backed landmark representation.
+Pose landmarks are converted once per frame into a (33, 4) array and form
+checks index pixel coordinates by landmark ID.
+"""
+
+import sys
+import numpy as np
+
+
+class FakeLandmark:
+    """Stand-in for a MediaPipe NormalizedLandmark."""
+    
+    def __init__(self, x, y, z=0.0, visibility=1.0):
+        self.x = x
+        self.y = y
+        self.z = z
+        self.visibility = visibility
+
+
+class FakeLandmarkList:
+    """Stand-in for a MediaPipe NormalizedLandmarkList."""
+    
+    def __init__(self, points):
+        self.landmark = [FakeLandmark(*p) for p in points]
+
+
+def make_landmarks(overrides=None):
+    """Build 33 landmarks at the frame center with optional overrides."""
+    points = [(0.5, 0.5, 0.0, 1.0)] * 33
+    for index, point in (overrides or {}).items():
+        points[index] = point
+    return FakeLandmarkList(points)
+
+
+def test_landmarks_to_array():
+    """Test conversion to a (33, 4) float32 array."""
+    print("Testing landmarks_to_array...")
+    from posture_detector import landmarks_to_array, NUM_LANDMARKS, LEFT_SHOULDER, X, Y, VISIBILITY
+    
+    landmarks = make_landmarks({LEFT_SHOULDER: (0.25, 0.75, 0.1, 0.9)})
+    points = landmarks_to_array(landmarks)
+    assert points.shape == (NUM_LANDMARKS, 4), f"Unexpected shape {points.shape}"
+    assert points.dtype == np.float32, f"Unexpected dtype {points.dtype}"
+    assert np.isclose(points[LEFT_SHOULDER, X], 0.25)
+    assert np.isclose(points[LEFT_SHOULDER, Y], 0.75)
+    assert np.isclose(points[LEFT_SHOULDER, VISIBILITY], 0.9)
+    print("  ✓ Landmarks converted to (33, 4) float32")
+    return True
+
+
+def test_pose_result_pixels():
+    """Test that PoseResult exposes pixel coordinates by landmark ID."""
+    print("\nTesting PoseResult pixel coordinates...")
+    from posture_detector import PoseResult, LEFT_SHOULDER, RIGHT_SHOULDER
+    
+    landmarks = make_landmarks({LEFT_SHOULDER: (0.25, 0.5, 0.0, 1.0),
+                                RIGHT_SHOULDER: (0.75, 0.5, 0.0, 1.0)})
+    result = PoseResult(landmarks, 640, 480)
+    assert result.has_pose
+    assert result.pixels.shape == (33, 2)
+    assert np.allclose(result.pixels[LEFT_SHOULDER], (160, 240))
+    assert np.allclose(result.pixels[RIGHT_SHOULDER], (480, 240))
+    print("  ✓ Pixel coordinates computed once from the array")
+    return True
+
+
+def test_calculate_angle():
+    """Test the scalar angle helper."""
+    print("\nTesting calculate_angle...")
+    from exercise_detector import ExerciseDetector
+    
+    detector = ExerciseDetector.__new__(ExerciseDetector)
+    assert abs(detector.calculate_angle((1, 0), (0, 0), (0, 1)) - 90) < 1e-6
+    assert abs(detector.calculate_angle((1, 0), (0, 0), (-1, 0)) - 180) < 1e-6
+    assert detector.calculate_angle((0, 0), (0, 0), (1, 0)) == 0, "Degenerate angle should be 0"
+    assert detector.calculate_angle(None, (0, 0), (1, 0)) == 0
+    print("  ✓ Angles computed correctly")
+    return True
+
+
+def test_form_checks_use_pixels():
+    """Test form checks on synthetic pixel arrays."""
+    print("\nTesting form checks on landmark arrays...")
+    from exercise_detector import ExerciseDetector
+    from posture_detector import LEFT_SHOULDER, LEFT_HIP, LEFT_KNEE, LEFT_ANKLE
+    
+    from joint_angles import joint_angles
+    
+    detector = ExerciseDetector.__new__(ExerciseDetector)
+    detector.rep_counters = {}
+    
+    # Plank: hips well below shoulders
+    pixels = np.zeros((33, 2), dtype=np.float32)
+    pixels[LEFT_SHOULDER] = (100, 200)
+    pixels[LEFT_HIP] = (300, 300)
+    feedback = detector.check_form('plank', pixels, joint_angles(pixels))
+    assert 'Hips too low' in feedback['feedback'], feedback
+    
+    # Squat: straight leg then deep bend then straight counts one rep
+    pixels[LEFT_SHOULDER] = (300, 100)
+    pixels[LEFT_HIP] = (300, 200)
+    pixels[LEFT_ANKLE] = (300, 400)
+    pixels[LEFT_KNEE] = (300, 300)
+    detector.count_reps('squat', joint_angles(pixels), 0.0)
+    pixels[LEFT_KNEE] = (400, 200)
+    pixels[LEFT_ANKLE] = (300, 200)
+    feedback = detector.check_form('squat', pixels, joint_angles(pixels))
+    assert 'Great depth!' in feedback['feedback'], feedback
+    detector.count_reps('squat', joint_angles(pixels), 1.0)
+    detector.count_reps('squat', joint_angles(pixels), 2.0)
+    pixels[LEFT_KNEE] = (300, 300)
+    pixels[LEFT_ANKLE] = (300, 400)
+    detector.count_reps('squat', joint_angles(pixels), 3.0)
+    reps = detector.count_reps('squat', joint_angles(pixels), 4.0)
+    assert reps == 1, f"Expected 1 rep, got {reps}"
+    print("  ✓ Form checks index pixels by landmark ID")
+    return True
+
+
+def main():
+    """Run all tests."""
+    print("=" * 60)
+    print("Landmark Array Tests")
+    print("=" * 60)
+    
+    all_passed = True
+    for test in (test_landmarks_to_array, test_pose_result_pixels,
+                 test_calculate_angle, test_form_checks_use_pixels):
+        try:
+            if not test():
+                all_passed = False
+        except Exception as e:
+            print(f"  ✗ {test.__name__} failed: {e}")
+            all_passed = False
+    
+    print("\n" + "=" * 60)
+    if all_passed:
+        print("✓ All landmark array tests passed!")
+    else:
+        print("✗ Some tests failed")
+    print("=" * 60)
+    return 0 if all_passed else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Test temporal landmark smoothing.
+Filters must reduce per-frame jitter on the whole landmark array, follow
+real movement, and feed smoothed landmarks back into PoseResult.
+"""
+
+import os
+import sys
+import tempfile
+import numpy as np
+
+
+def jittery_sequence(frames=120, noise=0.01, seed=0):
+    """Static landmarks with Gaussian jitter, shape (frames, 33, 4)."""
+    rng = np.random.default_rng(seed)
+    base = rng.uniform(0.2, 0.8, size=(33, 4)).astype(np.float32)
+    return base, base + rng.normal(0, noise, size=(frames, 33, 4)).astype(np.float32)
+
+
+def run_filter(landmark_filter, sequence, fps=30.0):
+    """Feed a sequence through a filter and stack the outputs."""
+    return np.stack([landmark_filter.filter(points, i / fps) for i, points in enumerate(sequence)])
+
+
+def test_filters_reduce_jitter():
+    """Test that both filters reduce jitter on still landmarks."""
+    print("Testing jitter reduction...")
+    from landmark_filter import EmaLandmarkFilter, OneEuroLandmarkFilter
+    
+    base, sequence = jittery_sequence()
+    raw_error = np.abs(sequence[30:] - base).mean()
+    for landmark_filter in (EmaLandmarkFilter(alpha=0.3), OneEuroLandmarkFilter()):
+        smoothed = run_filter(landmark_filter, sequence)
+        assert smoothed.shape == sequence.shape and smoothed.dtype == np.float32
+        error = np.abs(smoothed[30:] - base).mean()
+        assert error < raw_error * 0.7, \
+            f"{type(landmark_filter).__name__}: error {error:.4f} vs raw {raw_error:.4f}"
+        print(f"  ✓ {type(landmark_filter).__name__}: jitter {raw_error:.4f} -> {error:.4f}")
+    return True
+
+
+def test_one_euro_follows_movement():
+    """Test that the One Euro filter keeps up with fast movement."""
+    print("\nTesting One Euro lag on movement...")
+    from landmark_filter import OneEuroLandmarkFilter
+    
+    landmark_filter = OneEuroLandmarkFilter()
+    sequence = np.zeros((60, 33, 4), dtype=np.float32)
+    sequence[:, :, 0] = np.linspace(0.0, 1.0, 60)[:, None]  # 0.5 units/s at 30 fps
+    smoothed = run_filter(landmark_filter, sequence)
+    lag = abs(float(smoothed[-1, 0, 0] - sequence[-1, 0, 0]))
+    assert lag < 0.05, f"Filter lags movement by {lag:.3f}"
+    print(f"  ✓ Lag after steady movement: {lag:.4f}")
+    return True
+
+
+def test_reset_and_factory():
+    """Test filter reset and the mode factory."""
+    print("\nTesting reset and factory...")
+    from landmark_filter import create_landmark_filter, EmaLandmarkFilter, OneEuroLandmarkFilter
+    
+    assert create_landmark_filter('off') is None
+    assert isinstance(create_landmark_filter('ema'), EmaLandmarkFilter)
+    assert isinstance(create_landmark_filter('one_euro'), OneEuroLandmarkFilter)
+    try:
+        create_landmark_filter('median')
+        assert False, "Unknown mode should raise ValueError"
+    except ValueError:
+        pass
+    
+    landmark_filter = EmaLandmarkFilter(alpha=0.1)
+    landmark_filter.filter(np.zeros((33, 4)))
+    landmark_filter.reset()
+    ones = np.ones((33, 4), dtype=np.float32)
+    assert np.allclose(landmark_filter.filter(ones), ones), "Reset filter should start from the new frame"
+    print("  ✓ Factory and reset work")
+    return True
+
+
+def test_smooth_updates_pose_result():
+    """Test PostureDetector.smooth on a PoseResult."""
+    print("\nTesting PostureDetector.smooth...")
+    from posture_detector import PostureDetector, PoseResult, LEFT_SHOULDER, RIGHT_SHOULDER
+    from landmark_filter import EmaLandmarkFilter
+    
+    detector = PostureDetector.__new__(PostureDetector)
+    landmark_filter = EmaLandmarkFilter(alpha=0.5)
+    
+    points = np.full((33, 4), 0.5, dtype=np.float32)
+    points[LEFT_SHOULDER, :2] = (0.25, 0.5)
+    points[RIGHT_SHOULDER, :2] = (0.75, 0.5)
+    first = detector.smooth(PoseResult(None, 640, 480, points=points.copy()), landmark_filter, 0.0)
+    assert first.tilt_angle == 0
+    
+    points[RIGHT_SHOULDER, 1] = 0.7
+    second = detector.smooth(PoseResult(None, 640, 480, points=points.copy()), landmark_filter, 1 / 30)
+    assert np.isclose(second.points[RIGHT_SHOULDER, 1], 0.6), second.points[RIGHT_SHOULDER]
+    assert np.allclose(second.pixels[RIGHT_SHOULDER], (480, 288))
+    assert second.right_shoulder == (480, 288), second.right_shoulder
+    assert second.tilt_angle > 0
+    
+    # Lost pose resets the filter
+    detector.smooth(PoseResult(None, 640, 480), landmark_filter)
+    third = detector.smooth(PoseResult(None, 640, 480, points=points.copy()), landmark_filter, 2 / 30)
+    assert np.isclose(third.points[RIGHT_SHOULDER, 1], 0.7)
+    print("  ✓ Smoothed points, pixels and tilt are updated")
+    return True
+
+
+def test_smoothing_setting():
+    """Test the landmark smoothing setting."""
+    print("\nTesting landmark smoothing setting...")
+    from database import SettingsDatabase
+    
+    with tempfile.TemporaryDirectory() as tmpdir:
+        db = SettingsDatabase(os.path.join(tmpdir, 'test.db'))
+        try:
+            assert db.get_landmark_smoothing() == 'one_euro'
+            db.set_landmark_smoothing('ema')
+            assert db.get_landmark_smoothing() == 'ema'
+            try:
+                db.set_landmark_smoothing('median')
+                assert False, "Invalid mode should raise ValueError"
+            except ValueError:
+                pass
+        finally:
+            db.close()
+    print("  ✓ Setting persists and validates")
+    return True
+
+
+def main():
+    """Run all tests."""
+    print("=" * 60)
+    print("Landmark Smoothing Tests")
+    print("=" * 60)
+    
+    all_passed = True
+    for test in (test_filters_reduce_jitter, test_one_euro_follows_movement,
+                 test_reset_and_factory, test_smooth_updates_pose_result,
+                 test_smoothing_setting):
+        try:
+            if not test():
+                all_passed = False
+        except Exception as e:
+            print(f"  ✗ {test.__name__} failed: {e}")
+            all_passed = False
+    
+    print("\n" + "=" * 60)
+    if all_passed:
+        print("✓ All landmark smoothing tests passed!")
+    else:
+        print("✗ Some tests failed")
+    print("=" * 60)
+    return 0 if all_passed else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
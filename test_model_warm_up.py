@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+Test lazy MediaPipe loading and the background model warm-up.
+Importing the detector modules must not load MediaPipe; the app loads and
+warms up the pose engine on a background thread while the Start buttons
+show a loading state.
+"""
+
+import os
+import subprocess
+import sys
+import threading
+import types
+
+# Set up headless mode
+os.environ['KIVY_NO_CONSOLELOG'] = '1'
+os.environ['KIVY_NO_ARGS'] = '1'
+os.environ['KIVY_GL_BACKEND'] = 'mock'
+
+import numpy as np
+
+
+def test_import_is_lazy():
+    """Test that importing the detector modules does not import MediaPipe."""
+    print("Testing lazy import...")
+    code = ("import sys, posture_detector, exercise_detector, pose_engine; "
+            "print('mediapipe' in sys.modules)")
+    output = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True,
+                            cwd=os.path.dirname(os.path.abspath(__file__)), timeout=120)
+    assert output.returncode == 0, output.stderr
+    assert output.stdout.strip().splitlines()[-1] == 'False', "mediapipe was imported at module load"
+    print("  ✓ MediaPipe not imported with the detector modules")
+    return True
+
+
+def test_load_mediapipe_once():
+    """Test that MediaPipe is imported once and cached."""
+    print("\nTesting load_mediapipe...")
+    from posture_detector import load_mediapipe
+    
+    mp = load_mediapipe()
+    assert hasattr(mp.solutions, 'pose')
+    assert load_mediapipe() is mp
+    print("  ✓ Module loaded and cached")
+    return True
+
+
+def test_warm_up_inference():
+    """Test that warm_up runs one inference on a blank image."""
+    print("\nTesting warm-up inference...")
+    from posture_detector import PostureDetector, WARM_UP_SIZE
+    
+    class RecordingPose:
+        def __init__(self):
+            self.images = []
+        
+        def process(self, image):
+            self.images.append(image)
+            return types.SimpleNamespace(pose_landmarks=None)
+    
+    detector = PostureDetector.__new__(PostureDetector)
+    detector.pose = RecordingPose()
+    detector._lock = threading.Lock()
+    seconds = detector.warm_up()
+    assert len(detector.pose.images) == 1
+    image = detector.pose.images[0]
+    assert image.shape == (WARM_UP_SIZE, WARM_UP_SIZE, 3) and not np.any(image)
+    assert seconds >= 0
+    print("  ✓ One blank inference, timing returned")
+    return True
+
+
+class GatedEngine:
+    """Fake pose engine whose warm-up waits for a test signal."""
+    
+    release_warm_up = threading.Event()
+    
+    def __init__(self, **options):
+        self.options = options
+        self.warmed_up = False
+    
+    def warm_up(self):
+        assert self.release_warm_up.wait(10)
+        self.warmed_up = True
+        return 0.01
+    
+    def release(self):
+        pass
+
+
+class Ids(dict):
+    """Stand-in for Kivy ids."""
+    
+    def __getattr__(self, key):
+        return self[key]
+
+
+def test_background_warm_up():
+    """Test the loading state and engine reuse after warm-up."""
+    print("\nTesting background warm-up...")
+    import unittest.mock as mock
+    with mock.patch('kivy.core.window.Window'):
+        import main
+        from pose_engine import PoseEngineRegistry
+        
+        with mock.patch('main.SettingsDatabase') as mock_db:
+            mock_db.return_value.get_theme.return_value = 'dark'
+            app = main.PostureTrackerApp()
+    
+    app.ids = Ids(start_button=types.SimpleNamespace(text='Start Tracking', disabled=False),
+                  training_start_button=types.SimpleNamespace(text='Start Exercise', disabled=False))
+    app.pose_engines = PoseEngineRegistry(GatedEngine)
+    loaded = threading.Event()
+    app.dispatch_to_ui = lambda callback: (callback(), loaded.set())
+    
+    app.warm_up_pose_engine()
+    assert app.model_loading
+    for button in app.ids.values():
+        assert button.disabled and button.text == 'Loading model…', button
+    app.warm_up_pose_engine()  # no second load while the first runs
+    
+    GatedEngine.release_warm_up.set()
+    assert loaded.wait(10), "Warm-up never finished"
+    assert not app.model_loading
+    assert app.ids.start_button.text == 'Start Tracking' and not app.ids.start_button.disabled
+    assert app.ids.training_start_button.text == 'Start Exercise'
+    
+    engine = app.preloaded_engine
+    assert engine is not None and engine.warmed_up
+    assert engine.options == {'model_complexity': main.DEFAULT_MODEL_COMPLEXITY}
+    assert app.acquire_pose_engine() is engine, "Starting a tab should reuse the warmed-up engine"
+    assert app.pose_engines.refcount(engine) == 2
+    print("  ✓ Buttons show loading, engine warmed up once and reused")
+    return True
+
+
+def test_background_load_keeps_stderr():
+    """Test that loading off the main thread leaves the process's stderr alone."""
+    print("\nTesting stderr during a background load...")
+    code = (
+        "import sys, threading\n"
+        "from posture_detector import suppress_stderr\n"
+        "inside, done = threading.Event(), threading.Event()\n"
+        "def load():\n"
+        "    with suppress_stderr():\n"
+        "        inside.set()\n"
+        "        done.wait(5)\n"
+        "thread = threading.Thread(target=load)\n"
+        "thread.start()\n"
+        "inside.wait(5)\n"
+        "print('ui-thread-log', file=sys.stderr, flush=True)\n"
+        "done.set()\n"
+        "thread.join()\n"
+        "with suppress_stderr():\n"
+        "    print('main-thread-hidden', file=sys.stderr, flush=True)\n"
+    )
+    result = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True,
+                            cwd=os.path.dirname(os.path.abspath(__file__)), timeout=60)
+    assert result.returncode == 0, result.stderr
+    assert 'ui-thread-log' in result.stderr, "UI thread output was swallowed during a background load"
+    assert 'main-thread-hidden' not in result.stderr
+    print("  ✓ Other threads keep stderr while the model loads in the background")
+    return True
+
+
+def main():
+    """Run all tests."""
+    print("=" * 60)
+    print("Model Warm-up Tests")
+    print("=" * 60)
+    
+    all_passed = True
+    for test in (test_import_is_lazy, test_load_mediapipe_once, test_warm_up_inference,
+                 test_background_warm_up, test_background_load_keeps_stderr):
+        try:
+            if not test():
+                all_passed = False
+        except Exception as e:
+            print(f"  ✗ {test.__name__} failed: {e}")
+            all_passed = False
+    
+    print("\n" + "=" * 60)
+    if all_passed:
+        print("✓ All model warm-up tests passed!")
+    else:
+        print("✗ Some tests failed")
+    print("=" * 60)
+    return 0 if all_passed else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+Test inference decimation with landmark extrapolation.
+Inference must run on every Nth frame only, N must follow measured timings
+unless pinned, and in-between frames must get extrapolated landmarks.
+"""
+
+import os
+import sys
+import tempfile
+import time
+import numpy as np
+
+
+class MovingPoseInfer:
+    """Fake inference: landmarks move right at a constant speed."""
+    
+    def __init__(self, delay=0.0, speed=0.5, has_pose=True):
+        self.delay = delay
+        self.speed = speed
+        self.has_pose = has_pose
+        self.calls = 0
+        self.start = time.monotonic()
+    
+    def position(self, timestamp):
+        """Landmark x at a given time."""
+        return 0.1 + self.speed * (timestamp - self.start)
+    
+    def __call__(self, frame):
+        from posture_detector import PoseResult
+        self.calls += 1
+        points = None
+        if self.has_pose:
+            points = np.full((33, 4), 0.5, dtype=np.float32)
+            points[:, 0] = self.position(time.monotonic())
+        if self.delay:
+            time.sleep(self.delay)
+        h, w = frame.shape[:2]
+        return PoseResult(None, w, h, points=points)
+
+
+def make_engine():
+    """PostureDetector without a MediaPipe graph (only shoulder helpers are used)."""
+    from posture_detector import PostureDetector
+    return PostureDetector.__new__(PostureDetector)
+
+
+def run_frames(stage, count, interval):
+    """Feed frames at a fixed interval and return the results."""
+    frame = np.zeros((48, 64, 3), dtype=np.uint8)
+    results = []
+    for _ in range(count):
+        results.append((time.monotonic(), stage(frame)))
+        time.sleep(interval)
+    return results
+
+
+def test_every_frame_when_pinned_to_one():
+    """Test that decimation 1 infers every frame synchronously."""
+    print("Testing decimation pinned to 1...")
+    from pose_decimation import DecimatedPoseInference
+    
+    infer = MovingPoseInfer()
+    stage = DecimatedPoseInference(make_engine(), infer, decimation=1)
+    results = run_frames(stage, 10, 0.0)
+    assert infer.calls == 10, f"Expected 10 inferences, got {infer.calls}"
+    assert all(result.has_pose for _, result in results)
+    assert stage.frames == stage.inferences == 10, (stage.frames, stage.inferences)
+    stage.close()
+    print("  ✓ Every frame inferred")
+    return True
+
+
+def test_pinned_decimation():
+    """Test that a pinned N runs inference on every Nth frame."""
+    print("\nTesting pinned decimation...")
+    from pose_decimation import DecimatedPoseInference
+    
+    infer = MovingPoseInfer()
+    stage = DecimatedPoseInference(make_engine(), infer, decimation=4)
+    run_frames(stage, 40, 0.005)
+    stage.close()
+    assert stage.decimation == 4
+    assert 8 <= infer.calls <= 11, f"Expected ~10 inferences, got {infer.calls}"
+    assert stage.frames == 40 and stage.inferences == infer.calls
+    print(f"  ✓ {infer.calls} inferences for 40 frames")
+    return True
+
+
+def test_auto_decimation_and_extrapolation():
+    """Test automatic N from slow inference and extrapolated landmarks."""
+    print("\nTesting automatic decimation and extrapolation...")
+    from pose_decimation import DecimatedPoseInference
+    
+    infer = MovingPoseInfer(delay=0.03)
+    stage = DecimatedPoseInference(make_engine(), infer)
+    started = time.monotonic()
+    results = run_frames(stage, 60, 0.01)
+    elapsed = time.monotonic() - started
+    stage.close()
+    
+    assert stage.decimation >= 3, f"Expected N >= 3 for 30 ms inference at 10 ms frames, got {stage.decimation}"
+    assert infer.calls < 30, f"Too many inferences: {infer.calls}"
+    assert elapsed < 60 * 0.01 + 0.3, f"Frames were blocked by inference ({elapsed:.2f}s)"
+    
+    # Later frames track the moving landmarks closely
+    errors = [abs(float(result.points[0, 0]) - infer.position(timestamp))
+              for timestamp, result in results[20:] if result.has_pose]
+    assert errors, "Expected pose results"
+    assert max(errors) < 0.03, f"Extrapolation error too large: {max(errors):.3f}"
+    print(f"  ✓ N={stage.decimation}, {infer.calls} inferences, max error {max(errors):.4f}")
+    return True
+
+
+def test_no_pose():
+    """Test that frames without a detected pose stay empty."""
+    print("\nTesting frames without pose...")
+    from pose_decimation import DecimatedPoseInference
+    
+    stage = DecimatedPoseInference(make_engine(), MovingPoseInfer(has_pose=False), decimation=2)
+    results = run_frames(stage, 10, 0.005)
+    stage.close()
+    assert not any(result.has_pose for _, result in results)
+    print("  ✓ No pose reported")
+    return True
+
+
+def test_invalid_decimation():
+    """Test that out-of-range settings are rejected."""
+    print("\nTesting invalid decimation...")
+    from pose_decimation import DecimatedPoseInference, MAX_DECIMATION
+    
+    try:
+        DecimatedPoseInference(make_engine(), MovingPoseInfer(), decimation=MAX_DECIMATION + 1)
+        assert False, "Invalid decimation should raise ValueError"
+    except ValueError:
+        pass
+    print("  ✓ Invalid decimation raises ValueError")
+    return True
+
+
+def test_decimation_setting():
+    """Test the per-stream decimation setting."""
+    print("\nTesting per-stream decimation setting...")
+    from database import SettingsDatabase
+    
+    with tempfile.TemporaryDirectory() as tmpdir:
+        db = SettingsDatabase(os.path.join(tmpdir, 'test.db'))
+        try:
+            assert db.get_inference_decimation('tracking') == 0, "Default should be automatic"
+            db.set_inference_decimation('training', 3)
+            assert db.get_inference_decimation('training') == 3
+            assert db.get_inference_decimation('tracking') == 0, "Streams are configured separately"
+            try:
+                db.set_inference_decimation('tracking', 99)
+                assert False, "Out-of-range decimation should raise ValueError"
+            except ValueError:
+                pass
+        finally:
+            db.close()
+    print("  ✓ Setting is stored per stream")
+    return True
+
+
+def main():
+    """Run all tests."""
+    print("=" * 60)
+    print("Inference Decimation Tests")
+    print("=" * 60)
+    
+    all_passed = True
+    for test in (test_every_frame_when_pinned_to_one, test_pinned_decimation,
+                 test_auto_decimation_and_extrapolation, test_no_pose, test_invalid_decimation,
+                 test_decimation_setting):
+        try:
+            if not test():
+                all_passed = False
+        except Exception as e:
+            print(f"  ✗ {test.__name__} failed: {e}")
+            all_passed = False
+    
+    print("\n" + "=" * 60)
+    if all_passed:
+        print("✓ All inference decimation tests passed!")
+    else:
+        print("✗ Some tests failed")
+    print("=" * 60)
+    return 0 if all_passed else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
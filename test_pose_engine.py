@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Test the shared, reference-counted pose engine registry.
+Uses a fake engine factory so MediaPipe graphs are not built.
+"""
+
+import sys
+import threading
+import time
+
+
+class FakeEngine:
+    """Stand-in for PostureDetector that records release()."""
+    
+    created = 0
+    
+    def __init__(self, **options):
+        FakeEngine.created += 1
+        self.options = options
+        self.released = False
+    
+    def release(self):
+        self.released = True
+
+
+def test_engine_shared_and_lazy():
+    """Test that engines are created lazily and shared between users."""
+    print("Testing lazy shared engine...")
+    from pose_engine import PoseEngineRegistry
+    
+    FakeEngine.created = 0
+    registry = PoseEngineRegistry(FakeEngine, idle_timeout=60)
+    assert FakeEngine.created == 0, "Engine should not be created before first acquire"
+    assert not registry.is_loaded()
+    
+    tracking = registry.acquire()
+    training = registry.acquire()
+    assert tracking is training, "Both users should get the same engine"
+    assert FakeEngine.created == 1, f"Expected 1 engine, created {FakeEngine.created}"
+    assert registry.refcount(tracking) == 2
+    
+    # Different options get a separate engine
+    lite = registry.acquire(model_complexity=0)
+    assert lite is not tracking and lite.options == {'model_complexity': 0}
+    
+    registry.shutdown()
+    assert tracking.released and lite.released, "shutdown() should close all engines"
+    print("  ✓ One engine shared per option set")
+    return True
+
+
+def test_idle_release():
+    """Test that unreferenced engines are closed after the idle timeout."""
+    print("\nTesting idle release...")
+    from pose_engine import PoseEngineRegistry
+    
+    registry = PoseEngineRegistry(FakeEngine, idle_timeout=0.05)
+    engine = registry.acquire()
+    registry.acquire()
+    
+    registry.release(engine)
+    time.sleep(0.1)
+    assert not engine.released, "Engine with outstanding references must stay open"
+    
+    registry.release(engine)
+    assert registry.is_loaded(), "Engine should stay loaded during the idle timeout"
+    
+    # Re-acquiring within the timeout cancels the release
+    assert registry.acquire() is engine
+    time.sleep(0.1)
+    assert not engine.released, "Re-acquired engine must not be closed"
+    
+    registry.release(engine)
+    time.sleep(0.15)
+    assert engine.released, "Idle engine should be closed after the timeout"
+    assert not registry.is_loaded()
+    
+    # The next acquire builds a fresh engine
+    fresh = registry.acquire()
+    assert fresh is not engine and not fresh.released
+    registry.shutdown()
+    print("  ✓ Idle engine released after timeout")
+    return True
+
+
+def test_immediate_release():
+    """Test that an idle timeout of 0 closes the engine right away."""
+    print("\nTesting immediate release...")
+    from pose_engine import PoseEngineRegistry
+    
+    registry = PoseEngineRegistry(FakeEngine, idle_timeout=0)
+    engine = registry.acquire()
+    registry.release(engine)
+    assert engine.released, "Engine should be closed immediately"
+    
+    # Releasing an unknown engine is a no-op
+    registry.release(engine)
+    print("  ✓ Engine closed on last release")
+    return True
+
+
+def test_build_outside_lock():
+    """Test that a slow engine build blocks neither other engines nor releases."""
+    print("\nTesting engine build outside the lock...")
+    from pose_engine import PoseEngineRegistry
+    
+    gate = threading.Event()
+    
+    def factory(**options):
+        if options.get('model_complexity') == 2:
+            assert gate.wait(5), "Build was never unblocked"
+        return FakeEngine(**options)
+    
+    FakeEngine.created = 0
+    registry = PoseEngineRegistry(factory, idle_timeout=0)
+    results = []
+    builders = [threading.Thread(target=lambda: results.append(registry.acquire(model_complexity=2)))
+                for _ in range(2)]
+    for thread in builders:
+        thread.start()
+    time.sleep(0.05)
+    
+    # While the heavy model builds, other engines come and go without waiting
+    started = time.monotonic()
+    light = registry.acquire(model_complexity=1)
+    registry.release(light)
+    assert light.released and time.monotonic() - started < 0.5, "Blocked behind a pending build"
+    assert not registry.is_loaded(model_complexity=2)
+    
+    gate.set()
+    for thread in builders:
+        thread.join(5)
+    assert len(results) == 2 and results[0] is results[1], "Concurrent callers should share one build"
+    assert FakeEngine.created == 2 and registry.refcount(results[0]) == 2
+    
+    # A failed build is reported to the caller and can be retried
+    def failing(**options):
+        raise RuntimeError("model download failed")
+    registry = PoseEngineRegistry(failing)
+    for _ in range(2):
+        try:
+            registry.acquire()
+            assert False, "Build error should propagate"
+        except RuntimeError:
+            pass
+    print("  ✓ Builds run unlocked, are shared by waiters and propagate errors")
+    return True
+
+
+def main():
+    """Run all tests."""
+    print("=" * 60)
+    print("Pose Engine Registry Tests")
+    print("=" * 60)
+    
+    all_passed = True
+    for test in (test_engine_shared_and_lazy, test_idle_release, test_immediate_release,
+                 test_build_outside_lock):
+        try:
+            if not test():
+                all_passed = False
+        except Exception as e:
+            print(f"✗ {test.__name__} failed: {e}")
+            import traceback
+            traceback.print_exc()
+            all_passed = False
+    
+    print("\n" + "=" * 60)
+    if all_passed:
+        print("All tests PASSED ✓")
+        return 0
+    else:
+        print("Some tests FAILED ✗")
+        return 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
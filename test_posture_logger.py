@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Test batched posture sample logging.
+Samples must be buffered in memory and written by the background writer in
+batches, not one transaction per sample.
+"""
+
+import sys
+import os
+import time
+import tempfile
+
+
+def make_db():
+    """Create a SettingsDatabase on a temporary file."""
+    from database import SettingsDatabase
+    with tempfile.NamedTemporaryFile(mode='wb', delete=False, suffix='.db') as f:
+        path = f.name
+    return SettingsDatabase(path), path
+
+
+def remove_db(db, path):
+    """Close and delete a temporary database."""
+    db.close()
+    for suffix in ('', '-wal', '-shm'):
+        if os.path.exists(path + suffix):
+            os.remove(path + suffix)
+
+
+class CountingDatabase:
+    """Wraps a database and counts add_posture_samples() calls."""
+    
+    def __init__(self, db):
+        self.db = db
+        self.batches = []
+    
+    def add_posture_samples(self, samples):
+        self.batches.append(len(samples))
+        self.db.add_posture_samples(samples)
+
+
+def test_log_is_buffered():
+    """Test that log() only buffers and flush() writes one batch."""
+    print("Testing buffered logging...")
+    from posture_logger import PostureSampleWriter
+    
+    db, path = make_db()
+    try:
+        counting = CountingDatabase(db)
+        writer = PostureSampleWriter(counting, flush_interval=60, max_batch=1000)
+        for i in range(90):
+            writer.log(i * 0.5, i % 3 == 0, timestamp=1000.0 + i / 30.0)
+        assert counting.batches == [], "log() must not write to the database"
+        assert writer.pending == 90
+        
+        assert writer.flush() == 90
+        assert counting.batches == [90], f"Expected one batch of 90, got {counting.batches}"
+        
+        samples = db.get_posture_samples()
+        assert len(samples) == 90
+        assert samples[3]['is_bad_posture'] and not samples[4]['is_bad_posture']
+        assert samples[0]['timestamp'] == 1000.0
+        print("  ✓ Samples buffered and written in one batch")
+    finally:
+        remove_db(db, path)
+    return True
+
+
+def test_background_flush_triggers():
+    """Test that the writer flushes on batch size and on interval."""
+    print("\nTesting flush triggers...")
+    from posture_logger import PostureSampleWriter
+    
+    db, path = make_db()
+    try:
+        counting = CountingDatabase(db)
+        writer = PostureSampleWriter(counting, flush_interval=0.2, max_batch=10).start()
+        
+        # Reaching max_batch wakes the writer early
+        for i in range(10):
+            writer.log(5.0, False)
+        deadline = time.time() + 0.15
+        while not counting.batches and time.time() < deadline:
+            time.sleep(0.005)
+        assert counting.batches == [10], f"Full batch not flushed early: {counting.batches}"
+        
+        # A partial batch is flushed after the interval
+        writer.log(30.0, True)
+        time.sleep(0.35)
+        assert counting.batches == [10, 1], f"Interval flush missing: {counting.batches}"
+        
+        # stop() writes whatever is left
+        writer.log(1.0, False)
+        writer.stop()
+        assert sum(counting.batches) == 12 and writer.samples_written == 12
+        assert len(db.get_posture_samples()) == 12
+        print("  ✓ Flushed on batch size, interval and stop")
+    finally:
+        remove_db(db, path)
+    return True
+
+
+class FlakyDatabase(CountingDatabase):
+    """Database whose first writes fail as if it were locked."""
+    
+    def __init__(self, db, failures):
+        super().__init__(db)
+        self.failures = failures
+    
+    def add_posture_samples(self, samples):
+        if self.failures:
+            self.failures -= 1
+            raise RuntimeError("database is locked")
+        super().add_posture_samples(samples)
+
+
+def test_failed_flush_retried():
+    """Test that a failed batch is kept, in order and capped, for the next flush."""
+    print("\nTesting failed flushes...")
+    from posture_logger import PostureSampleWriter
+    
+    db, path = make_db()
+    try:
+        flaky = FlakyDatabase(db, failures=2)
+        writer = PostureSampleWriter(flaky, flush_interval=60, max_batch=1000, max_pending=50)
+        for i in range(30):
+            writer.log(1.0, False, timestamp=1000.0 + i)
+        assert writer.flush() == 0 and writer.pending == 30, "Failed batch should be kept"
+        
+        for i in range(30, 60):
+            writer.log(1.0, False, timestamp=1000.0 + i)
+        assert writer.flush() == 0
+        assert writer.pending == 50 and writer.samples_dropped == 10, (writer.pending, writer.samples_dropped)
+        
+        assert writer.flush() == 50 and writer.pending == 0
+        timestamps = [sample['timestamp'] for sample in db.get_posture_samples()]
+        assert timestamps == [1000.0 + i for i in range(10, 60)], timestamps[:3]
+        print("  ✓ Batch retried on the next flush; oldest samples dropped beyond the cap")
+    finally:
+        remove_db(db, path)
+    return True
+
+
+def main():
+    """Run all tests."""
+    print("=" * 60)
+    print("Posture Logger Tests")
+    print("=" * 60)
+    
+    all_passed = True
+    for test in (test_log_is_buffered, test_background_flush_triggers, test_failed_flush_retried):
+        try:
+            if not test():
+                all_passed = False
+        except Exception as e:
+            print(f"✗ {test.__name__} failed: {e}")
+            import traceback
+            traceback.print_exc()
+            all_passed = False
+    
+    print("\n" + "=" * 60)
+    if all_passed:
+        print("All tests PASSED ✓")
+        return 0
+    else:
+        print("Some tests FAILED ✗")
+        return 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
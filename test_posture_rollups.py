@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+Test the incrementally maintained posture rollups and the range statistics
+query in SettingsDatabase.
+"""
+
+import sys
+import random
+import sqlite3
+import tempfile
+
+from test_posture_logger import make_db, remove_db
+
+
+DAY = 86400
+
+
+def make_samples(start, count, seed=7):
+    """Generate sorted random samples spread over a few days."""
+    rng = random.Random(seed)
+    timestamps = sorted(start + rng.uniform(0, 3 * DAY) for _ in range(count))
+    return [(t, rng.uniform(0, 40), rng.random() < 0.3, rng.uniform(0, 1)) for t in timestamps]
+
+
+def brute_force(samples, lo, hi):
+    """Compute expected statistics directly from the raw samples."""
+    selected = [s for s in samples if lo <= s[0] < hi]
+    tracked = sum(s[3] for s in selected)
+    bad = sum(s[3] for s in selected if s[2])
+    return {
+        'sample_count': len(selected),
+        'average_tilt': sum(s[1] for s in selected) / len(selected) if selected else 0.0,
+        'min_tilt': min((s[1] for s in selected), default=0.0),
+        'max_tilt': max((s[1] for s in selected), default=0.0),
+        'tracked_seconds': tracked,
+        'bad_seconds': bad,
+        'bad_posture_percent': 100.0 * bad / tracked if tracked else 0.0,
+    }
+
+
+def assert_stats_equal(actual, expected):
+    """Compare statistics dictionaries with float tolerance."""
+    assert actual['sample_count'] == expected['sample_count'], (actual, expected)
+    for key in expected:
+        assert abs(actual[key] - expected[key]) < 1e-6, f"{key}: {actual[key]} != {expected[key]}"
+
+
+def test_stats_match_raw_samples():
+    """Test that rollup-based statistics equal a brute-force computation."""
+    print("Testing range statistics...")
+    db, path = make_db()
+    try:
+        base = 1700000000 - 1700000000 % DAY
+        samples = make_samples(base, 3000)
+        # Insert in several batches, as the background writer would
+        for i in range(0, len(samples), 250):
+            db.add_posture_samples(samples[i:i + 250])
+        
+        rng = random.Random(3)
+        ranges = [(base, base + DAY), (base - DAY, base + 5 * DAY), (base + 1234.5, base + 1300)]
+        ranges += [tuple(sorted((base + rng.uniform(0, 3 * DAY), base + rng.uniform(0, 3 * DAY))))
+                   for _ in range(30)]
+        for lo, hi in ranges:
+            assert_stats_equal(db.get_posture_stats(lo, hi), brute_force(samples, lo, hi))
+        print(f"  ✓ {len(ranges)} ranges match raw samples")
+    finally:
+        remove_db(db, path)
+    return True
+
+
+def test_aligned_range_uses_rollups_only():
+    """Test that whole-day ranges never scan the raw sample table."""
+    print("\nTesting coarsest-bucket query...")
+    db, path = make_db()
+    try:
+        base = 1700000000 - 1700000000 % DAY
+        db.add_posture_samples(make_samples(base, 500))
+        
+        statements = []
+        db._connection().set_trace_callback(statements.append)
+        stats = db.get_posture_stats(base, base + 2 * DAY)
+        db._connection().set_trace_callback(None)
+        
+        assert stats['sample_count'] > 0
+        assert not any('posture_samples' in sql for sql in statements), \
+            "Aligned range should be answered from rollups"
+        assert len(statements) == 1, f"Expected a single day-bucket query, got {len(statements)}"
+        print("  ✓ Whole days answered from day buckets")
+    finally:
+        remove_db(db, path)
+    return True
+
+
+def test_rebuild_matches_incremental():
+    """Test that rebuilding rollups reproduces the incremental result."""
+    print("\nTesting rollup rebuild...")
+    db, path = make_db()
+    try:
+        base = 1700000000 - 1700000000 % DAY
+        samples = make_samples(base, 800, seed=11)
+        for i in range(0, len(samples), 100):
+            db.add_posture_samples(samples[i:i + 100])
+        
+        query = 'SELECT * FROM posture_rollups ORDER BY bucket_size, bucket_start'
+        incremental = db._connection().execute(query).fetchall()
+        db.rebuild_posture_rollups()
+        rebuilt = db._connection().execute(query).fetchall()
+        
+        assert len(incremental) == len(rebuilt)
+        for a, b in zip(incremental, rebuilt):
+            assert a[:3] == b[:3] and all(abs(x - y) < 1e-6 for x, y in zip(a[3:], b[3:]))
+        print(f"  ✓ {len(rebuilt)} buckets rebuilt identically")
+    finally:
+        remove_db(db, path)
+    return True
+
+
+def test_migrates_samples_without_duration():
+    """Test that a database from before durations gains the column and rollups."""
+    print("\nTesting duration migration...")
+    from database import SettingsDatabase
+    with tempfile.NamedTemporaryFile(mode='wb', delete=False, suffix='.db') as f:
+        path = f.name
+    base = 1700000000 - 1700000000 % DAY
+    conn = sqlite3.connect(path)
+    conn.execute('''
+        CREATE TABLE posture_samples (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            timestamp REAL NOT NULL,
+            tilt_angle REAL NOT NULL,
+            is_bad_posture INTEGER NOT NULL
+        )
+    ''')
+    conn.executemany('INSERT INTO posture_samples (timestamp, tilt_angle, is_bad_posture) VALUES (?, ?, ?)',
+                     [(base + i, 10.0 + i, i % 2) for i in range(10)])
+    conn.commit()
+    conn.close()
+    
+    db = SettingsDatabase(path)
+    try:
+        db.add_posture_samples([(base + 20, 30.0, True, 0.5)])
+        stats = db.get_posture_stats(base, base + DAY)
+        assert stats['sample_count'] == 11, stats
+        assert stats['max_tilt'] == 30.0 and stats['bad_seconds'] == 0.5, stats
+        print("  ✓ Old samples kept with zero duration and folded into rollups")
+    finally:
+        remove_db(db, path)
+    return True
+
+
+def test_empty_range():
+    """Test statistics for a range without samples."""
+    print("\nTesting empty range...")
+    db, path = make_db()
+    try:
+        stats = db.get_posture_stats(0, DAY)
+        assert stats['sample_count'] == 0 and stats['bad_posture_percent'] == 0.0
+        print("  ✓ Empty range returns zeros")
+    finally:
+        remove_db(db, path)
+    return True
+
+
+def main():
+    """Run all tests."""
+    print("=" * 60)
+    print("Posture Rollup Tests")
+    print("=" * 60)
+    
+    all_passed = True
+    for test in (test_stats_match_raw_samples, test_aligned_range_uses_rollups_only,
+                 test_rebuild_matches_incremental, test_migrates_samples_without_duration,
+                 test_empty_range):
+        try:
+            if not test():
+                all_passed = False
+        except Exception as e:
+            print(f"✗ {test.__name__} failed: {e}")
+            import traceback
+            traceback.print_exc()
+            all_passed = False
+    
+    print("\n" + "=" * 60)
+    if all_passed:
+        print("All tests PASSED ✓")
+        return 0
+    else:
+        print("Some tests FAILED ✗")
+        return 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
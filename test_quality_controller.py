@@ -0,0 +1,295 @@
+#!/usr/bin/env python3
+"""
+Test the adaptive quality controller.
+Sustained overload steps the quality ladder down; it only steps back up
+after a long run of frames with headroom.
+"""
+
+import os
+import sys
+import tempfile
+
+
+def test_level_resolution():
+    """Test how quality levels cap the configured inference resolution."""
+    print("Testing level resolution caps...")
+    from quality_controller import QualityLevel
+    
+    uncapped = QualityLevel('Any', 1, None, 1, True)
+    capped = QualityLevel('Small', 0, 360, 1, True)
+    assert uncapped.resolution(480) == 480
+    assert uncapped.resolution(0) == 0
+    assert capped.resolution(720) == 360
+    assert capped.resolution(240) == 240, "Levels never raise the configured resolution"
+    assert capped.resolution(0) == 360, "Native resolution is capped too"
+    print("  ✓ Resolution capped, never raised")
+    return True
+
+
+def test_ladder_order():
+    """Test that the ladder degrades monotonically."""
+    print("\nTesting quality ladder order...")
+    from quality_controller import QUALITY_LEVELS, DEFAULT_LEVEL
+    
+    complexities = [level.model_complexity for level in QUALITY_LEVELS]
+    assert complexities == sorted(complexities, reverse=True), complexities
+    assert complexities[0] == 2 and complexities[-1] == 0
+    decimations = [level.decimation for level in QUALITY_LEVELS]
+    assert decimations == sorted(decimations), decimations
+    assert QUALITY_LEVELS[-1].overlay is False, "Overlay is dropped last"
+    assert QUALITY_LEVELS[DEFAULT_LEVEL].model_complexity == 1
+    print("  ✓ Complexity, then resolution, decimation and overlay")
+    return True
+
+
+def test_steps_down_under_load():
+    """Test that sustained overload steps the level down."""
+    print("\nTesting step down...")
+    from quality_controller import QualityController, DOWN_AFTER_FRAMES
+    
+    changes = []
+    controller = QualityController(budget=0.033, level=1, on_change=changes.append)
+    
+    # A single slow frame does not trigger a change
+    controller.record(0.2)
+    for _ in range(5):
+        controller.record(0.01)
+    assert controller.level == 1, "Isolated spikes should be ignored"
+    
+    for _ in range(DOWN_AFTER_FRAMES * 4):
+        controller.record(0.06)
+        if changes:
+            break
+    assert changes == [2], changes
+    assert controller.current.model_complexity == 0
+    print(f"  ✓ Stepped down to {controller.current.name}")
+    return True
+
+
+def test_decimated_inference_counts():
+    """Test that off-path inference time counts per decimated frame."""
+    print("\nTesting decimated inference load...")
+    from quality_controller import QualityController, DOWN_AFTER_FRAMES
+    
+    controller = QualityController(budget=0.033, level=1)
+    for _ in range(DOWN_AFTER_FRAMES * 4):
+        controller.record(0.005, inference_time=0.09, decimation=1)
+    assert controller.level > 1, "Slow keyframe inference should step down"
+    
+    controller = QualityController(budget=0.033, level=1)
+    for _ in range(DOWN_AFTER_FRAMES * 4):
+        controller.record(0.005, inference_time=0.09, decimation=3)
+    assert controller.level == 1, "Inference spread over 3 frames fits the budget"
+    print("  ✓ Inference time divided by decimation")
+    return True
+
+
+def test_steps_up_with_hysteresis():
+    """Test that the level only recovers after sustained headroom."""
+    print("\nTesting step up with hysteresis...")
+    from quality_controller import QualityController, UP_AFTER_FRAMES, UP_HEADROOM
+    
+    controller = QualityController(budget=0.033, level=3)
+    
+    # Just under budget is inside the hysteresis band: hold
+    for _ in range(UP_AFTER_FRAMES * 3):
+        controller.record(0.033 * (UP_HEADROOM + 0.1))
+    assert controller.level == 3, "Should hold inside the hysteresis band"
+    
+    # Clear headroom for long enough steps up one level at a time
+    for _ in range(UP_AFTER_FRAMES // 2):
+        controller.record(0.005)
+    assert controller.level == 3, "Should not step up before UP_AFTER_FRAMES"
+    for _ in range(UP_AFTER_FRAMES * 2):
+        controller.record(0.005)
+        if controller.level != 3:
+            break
+    assert controller.level == 2, controller.level
+    print("  ✓ Held in band, stepped up after sustained headroom")
+    return True
+
+
+def test_ladder_ends():
+    """Test that the controller stays put at either end of the ladder."""
+    print("\nTesting ladder ends...")
+    from quality_controller import QualityController, QUALITY_LEVELS, DOWN_AFTER_FRAMES, UP_AFTER_FRAMES
+    
+    bottom = len(QUALITY_LEVELS) - 1
+    controller = QualityController(budget=0.033, level=bottom)
+    for _ in range(DOWN_AFTER_FRAMES * 4):
+        assert controller.record(0.5) is None
+    assert controller.level == bottom
+    
+    controller = QualityController(budget=0.033, level=0)
+    for _ in range(UP_AFTER_FRAMES * 2):
+        assert controller.record(0.001) is None
+    assert controller.level == 0
+    print("  ✓ No change past the top or bottom")
+    return True
+
+
+def test_unavailable_levels_skipped():
+    """Test that levels whose model cannot load are skipped."""
+    print("\nTesting unavailable levels...")
+    from quality_controller import QualityController, DOWN_AFTER_FRAMES, UP_AFTER_FRAMES
+    
+    controller = QualityController(budget=0.033, level=1)
+    assert controller.mark_unavailable(0) == 1, "Marking another level keeps the active one"
+    for _ in range(UP_AFTER_FRAMES * 2):
+        controller.record(0.001)
+    assert controller.level == 1, "Unavailable level must not be chosen"
+    
+    controller = QualityController(budget=0.033, level=2)
+    assert controller.mark_unavailable(2) == 3, "Active level moves down when marked"
+    for _ in range(UP_AFTER_FRAMES * 3):
+        if controller.record(0.001) is not None:
+            break
+    assert controller.level == 1, f"Stepping up should skip level 2, got {controller.level}"
+    print("  ✓ Unavailable levels skipped both ways")
+    return True
+
+
+def test_detector_model_complexity():
+    """Test that PostureDetector passes its model complexity to MediaPipe."""
+    print("\nTesting detector model complexity...")
+    from unittest.mock import patch
+    import posture_detector
+    
+    with patch.object(posture_detector.load_mediapipe().solutions.pose, 'Pose') as pose:
+        detector = posture_detector.PostureDetector(model_complexity=0)
+        assert detector.model_complexity == 0
+        assert pose.call_args.kwargs['model_complexity'] == 0
+    print("  ✓ Complexity forwarded to the pose graph")
+    return True
+
+
+def test_adaptive_quality_setting():
+    """Test the adaptive quality setting."""
+    print("\nTesting adaptive quality setting...")
+    from database import SettingsDatabase
+    
+    with tempfile.TemporaryDirectory() as tmpdir:
+        db = SettingsDatabase(os.path.join(tmpdir, 'test.db'))
+        try:
+            assert db.get_adaptive_quality() is True
+            db.set_adaptive_quality(False)
+            assert db.get_adaptive_quality() is False
+        finally:
+            db.close()
+    print("  ✓ Enabled by default and persists")
+    return True
+
+
+def test_quality_labels():
+    """Test that both tabs show the active quality level."""
+    print("\nTesting quality labels...")
+    with open(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'posture_tracker.kv')) as f:
+        kv_content = f.read()
+    assert 'quality_label' in kv_content
+    assert 'training_quality_label' in kv_content
+    print("  ✓ Quality labels present")
+    return True
+
+
+def make_app():
+    """PostureTrackerApp with a mocked settings database."""
+    import unittest.mock as mock
+    os.environ['KIVY_NO_CONSOLELOG'] = '1'
+    os.environ['KIVY_NO_ARGS'] = '1'
+    os.environ['KIVY_GL_BACKEND'] = 'mock'
+    with mock.patch('kivy.core.window.Window'):
+        import main
+        with mock.patch('main.SettingsDatabase') as mock_db:
+            mock_db.return_value.get_theme.return_value = 'dark'
+            app = main.PostureTrackerApp()
+    app.landmark_smoothing = 'off'
+    app.inference_resolution = 480
+    return app
+
+
+def test_levels_keep_automatic_decimation():
+    """Test that quality levels raise the floor of automatic decimation instead of pinning it."""
+    print("\nTesting decimation under quality levels...")
+    from quality_controller import QUALITY_LEVELS
+    from pose_decimation import DECIMATION_AUTO
+    
+    app = make_app()
+    engine = object()
+    app.db.get_inference_decimation.return_value = '0'
+    stage = app.create_inference_stage(engine, 'tracking', QUALITY_LEVELS[1])
+    assert stage.pinned == DECIMATION_AUTO and stage.decimation == 1, (stage.pinned, stage.decimation)
+    stage = app.create_inference_stage(engine, 'tracking', QUALITY_LEVELS[5])
+    assert stage.pinned == DECIMATION_AUTO and stage.decimation == 2, (stage.pinned, stage.decimation)
+    
+    # A pinned setting stays pinned, raised to the level's decimation
+    app.db.get_inference_decimation.return_value = '1'
+    stage = app.create_inference_stage(engine, 'tracking', QUALITY_LEVELS[6])
+    assert stage.pinned == 3, stage.pinned
+    print("  ✓ Automatic N kept with the level as its floor; pinned N raised")
+    return True
+
+
+def test_switch_does_not_block():
+    """Test that a quality switch retires the old stage off the UI thread."""
+    print("\nTesting quality switch...")
+    import threading
+    import time
+    import types
+    from quality_controller import QualityController, QUALITY_LEVELS
+    
+    app = make_app()
+    closed = threading.Event()
+    
+    class SlowStage:
+        def close(self):
+            time.sleep(0.5)  # waiting for an in-flight inference
+            closed.set()
+    
+    app.db.get_inference_decimation.return_value = '0'
+    app.is_tracking = True
+    app.detector = types.SimpleNamespace(model_complexity=1)
+    app.pipeline = types.SimpleNamespace(infer=SlowStage())
+    app.tracking_quality = QualityController(level=3)
+    app.tracking_level = None
+    
+    started = time.monotonic()
+    app.switch_quality_level('tracking', 3, None)
+    elapsed = time.monotonic() - started
+    assert elapsed < 0.25, f"Switch blocked the UI thread for {elapsed:.2f} s"
+    assert app.pipeline.infer is app.tracking_inference and app.tracking_level is QUALITY_LEVELS[3]
+    assert closed.wait(2.0), "Old stage was never closed"
+    app.tracking_inference.close()
+    print(f"  ✓ Switched in {elapsed * 1000:.0f} ms; old stage closed in the background")
+    return True
+
+
+def main():
+    """Run all tests."""
+    print("=" * 60)
+    print("Adaptive Quality Tests")
+    print("=" * 60)
+    
+    all_passed = True
+    for test in (test_level_resolution, test_ladder_order, test_steps_down_under_load,
+                 test_decimated_inference_counts, test_steps_up_with_hysteresis, test_ladder_ends,
+                 test_unavailable_levels_skipped, test_detector_model_complexity,
+                 test_adaptive_quality_setting, test_quality_labels, test_levels_keep_automatic_decimation,
+                 test_switch_does_not_block):
+        try:
+            if not test():
+                all_passed = False
+        except Exception as e:
+            print(f"  ✗ {test.__name__} failed: {e}")
+            all_passed = False
+    
+    print("\n" + "=" * 60)
+    if all_passed:
+        print("✓ All adaptive quality tests passed!")
+    else:
+        print("✗ Some tests failed")
+    print("=" * 60)
+    return 0 if all_passed else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
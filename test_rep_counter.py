@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Test the table-driven rep counter.
+Rep counting rules are compiled from Exercise.form_checks for every
+exercise; counting uses hysteresis bands, dwell times and per-exercise state.
+"""
+
+import sys
+import numpy as np
+
+
+def angles_for(joint_values):
+    """Build a joint_angles()-shaped array from {joint_name: angle}."""
+    from joint_angles import JOINT_NAMES
+    angles = np.zeros(len(JOINT_NAMES), dtype=np.float32)
+    for name, value in joint_values.items():
+        angles[JOINT_NAMES.index(name)] = value
+    return angles
+
+
+def feed(counter, joint_names, values, fps=30.0, start=0.0):
+    """Feed a sequence of angles (same value for all joints) to a counter."""
+    for i, value in enumerate(values):
+        counter.update(angles_for({name: value for name in joint_names}), start + i / fps)
+    return counter.reps
+
+
+def test_all_exercises_compile():
+    """Test that every exercise has a compiled rep program."""
+    print("Testing rep programs for all exercises...")
+    from exercise_database import EXERCISES
+    from rep_counter import compile_rep_programs, NUM_ZONES
+    
+    programs = compile_rep_programs(EXERCISES)
+    missing = [ex.id for ex in EXERCISES if ex.id not in programs]
+    assert not missing, f"Exercises without rep counting: {missing}"
+    for program in programs.values():
+        assert len(program.transitions) == 3 * NUM_ZONES
+        assert len(program.counts) == 3 * NUM_ZONES
+    print(f"  ✓ {len(programs)} exercises compiled")
+    return True
+
+
+def test_hysteresis_and_dwell():
+    """Test that jitter inside the band and brief spikes do not count."""
+    print("\nTesting hysteresis and dwell...")
+    from rep_counter import RepCounter, compile_rep_program
+    
+    joints = ('left_knee',)
+    counter = RepCounter(compile_rep_program({'joints': joints, 'rest': 160, 'peak': 100}))
+    
+    # Jitter across the peak threshold never settles in the working position
+    jitter = [170] * 10 + [98, 103, 97, 104, 99, 102] * 5 + [170] * 10
+    assert feed(counter, joints, jitter) == 0, "Jitter must not count reps"
+    assert counter.state_name == 'rest'
+    
+    # Jitter across the rest threshold after a real descent does not complete the rep...
+    jitter = [90] * 10 + [158, 162, 157, 163] * 5
+    assert feed(counter, joints, jitter, start=2.0) == 0, "Jitter must not count reps"
+    
+    # ...a settled return to rest does
+    assert feed(counter, joints, [170] * 10, start=3.0) == 1
+    
+    # A one-frame spike into the peak zone is shorter than the dwell time
+    assert feed(counter, joints, [95] + [170] * 10, start=4.0) == 1, "Spike must not count"
+    
+    # Two full reps
+    reps = feed(counter, joints, ([90] * 10 + [170] * 10) * 2, start=6.0)
+    assert reps == 3, f"Expected 3 reps, got {reps}"
+    print("  ✓ Hysteresis band and dwell time filter out jitter")
+    return True
+
+
+def test_peak_high_and_hold():
+    """Test exercises whose working position is the larger angle, and holds."""
+    print("\nTesting raised working position and holds...")
+    from rep_counter import RepCounter, compile_rep_program
+    
+    joints = ('left_shoulder', 'right_shoulder')
+    raise_counter = RepCounter(compile_rep_program({'joints': joints, 'rest': 30, 'peak': 75}))
+    assert feed(raise_counter, joints, ([20] * 10 + [85] * 10) * 3 + [20] * 10) == 3
+    
+    joints = ('left_hip', 'right_hip')
+    hold_counter = RepCounter(compile_rep_program({'joints': joints, 'rest': 140, 'peak': 160, 'hold': 2}))
+    # One second in position is not a completed hold
+    assert feed(hold_counter, joints, [175] * 30 + [120] * 10) == 0
+    # Three seconds is
+    assert feed(hold_counter, joints, [175] * 90 + [120] * 10, start=5.0) == 1
+    print("  ✓ Raises and timed holds are counted")
+    return True
+
+
+def test_per_exercise_state():
+    """Test that ExerciseDetector keeps a counter per exercise."""
+    print("\nTesting per-exercise counters...")
+    from exercise_detector import ExerciseDetector
+    
+    detector = ExerciseDetector.__new__(ExerciseDetector)
+    detector.rep_counters = {}
+    detector.current_exercise = 'squat'
+    
+    for i, value in enumerate([170] * 10 + [90] * 10 + [170] * 10):
+        detector.count_reps('squat', angles_for({'left_knee': value}), i / 30)
+    for i, value in enumerate([170] * 10 + [90] * 10):
+        detector.count_reps('pushup', angles_for({'left_elbow': value}), i / 30)
+    
+    assert detector.rep_count == 1, f"Expected 1 squat rep, got {detector.rep_count}"
+    assert detector.get_rep_counter('pushup').reps == 0
+    assert detector.get_rep_counter('pushup').state_name == 'peak'
+    
+    detector.reset_counter()
+    assert detector.rep_count == 0
+    assert detector.get_rep_counter('pushup').state_name == 'peak', "Reset must only affect the current exercise"
+    print("  ✓ Counters are kept per exercise")
+    return True
+
+
+def test_invalid_specs():
+    """Test that invalid specs are rejected at compile time."""
+    print("\nTesting invalid specs...")
+    from rep_counter import compile_rep_program
+    
+    for spec in ({'joints': ('left_toe',), 'rest': 160, 'peak': 100},
+                 {'joints': ('left_knee',), 'rest': 100, 'peak': 100},
+                 {'joints': ('left_knee',), 'rest': 160, 'peak': 100, 'combine': 'median'}):
+        try:
+            compile_rep_program(spec)
+            assert False, f"Spec should be rejected: {spec}"
+        except ValueError:
+            pass
+    print("  ✓ Invalid specs raise ValueError")
+    return True
+
+
+def main():
+    """Run all tests."""
+    print("=" * 60)
+    print("Rep Counter Tests")
+    print("=" * 60)
+    
+    all_passed = True
+    for test in (test_all_exercises_compile, test_hysteresis_and_dwell,
+                 test_peak_high_and_hold, test_per_exercise_state, test_invalid_specs):
+        try:
+            if not test():
+                all_passed = False
+        except Exception as e:
+            print(f"  ✗ {test.__name__} failed: {e}")
+            all_passed = False
+    
+    print("\n" + "=" * 60)
+    if all_passed:
+        print("✓ All rep counter tests passed!")
+    else:
+        print("✗ Some tests failed")
+    print("=" * 60)
+    return 0 if all_passed else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
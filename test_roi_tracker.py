@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Test ROI-cropped pose inference.
+Inference input is cropped around the previous landmarks, landmarks are
+mapped back to full-frame coordinates, and tracking falls back to the full
+frame when the pose is lost.
+"""
+
+import sys
+import threading
+import numpy as np
+
+
+class FakeResults:
+    """Stand-in for MediaPipe pose results."""
+    
+    def __init__(self, pose_landmarks):
+        self.pose_landmarks = pose_landmarks
+
+
+class BrightBoxPose:
+    """Fake pose graph: 'detects' the bright box in the image it is given."""
+    
+    def __init__(self):
+        self.shapes = []
+    
+    def process(self, image):
+        from mediapipe.framework.formats import landmark_pb2
+        self.shapes.append(image.shape[:2])
+        ys, xs = np.nonzero(image[:, :, 0] > 128)
+        if len(xs) == 0:
+            return FakeResults(None)
+        h, w = image.shape[:2]
+        landmarks = landmark_pb2.NormalizedLandmarkList()
+        # Spread the 33 landmarks over the box corners
+        corners = [(xs.min(), ys.min()), (xs.max(), ys.min()), (xs.min(), ys.max()), (xs.max(), ys.max())]
+        for i in range(33):
+            x, y = corners[i % 4]
+            landmarks.landmark.add(x=x / w, y=y / h, z=0.0, visibility=1.0)
+        return FakeResults(landmarks)
+
+
+def make_detector():
+    """PostureDetector around the fake pose graph."""
+    from posture_detector import PostureDetector
+    detector = PostureDetector.__new__(PostureDetector)
+    detector.pose = BrightBoxPose()
+    detector._lock = threading.Lock()
+    return detector
+
+
+def frame_with_box(x0, y0, x1, y1, width=1920, height=1080):
+    """Black frame with a bright box."""
+    frame = np.zeros((height, width, 3), dtype=np.uint8)
+    if x1 > x0:
+        frame[y0:y1, x0:x1] = 255
+    return frame
+
+
+def test_to_frame_mapping():
+    """Test mapping crop landmarks to full-frame coordinates."""
+    print("Testing crop to frame mapping...")
+    from roi_tracker import RoiTracker
+    
+    points = np.zeros((33, 4), dtype=np.float32)
+    points[0] = (0.5, 0.5, 0.2, 1.0)
+    mapped = RoiTracker.to_frame(points, (100, 200, 300, 600), 1000, 1000)
+    assert np.allclose(mapped[0], (0.2, 0.4, 0.04, 1.0)), mapped[0]
+    print("  ✓ Landmarks mapped back to the full frame")
+    return True
+
+
+def test_region_follows_landmarks():
+    """Test region creation, hysteresis and reset."""
+    print("\nTesting region updates...")
+    from roi_tracker import RoiTracker
+    
+    tracker = RoiTracker()
+    points = np.zeros((33, 4), dtype=np.float32)
+    points[:, 3] = 1.0
+    points[:, 0] = np.linspace(0.4, 0.6, 33)
+    points[:, 1] = np.linspace(0.3, 0.7, 33)
+    tracker.update(points, 1920, 1080)
+    x0, y0, x1, y1 = tracker.region
+    assert x0 < 0.4 * 1920 and x1 > 0.6 * 1920 and y0 < 0.3 * 1080 and y1 > 0.7 * 1080
+    assert (x1 - x0) * (y1 - y0) < 0.5 * 1920 * 1080, "Region should be much smaller than the frame"
+    
+    # Small movement keeps the region
+    region = tracker.region
+    points[:, 0] += 0.01
+    tracker.update(points, 1920, 1080)
+    assert tracker.region == region, "Small movement should not re-crop"
+    
+    # Large movement moves it
+    points[:, 0] += 0.2
+    tracker.update(points, 1920, 1080)
+    assert tracker.region != region and tracker.region[2] > 0.8 * 1920
+    
+    # Too few visible landmarks resets to the full frame
+    points[:, 3] = 0.0
+    tracker.update(points, 1920, 1080)
+    assert tracker.region is None
+    print("  ✓ Region follows landmarks with hysteresis")
+    return True
+
+
+def test_detect_with_roi():
+    """Test cropped detection, remapping and fallback."""
+    print("\nTesting cropped detection...")
+    from roi_tracker import RoiTracker
+    
+    detector = make_detector()
+    tracker = RoiTracker()
+    
+    # First frame: full frame, then the region is set
+    frame = frame_with_box(800, 300, 1100, 800)
+    result = detector.detect(frame, tracker)
+    assert detector.pose.shapes[-1] == (1080, 1920)
+    assert result.has_pose and tracker.region is not None
+    
+    # Second frame: cropped input, full-frame landmarks
+    frame = frame_with_box(810, 300, 1110, 800)
+    result = detector.detect(frame, tracker)
+    crop_h, crop_w = detector.pose.shapes[-1]
+    assert crop_w * crop_h < 0.5 * 1920 * 1080, f"Expected a crop, got {crop_w}x{crop_h}"
+    assert abs(result.pixels[:, 0].min() - 810) <= 2, result.pixels[:, 0].min()
+    assert abs(result.pixels[:, 0].max() - 1109) <= 2, result.pixels[:, 0].max()
+    assert result.left_shoulder is not None
+    
+    # Person jumps out of the crop: falls back to the full frame in the same call
+    frame = frame_with_box(100, 100, 300, 400)
+    result = detector.detect(frame, tracker)
+    assert result.has_pose, "Fallback should find the pose in the full frame"
+    assert detector.pose.shapes[-1] == (1080, 1920)
+    assert tracker.fallbacks == 1
+    assert abs(result.pixels[:, 0].min() - 100) <= 2
+    
+    # Nobody in frame: region dropped
+    result = detector.detect(frame_with_box(0, 0, 0, 0), tracker)
+    assert not result.has_pose and tracker.region is None
+    assert tracker.pixel_ratio < 1.0
+    print(f"  ✓ Cropped inference remapped; {tracker.pixel_ratio:.0%} of pixels processed")
+    return True
+
+
+def main():
+    """Run all tests."""
+    print("=" * 60)
+    print("ROI Tracker Tests")
+    print("=" * 60)
+    
+    all_passed = True
+    for test in (test_to_frame_mapping, test_region_follows_landmarks, test_detect_with_roi):
+        try:
+            if not test():
+                all_passed = False
+        except Exception as e:
+            print(f"  ✗ {test.__name__} failed: {e}")
+            all_passed = False
+    
+    print("\n" + "=" * 60)
+    if all_passed:
+        print("✓ All ROI tracker tests passed!")
+    else:
+        print("✗ Some tests failed")
+    print("=" * 60)
+    return 0 if all_passed else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Test the in-memory settings snapshot in SettingsDatabase.
+Reads must be served from memory, writes must go through to SQLite and
+notify subscribers.
+"""
+
+import sys
+import os
+import sqlite3
+import tempfile
+import unittest.mock as mock
+
+
+def make_db_path():
+    """Create a temporary database file path."""
+    with tempfile.NamedTemporaryFile(mode='wb', delete=False, suffix='.db') as f:
+        return f.name
+
+
+def test_reads_served_from_memory():
+    """Test that setting reads do not open SQLite connections."""
+    print("Testing cached reads...")
+    from database import SettingsDatabase
+    import database
+    
+    path = make_db_path()
+    try:
+        db = SettingsDatabase(path)
+        db.set_tilt_threshold(22.5)
+        
+        with mock.patch.object(database.sqlite3, 'connect', side_effect=AssertionError("SQLite hit")):
+            for _ in range(100):
+                assert db.get_tilt_threshold() == 22.5
+            assert db.get_theme() == 'dark', "Default should come from memory too"
+        print("  ✓ Hot-path reads never touch SQLite")
+    finally:
+        os.unlink(path)
+    return True
+
+
+def test_write_through():
+    """Test that writes persist and are visible to a new instance."""
+    print("\nTesting write-through...")
+    from database import SettingsDatabase
+    
+    path = make_db_path()
+    try:
+        db = SettingsDatabase(path)
+        db.set_default_camera(2)
+        db.set_theme('light')
+        
+        conn = sqlite3.connect(path)
+        rows = dict(conn.execute('SELECT key, value FROM settings').fetchall())
+        conn.close()
+        assert rows == {'default_camera': '2', 'theme': 'light'}, rows
+        
+        reopened = SettingsDatabase(path)
+        assert reopened.get_default_camera() == 2
+        assert reopened.get_theme() == 'light'
+        print("  ✓ Writes persisted and reloaded")
+    finally:
+        os.unlink(path)
+    return True
+
+
+def test_change_notifications():
+    """Test that subscribers are notified only when a value changes."""
+    print("\nTesting change notifications...")
+    from database import SettingsDatabase
+    
+    path = make_db_path()
+    try:
+        db = SettingsDatabase(path)
+        changes = []
+        callback = lambda key, value: changes.append((key, value))
+        db.subscribe(callback)
+        
+        db.set_tilt_threshold(18.0)
+        db.set_tilt_threshold(18.0)  # unchanged, no notification
+        db.set_theme('light')
+        assert changes == [('tilt_threshold', '18.0'), ('theme', 'light')], changes
+        
+        db.unsubscribe(callback)
+        db.set_tilt_threshold(30.0)
+        assert len(changes) == 2, "Unsubscribed callback should not be called"
+        
+        # Failed writes leave the snapshot untouched
+        try:
+            db.set_theme('blue')
+        except ValueError:
+            pass
+        assert db.get_theme() == 'light'
+        print("  ✓ Subscribers notified on change")
+    finally:
+        os.unlink(path)
+    return True
+
+
+def main():
+    """Run all tests."""
+    print("=" * 60)
+    print("Settings Cache Tests")
+    print("=" * 60)
+    
+    all_passed = True
+    for test in (test_reads_served_from_memory, test_write_through, test_change_notifications):
+        try:
+            if not test():
+                all_passed = False
+        except Exception as e:
+            print(f"✗ {test.__name__} failed: {e}")
+            import traceback
+            traceback.print_exc()
+            all_passed = False
+    
+    print("\n" + "=" * 60)
+    if all_passed:
+        print("All tests PASSED ✓")
+        return 0
+    else:
+        print("Some tests FAILED ✗")
+        return 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Test that exercise detection runs pose inference only once per frame.
+ExerciseDetector.process_frame must reuse the PoseResult from PostureDetector
+instead of calling pose.process a second time.
+"""
+
+import sys
+import numpy as np
+
+
+def test_pose_result_defaults():
+    """Test PoseResult defaults when no pose is detected."""
+    print("Testing PoseResult defaults...")
+    from posture_detector import PoseResult
+    
+    result = PoseResult(None, 640, 480)
+    assert not result.has_pose, "Empty result should report no pose"
+    assert result.tilt_angle == 0, f"Expected tilt 0, got {result.tilt_angle}"
+    assert result.left_shoulder is None and result.right_shoulder is None
+    assert (result.width, result.height) == (640, 480)
+    print("  ✓ PoseResult defaults are correct")
+    return True
+
+
+def test_single_inference_per_frame():
+    """Test that ExerciseDetector.process_frame calls pose.process once."""
+    print("\nTesting single inference per exercise frame...")
+    from exercise_detector import ExerciseDetector
+    
+    detector = ExerciseDetector()
+    pose = detector.posture_detector.pose
+    original_process = pose.process
+    calls = []
+    
+    def counting_process(image):
+        calls.append(image.shape)
+        return original_process(image)
+    
+    pose.process = counting_process
+    try:
+        frame = np.zeros((240, 320, 3), dtype=np.uint8)
+        processed_frame, feedback = detector.process_frame(frame, 'pushup')
+        assert len(calls) == 1, f"Expected 1 inference, got {len(calls)}"
+        assert processed_frame.shape == frame.shape
+        assert 'feedback' in feedback and 'reps' in feedback
+        print("  ✓ One pose.process call per frame")
+    finally:
+        pose.process = original_process
+        detector.release()
+    return True
+
+
+def main():
+    """Run all tests."""
+    print("=" * 60)
+    print("Single-Pass Inference Tests")
+    print("=" * 60)
+    
+    all_passed = True
+    for test in (test_pose_result_defaults, test_single_inference_per_frame):
+        try:
+            if not test():
+                all_passed = False
+        except Exception as e:
+            print(f"✗ {test.__name__} failed: {e}")
+            import traceback
+            traceback.print_exc()
+            all_passed = False
+    
+    print("\n" + "=" * 60)
+    if all_passed:
+        print("All tests PASSED ✓")
+        return 0
+    else:
+        print("Some tests FAILED ✗")
+        return 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
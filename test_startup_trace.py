@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Test the opt-in startup tracer and the startup benchmark's aggregation.
+The tracer is configured from the environment at import, so each scenario
+runs in a fresh interpreter.
+"""
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def run_traced(code, **env):
+    """Run code in a fresh interpreter with the given environment variables."""
+    full_env = dict(os.environ, KIVY_NO_ARGS='1', KIVY_NO_CONSOLELOG='1', KIVY_GL_BACKEND='mock')
+    for key in ('POSTURE_STARTUP_TRACE', 'POSTURE_STARTUP_TRACE_EXIT', 'POSTURE_STARTUP_TRACE_AUTOSTART'):
+        full_env.pop(key, None)
+    full_env.update(env)
+    result = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True,
+                            cwd=APP_DIR, env=full_env, timeout=120)
+    assert result.returncode == 0, result.stderr
+    return result.stdout.strip().splitlines()
+
+
+def load_phases(path):
+    """Phase names and records of a written timeline."""
+    with open(path) as f:
+        phases = json.load(f)['phases']
+    return [phase['name'] for phase in phases], {phase['name']: phase for phase in phases}
+
+
+def test_disabled_by_default():
+    """Test that the tracer records and writes nothing unless enabled."""
+    print("Testing disabled tracer...")
+    output = run_traced("import startup_trace as t; t.begin('a'); t.end('a'); t.mark('b'); "
+                        "print(t.ENABLED, t.write(), len(t.timeline()['phases']))")
+    assert output[-1] == 'False None 0', output
+    print("  ✓ No phases, no file")
+    return True
+
+
+def test_timeline_written():
+    """Test spans, cross-thread phases, marks and the first-frame write."""
+    print("\nTesting timeline recording...")
+    code = """
+import threading, time, startup_trace as t
+with t.span('imports'):
+    time.sleep(0.02)
+t.begin('model_load')
+worker = threading.Thread(target=lambda: (time.sleep(0.02), t.end('model_load')))
+worker.start(); worker.join()
+t.mark('first_paint'); t.mark('first_paint')
+t.end('never_started')
+t.mark(t.FIRST_FRAME)
+t.mark('after_write')
+print(t.write())
+"""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = os.path.join(tmpdir, 'timeline.json')
+        output = run_traced(code, POSTURE_STARTUP_TRACE=path)
+        assert output[-1] == 'None', "Timeline should be written only once"
+        names, phases = load_phases(path)
+    assert names == ['interpreter', 'imports', 'model_load', 'first_paint', 'first_frame'], names
+    assert phases['interpreter']['start'] == 0.0
+    assert phases['imports']['duration'] >= 0.02 and phases['model_load']['duration'] >= 0.02
+    assert phases['first_paint']['duration'] == 0.0
+    assert phases['first_frame']['end'] >= phases['model_load']['end']
+    print("  ✓ Phases ordered from process start; written once at the first frame")
+    return True
+
+
+def test_exit_phase():
+    """Test that reaching the exit phase writes the timeline and calls the exit handler."""
+    print("\nTesting exit phase...")
+    code = """
+import startup_trace as t
+t.set_exit_handler(lambda: print('exit requested'))
+t.mark('on_start')
+print('before exit phase')
+t.mark('model_ready')
+"""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = os.path.join(tmpdir, 'timeline.json')
+        output = run_traced(code, POSTURE_STARTUP_TRACE=path, POSTURE_STARTUP_TRACE_EXIT='model_ready')
+        assert output[-2:] == ['before exit phase', 'exit requested'], output
+        names, _ = load_phases(path)
+    assert names[-1] == 'model_ready', names
+    print("  ✓ Timeline written and app asked to quit")
+    return True
+
+
+def test_main_import_phases():
+    """Test that importing main records the module-level startup phases."""
+    print("\nTesting main.py instrumentation...")
+    code = """
+import unittest.mock as mock
+with mock.patch('kivy.core.window.Window'):
+    import main
+"""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = os.path.join(tmpdir, 'timeline.json')
+        run_traced(code, POSTURE_STARTUP_TRACE=path)
+        names, _ = load_phases(path)
+    expected = ['interpreter', 'import_cv2_numpy', 'import_kivy', 'kv_parse', 'import_app_modules']
+    assert names == expected, names
+    print("  ✓ Import and KV parse phases written at exit")
+    return True
+
+
+def test_benchmark_summary():
+    """Test percentiles and per-phase aggregation across runs."""
+    print("\nTesting benchmark summary...")
+    from bench_startup import summarize
+    from frame_timing import percentile
+    
+    assert percentile([], 50) is None
+    assert percentile([3, 1, 2], 50) == 2
+    assert percentile(list(range(1, 101)), 95) == 95
+    assert percentile([5], 99) == 5
+    
+    timelines = [
+        {'phases': [{'name': 'build', 'start': 0.5, 'end': 0.5 + d, 'duration': d},
+                    {'name': 'model_ready', 'start': e, 'end': e, 'duration': 0.0}]}
+        for d, e in ((0.1, 2.0), (0.2, 3.0), (0.3, 4.0))
+    ]
+    timelines.append({'phases': [{'name': 'build', 'start': 0.5, 'end': 0.9, 'duration': 0.4}]})
+    summary = summarize(timelines)
+    assert [phase['name'] for phase in summary] == ['build', 'model_ready']
+    build, ready = summary
+    assert build['runs'] == 4 and ready['runs'] == 3
+    assert build['duration']['p50'] == 0.2 and build['duration']['max'] == 0.4
+    assert ready['end'] == {'p50': 3.0, 'p95': 4.0, 'max': 4.0}, ready['end']
+    print("  ✓ Nearest-rank percentiles per phase")
+    return True
+
+
+def main():
+    """Run all tests."""
+    print("=" * 60)
+    print("Startup Trace Tests")
+    print("=" * 60)
+    
+    all_passed = True
+    for test in (test_disabled_by_default, test_timeline_written, test_exit_phase,
+                 test_main_import_phases, test_benchmark_summary):
+        try:
+            if not test():
+                all_passed = False
+        except Exception as e:
+            print(f"  ✗ {test.__name__} failed: {e}")
+            all_passed = False
+    
+    print("\n" + "=" * 60)
+    if all_passed:
+        print("✓ All startup trace tests passed!")
+    else:
+        print("✗ Some tests failed")
+    print("=" * 60)
+    return 0 if all_passed else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())